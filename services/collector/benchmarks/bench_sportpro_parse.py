@@ -0,0 +1,109 @@
+"""
+Benchmark the parsing of the sportpro html tables, on the saved test pages.
+
+The former parser built the whole page as a BeautifulSoup tree, before
+walking the rows of its `resList` table. The current one streams the rows
+with `lxml.etree.iterparse`, freeing the elements as it goes (see
+`collector.scrapers.sportpro.parser`). This measures, for both, the time to
+parse the rows into `data.Row` objects and the peak of Python memory
+allocations (libxml2 allocations are not traced).
+
+Usage, from services/collector:
+
+    python benchmarks/bench_sportpro_parse.py --repeat 20
+"""
+import argparse
+import logging
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from collector.scrapers.sportpro import data, parser
+
+PAGES_DIR = Path(__file__).parents[1] / "tests" / "scrapers" / "sportpro" / "data"
+PAGES = {
+    "resultats.html.test": data.CompetitionRow,
+    "tangue.html.test": data.ResultRow,
+    "transvolcano-longue.html.test": data.ResultRow,
+}
+
+
+def soup_parse(html: bytes, output: type[data.Row]) -> list[data.Row]:
+    """Parse the rows from the whole BeautifulSoup tree (former)."""
+    soup = BeautifulSoup(html, "lxml")
+    table = soup.find_all("table", attrs={"id": "resList"})[0]
+    rows = []
+    headers: list[str] = []
+    for row in table.find_all("tr"):
+        if "header" in (row.get("class") or []):
+            headers = [r.text for r in row.find_all("th")]
+            continue
+        d = {}
+        offset = 0
+        for i, column in enumerate(row.find_all("td")):
+            if i >= len(headers):
+                break
+            header = headers[i + offset]
+            offset += int(column.get("colspan", "1")) - 1
+            try:
+                if header == "Résultats":
+                    d[header] = column.find_all("a")[0]["href"]
+                else:
+                    d[header] = column.text
+            except (IndexError, KeyError, AttributeError):
+                continue
+        rows.append(output.from_dict(d))
+    return rows
+
+
+def stream_parse(html: bytes, output: type[data.Row]) -> list[data.Row]:
+    """Stream the rows with `parser.iter_table_rows` (current)."""
+    return [output.from_dict(d) for d in parser.iter_table_rows(html)]
+
+
+def measure(
+        parse: Callable[[bytes, type[data.Row]], list[data.Row]],
+        html: bytes,
+        output: type[data.Row],
+        repeat: int
+) -> tuple[list[data.Row], float, int]:
+    """Measure the average parsing time, and the peak of allocated memory."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rows = parse(html, output)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    parse(html, output)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, elapsed, peak
+
+
+def main() -> None:
+    """Run the benchmark."""
+    argparser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    argparser.add_argument("--repeat", type=int, default=20)
+    args = argparser.parse_args()
+    # invalid rows are logged by `from_dict`
+    logging.disable(logging.CRITICAL)
+
+    for name, output in PAGES.items():
+        html = (PAGES_DIR / name).read_bytes()
+        expected = None
+        for method, parse in [("soup", soup_parse), ("stream", stream_parse)]:
+            rows, elapsed, peak = measure(parse, html, output, args.repeat)
+            if expected is not None and rows != expected:
+                msg = f"{method} rows differ on {name}"
+                raise AssertionError(msg)
+            expected = rows
+            print(  # noqa: T201
+                f"{name:>30} {method:>6}: {len(rows)} rows in "
+                f"{elapsed * 1000:.1f}ms, peak memory {peak / 1024:.0f}KiB")
+
+
+if __name__ == "__main__":
+    main()
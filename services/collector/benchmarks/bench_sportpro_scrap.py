@@ -0,0 +1,137 @@
+"""
+Benchmark the delivery of the competitions scraped by `SportproScraper.scrap`.
+
+The results pages are fetched behind a rate limiter: the scraper mostly waits
+for them. This measures the CPU time spent per scraped competition while
+waiting, by the former delivery (polling the scraping tasks every 5 ms) and by
+the current one (yielding each competition as soon as it comes out of the
+scraping pipeline, see `collector.pipeline`).
+
+Usage, from services/collector:
+
+    python benchmarks/bench_sportpro_scrap.py --competitions 200 --rate 50
+"""
+import argparse
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable
+from datetime import date
+from unittest.mock import AsyncMock, Mock, patch
+
+from collector import models
+from collector.scrapers.sportpro import SportproScraper
+
+
+def make_competitions(nb_competitions: int) -> list[models.Competition]:
+    """Create empty competitions."""
+    return [
+        models.Competition(
+            name=f"Trail {i}",
+            event="Course",
+            timekeeper="sportpro",
+            date=models.Date(start=date(year=2024, month=1, day=1)),
+            distance=20,
+        )
+        for i in range(nb_competitions)
+    ]
+
+
+def fake_scraping(
+        competitions: list[models.Competition],
+        rate: float
+) -> tuple[Callable, Callable]:
+    """Fake the scraping of the competitions, at `rate` competitions per second."""
+    start = time.perf_counter()
+    delays = {id(comp): i / rate for i, comp in enumerate(competitions)}
+
+    def scrap_competitions(html):  # noqa: ANN001,ANN202
+        return [(None, comp) for comp in competitions]
+
+    async def scrap_results(self, url, competition):  # noqa: ANN001,ANN202
+        delay = start + delays[id(competition)] - time.perf_counter()
+        await asyncio.sleep(max(delay, 0))
+        return competition
+
+    return scrap_competitions, scrap_results
+
+
+async def polling_scrap(
+        competitions: list[models.Competition],
+        rate: float
+) -> AsyncIterator[models.Competition]:
+    """Deliver the competitions by polling the tasks every 5 ms (former)."""
+    _, scrap_results = fake_scraping(competitions, rate)
+    tasks = {
+        comp: asyncio.ensure_future(scrap_results(None, None, comp))
+        for comp in competitions
+    }
+    while len(tasks) > 0:
+        done = set()
+        for comp, fut in tasks.items():
+            if fut.done():
+                fut.result()
+                yield comp
+                done.add(comp)
+        for comp in done:
+            del tasks[comp]
+        await asyncio.sleep(0.005)
+
+
+async def completion_scrap(
+        competitions: list[models.Competition],
+        rate: float
+) -> AsyncIterator[models.Competition]:
+    """
+    Deliver the competitions with `SportproScraper.scrap` (current).
+
+    Only the fetching is slow: parsing and normalizing pass the pages through.
+    """
+    scrap_competitions, scrap_results = fake_scraping(competitions, rate)
+
+    async def fetch(self, page):  # noqa: ANN001,ANN202
+        await scrap_results(self, page.url, page.competition)
+        return page
+
+    async def parse(self, page):  # noqa: ANN001,ANN202
+        return page
+
+    async def normalize(self, page):  # noqa: ANN001,ANN202
+        return page.competition
+
+    client = Mock()
+    client.get = AsyncMock(return_value=b"")
+    with patch(
+                "collector.scrapers.sportpro.main.parse_competitions",
+                scrap_competitions), \
+            patch.object(SportproScraper, "fetch", fetch), \
+            patch.object(SportproScraper, "parse", parse), \
+            patch.object(SportproScraper, "normalize", normalize):
+        async for competition in SportproScraper(client).scrap():
+            yield competition
+
+
+async def measure(scrap: AsyncIterator[models.Competition]) -> tuple[int, float, float]:
+    """Consume the scraped competitions, and measure the elapsed & CPU times."""
+    wall, cpu = time.perf_counter(), time.process_time()
+    count = len([comp async for comp in scrap])
+    return count, time.perf_counter() - wall, time.process_time() - cpu
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--competitions", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=50.,
+                        help="scraped competitions per second")
+    args = parser.parse_args()
+
+    competitions = make_competitions(args.competitions)
+    for name, scrap in [("polling", polling_scrap), ("completion", completion_scrap)]:
+        count, wall, cpu = asyncio.run(measure(scrap(competitions, args.rate)))
+        print(  # noqa: T201
+            f"{name:>10}: {count} competitions in {wall:.2f}s, "
+            f"CPU {cpu * 1000:.1f}ms ({cpu / count * 1e6:.0f}us per competition)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,83 @@
 import asyncio
+import logging
 from collections.abc import Coroutine
 
+logger = logging.getLogger(__name__)
+
+# default maximum number of background tasks running at once
+MAX_IN_FLIGHT = 8
+
 
 class BackgroundController:
     """
     Handles in background the async futures.
 
     It provides:
-    - a method to run an async method in background (not blocking).
+    - a method to run an async method in background (not blocking, unless
+      too many tasks are already running).
     - a method to wait until all tasks are done.
+
+    At most `max_in_flight` tasks run at once: when full, `run_in_background`
+    waits for a task to complete. This applies backpressure to the producer
+    of the tasks, instead of piling pending coroutines up in memory.
+
+    The tasks errors are collected, instead of being raised.
+
+    Attributes
+    ----------
+    max_in_flight: int
+        The maximum number of tasks running at once.
+    completed: int
+        How many tasks are done, successful or not.
+    errors: list[Exception]
+        The errors raised by the tasks.
     """
 
-    def __init__(self) -> None:
-        # each background task has a related event.
-        # only when all events are set can we consider all the tasks done.
-        self.__events: set[asyncio.Event] = set()
-        # Store all the created background tasks
+    def __init__(self, max_in_flight: int = MAX_IN_FLIGHT) -> None:
+        self.max_in_flight = max(max_in_flight, 1)
+        self.completed = 0
+        self.errors: list[Exception] = []
+        # a slot per running task
+        self.__slots = asyncio.Semaphore(self.max_in_flight)
+        # Store the running background tasks
         self.__tasks: set[asyncio.Task] = set()
 
+    @property
+    def in_flight(self) -> int:
+        """Return the number of running tasks."""
+        return len(self.__tasks)
+
     async def wait(self) -> None:
         """Wait until all stored tasks are complete."""
-        await asyncio.wait(self.__tasks)
+        if self.__tasks:
+            await asyncio.wait(set(self.__tasks))
+        if self.errors:
+            logger.warning(
+                "%d background tasks failed out of %d",
+                len(self.errors), self.completed)
 
-    def run_in_background(self, cor: Coroutine) -> None:
+    async def run_in_background(self, cor: Coroutine) -> None:
         """
         Start the passed coroutine as a background task.
 
+        Wait for a free slot first, if `max_in_flight` tasks are running.
+
         Parameters
         ----------
         cor : Coroutine
         """
-        self.__tasks.add(
-            asyncio.ensure_future(asyncio.create_task(self.__run(cor))))
+        await self.__slots.acquire()
+        task = asyncio.create_task(self.__run(cor))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
 
     async def __run(self, cor: Coroutine) -> None:
-        """Create an event and await the coroutine `coro`."""
-        event = asyncio.Event()
-        self.__events.add(event)
+        """Await the coroutine `coro`, collect its error, and free its slot."""
         try:
             await cor
+        except Exception as exc:
+            logger.exception("Background task failed")
+            self.errors.append(exc)
         finally:
-            event.set()
+            self.completed += 1
+            self.__slots.release()
@@ -1,4 +1,5 @@
 import abc
+import datetime
 from contextlib import asynccontextmanager, AbstractAsyncContextManager
 
 from collector import models
@@ -51,6 +52,26 @@ class Database(abc.ABC):
             a mapping (id -> event) for each found competition.
         """
 
+    @abc.abstractmethod
+    async def search_ingested_events(
+            self,
+            before: datetime.date | None = None
+    ) -> set[models.EventKey]:
+        """
+        Get the competition events which already have results.
+
+        Parameters
+        ----------
+        before: datetime.date | None
+            If given, only the events which started before this date are
+            returned.
+
+        Returns
+        -------
+        set[models.EventKey]
+            The keys of the events with results.
+        """
+
     @classmethod
     @asynccontextmanager
     async def client(cls) -> AbstractAsyncContextManager["Database"]:
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+
+# a runner's unique key: first name, last name & birth year
+RunnerKey = tuple[str, str, int | None]
+
+
+class RunnersCache:
+    """
+    Cache the runners ids, with a Least Recently Used eviction.
+
+    The same runners appear in many competitions: caching their ids avoids
+    querying the database every time.
+
+    Attributes
+    ----------
+    max_size: int
+        The maximum number of cached runners. 0 disables the cache.
+    hits: int
+        How many times a runner id has been found in the cache.
+    misses: int
+        How many times a runner id was missing from the cache.
+    """
+
+    def __init__(self, max_size: int = 100_000) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._ids: OrderedDict[RunnerKey, int] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached runners."""
+        return len(self._ids)
+
+    def get(self, key: RunnerKey) -> int | None:
+        """
+        Get a runner id from the cache.
+
+        Parameters
+        ----------
+        key: RunnerKey
+            The runner's (first name, last name, birth year).
+
+        Returns
+        -------
+        int | None
+            The runner's id, if cached.
+        """
+        runner_id = self._ids.get(key)
+        if runner_id is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._ids.move_to_end(key)
+        return runner_id
+
+    def put(self, key: RunnerKey, runner_id: int) -> None:
+        """
+        Add a runner id in the cache, evicting the least recently used one.
+
+        Parameters
+        ----------
+        key: RunnerKey
+            The runner's (first name, last name, birth year).
+        runner_id: int
+            The runner's id.
+        """
+        if self.max_size <= 0:
+            return
+        self._ids[key] = runner_id
+        self._ids.move_to_end(key)
+        if len(self._ids) > self.max_size:
+            self._ids.popitem(last=False)
@@ -1,11 +1,16 @@
 import asyncio
 import datetime
 import logging
-from contextlib import AbstractAsyncContextManager
+import random
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, AsyncExitStack
 from contextlib import asynccontextmanager
+from typing import TypeVar
 
-from sqlalchemy import delete, select, update, ValuesBase
+from sqlalchemy import delete, func, select, tuple_, update, Select, ValuesBase
 from sqlalchemy.dialects.mysql import insert, Insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import (
     async_sessionmaker, create_async_engine, AsyncEngine, AsyncSession)
 
@@ -13,39 +18,96 @@ from collector import models
 from collector.database.generic import Database
 from collector.database.mysql import env
 from collector.database.mysql import orm
+from collector.database.mysql.cache import RunnerKey, RunnersCache
+from collector.database.mysql.latency import LatencyMetrics
+from collector.database.mysql.locks import StripedLocks, is_retryable
+from collector.database.mysql.pool import PoolMetrics
 
 logger = logging.getLogger(__name__)
 
-locks: dict[str, asyncio.Lock] = {}
+# how many times a transaction is retried after a deadlock
+DEADLOCK_RETRIES = 3
+# seconds to wait before the first retry, doubled at each retry
+DEADLOCK_RETRY_DELAY = 0.05
 
+T = TypeVar("T")
 
-def get_lock(name: str) -> asyncio.Lock:
-    """Create & Get an asyncio lock."""
-    lock = locks.get(name)
-    if lock is None:
-        lock = asyncio.Lock()
-        locks[name] = lock
-    return lock
+# the columns of a result which are not part of its primary key
+RESULT_UPDATED_COLUMNS = [
+    column.name for column in orm.Result.__table__.columns
+    if not column.primary_key
+]
 
 
 class MySQLClient(Database):
     """MySQL Database Client."""
 
     _engine: AsyncEngine
+    _session_maker: async_sessionmaker[AsyncSession]
+    _pool_metrics: PoolMetrics
+    _runners_cache: RunnersCache
+    _locks: StripedLocks
+    _latency: LatencyMetrics
+    _single_transaction: bool
+    _diff_results: bool
 
     @classmethod
     async def create(cls) -> "MySQLClient":
         """Create a client object, asynchronously."""
         self = cls()
         envs = env.Environments.parse()
-        self._engine = create_async_engine(envs.url())
+        self._engine = create_async_engine(envs.url(), **envs.engine_options())
+        self._session_maker = async_sessionmaker(self._engine)
+        self._pool_metrics = PoolMetrics(
+            capacity=envs.pool_size + envs.pool_max_overflow)
+        self._runners_cache = RunnersCache(max_size=envs.runners_cache_size)
+        self._locks = StripedLocks(stripes=envs.lock_stripes)
+        self._latency = LatencyMetrics()
+        self._single_transaction = envs.single_transaction
+        self._diff_results = envs.diff_results
         await self.__create_tables()
+        if envs.runners_cache_warm:
+            await self.__warm_runners_cache()
         return self
 
     async def dispose(self) -> None:
         """Dispose the client object."""
+        logger.info(
+            "Runners cache: %d hits, %d misses, %d cached runners",
+            self._runners_cache.hits, self._runners_cache.misses,
+            len(self._runners_cache))
+        logger.info(
+            "Connection pool: %.0f%% average utilization, %.0f%% peak "
+            "(%d/%d connections)",
+            self._pool_metrics.utilization * 100,
+            self._pool_metrics.peak_utilization * 100,
+            self._pool_metrics.peak_in_use, self._pool_metrics.capacity)
+        logger.info(
+            "Stored %d competitions: %.3fs average latency, %.3fs max",
+            self._latency.count, self._latency.mean, self._latency.maximum)
         await self._engine.dispose()
 
+    async def __warm_runners_cache(self) -> None:
+        """Fill the runners cache with the most recent runners."""
+        stmt = (
+            select(
+                orm.Runner.id,
+                orm.Runner.first_name,
+                orm.Runner.last_name,
+                orm.Runner.birth_year,
+            )
+            .where(orm.Runner.birth_year.is_not(None))
+            .order_by(orm.Runner.id.desc())
+            .limit(self._runners_cache.max_size)
+        )
+        async with self.__db_session() as session:
+            res = await session.execute(stmt)
+            rows = res.all()
+        # the most recent runners are the last ones used
+        for runner_id, first_name, last_name, birth_year in reversed(rows):
+            self._runners_cache.put((first_name, last_name, birth_year), runner_id)
+        logger.info("Warmed runners cache with %d runners", len(rows))
+
     async def __create_tables(self) -> None:
         """Create all tables used by this database."""
         async with self._engine.begin() as conn:
@@ -82,6 +144,48 @@ class MySQLClient(Database):
                 for row in rows
             }
 
+    async def search_ingested_events(
+            self,
+            before: datetime.date | None = None
+    ) -> set[models.EventKey]:
+        """
+        Get the competition events which already have results.
+
+        Parameters
+        ----------
+        before: datetime.date | None
+            If given, only the events which started before this date are
+            returned.
+
+        Returns
+        -------
+        set[models.EventKey]
+            The keys of the events with results.
+        """
+        has_results = (
+            select(orm.Result.event_id)
+            .where(orm.Result.event_id == orm.CompetitionEvent.id)
+            .exists()
+        )
+        stmt = (
+            select(
+                orm.Competition.name,
+                orm.CompetitionEvent.name,
+                orm.CompetitionEvent.start_date,
+                orm.CompetitionEvent.distance)
+            .join(orm.Competition,
+                  orm.Competition.id == orm.CompetitionEvent.competition_id)
+            .where(has_results)
+        )
+        if before is not None:
+            stmt = stmt.where(orm.CompetitionEvent.start_date < before)
+        async with self.__db_session() as session:
+            res = await session.execute(stmt)
+            return {
+                (name, event, start_date, models.event_distance(distance))
+                for name, event, start_date, distance in res.all()
+            }
+
     async def update_competition(
             self,
             comp_id: int,
@@ -106,7 +210,7 @@ class MySQLClient(Database):
                 negative_elevation=competition.negative_elevation,
             )
         )
-        await self.__execute(stmt, orm.CompetitionEvent.__tablename__)
+        await self.__execute(stmt)
 
     async def add_competition(self, competition: models.Competition) -> None:
         """
@@ -117,41 +221,214 @@ class MySQLClient(Database):
         - all the runners involved
         - all the results
 
+        If the single transaction mode is enabled, everything is written
+        in one transaction, with a fixed number of statements (see
+        `__ingest_in_transaction`). Otherwise, the competition, runners and
+        results are written concurrently, in independent transactions.
+
+        Parameters
+        ----------
+        competition: models.Competition
+            The competition to add.
+        """
+        start = time.perf_counter()
+        if self._single_transaction:
+            await self.__ingest_in_transaction(competition)
+        else:
+            await self.__ingest_concurrently(competition)
+        latency = time.perf_counter() - start
+        self._latency.record(latency)
+        logger.info(
+            "Stored competition=%s event=%s with %d results in %.3fs",
+            competition.name, competition.event, len(competition.results), latency)
+
+    async def __ingest_concurrently(self, competition: models.Competition) -> None:
+        """
+        Add a competition, in independent transactions.
+
         Parameters
         ----------
         competition: models.Competition
             The competition to add.
         """
         # first add competitions and runners, and collect their db ids
-        runners = [result.runner for result in competition.results]
-        ids = await asyncio.gather(
+        # the rows are built from the results columns
+        batch = competition.results_batch()
+        event_id, runner_ids = await asyncio.gather(
             self.__add_competition_event(competition),
-            *[self.__add_runner(runner) for runner in runners]
+            self.__add_runners(orm.Runner.from_batch(batch)),
         )
 
-        # get competition id and runners ids
-        event_id, runner_ids = ids[0], ids[1:]
-
-        # map competition.id & runner.id to its result
-        results: dict[int, models.Result] = {}
-        for j, result in enumerate(competition.results):
-            runner_id = runner_ids[j]
-            if runner_id is None:
-                logger.warning("Missing runner id for result=%s", result)
-                continue
-            results[runner_id] = result
-
         # store results
+        results = self.__map_results(orm.Result.from_batch(batch, event_id, runner_ids))
         if results:
             await self.__add_competition_results(event_id, results)
 
+    async def __ingest_in_transaction(self, competition: models.Competition) -> None:
+        """
+        Add a competition in a single transaction.
+
+        The competition and event ids are returned by their upsert, even
+        when they already exist (`LAST_INSERT_ID(id)`). Hence, the whole
+        competition is written with at most 8 statements:
+        - upsert the competition
+        - upsert the event
+        - upsert all the runners, then select their ids
+        - insert all the runners without birth year
+        - write the event's results (see `__write_results`)
+        The runners without birth year are always new ones: their ids are
+        consecutive from the first inserted one, as a multi-rows INSERT gets
+        consecutive auto-increment values. The results of the runners whose
+        key isn't returned as is by the database are dropped (see
+        `__map_results`).
+
+        Either everything is stored, or nothing.
+
+        Parameters
+        ----------
+        competition: models.Competition
+            The competition to add.
+        """
+        # the rows are built from the results columns
+        batch = competition.results_batch()
+        runners = orm.Runner.from_batch(batch)
+        keys, unique_rows, ids = self.__split_cached_runners(runners)
+
+        async def ingest(session: AsyncSession) -> dict[RunnerKey, int]:
+            """Write the competition, and return the runners ids found."""
+            obj = orm.Competition.from_model(competition)
+            stmt = insert(orm.Competition).values(obj)
+            stmt = stmt.on_duplicate_key_update(
+                id=func.last_insert_id(orm.Competition.id))
+            res = await session.execute(stmt)
+            comp_id = int(res.inserted_primary_key[0])
+
+            obj = orm.CompetitionEvent.from_model(comp_id, competition)
+            stmt = insert(orm.CompetitionEvent).values(obj)
+            # a rescraped event may have a corrected distance
+            stmt = stmt.on_duplicate_key_update(
+                id=func.last_insert_id(orm.CompetitionEvent.id),
+                distance=stmt.inserted.distance)
+            res = await session.execute(stmt)
+            event_id = int(res.inserted_primary_key[0])
+
+            found: dict[RunnerKey, int] = {}
+            if unique_rows:
+                await session.execute(self.__upsert_runners_stmt(unique_rows))
+                res = await session.execute(self.__runner_ids_stmt(list(unique_rows)))
+                found = {
+                    (first_name, last_name, birth_year): runner_id
+                    for runner_id, first_name, last_name, birth_year in res.all()
+                }
+
+            runner_ids = [ids.get(key, found.get(key)) for key in keys]
+            new_runners = [i for i, key in enumerate(keys) if key[2] is None]
+            if new_runners:
+                stmt = insert(orm.Runner).values([runners[i] for i in new_runners])
+                res = await session.execute(stmt)
+                # the id of the first inserted row
+                first_id = int(res.lastrowid)
+                for offset, i in enumerate(new_runners):
+                    runner_ids[i] = first_id + offset
+
+            results = self.__map_results(
+                orm.Result.from_batch(batch, event_id, runner_ids))
+            await self.__write_results(session, event_id, results)
+            return found
+
+        found = await self.__transaction(
+            ingest,
+            # always acquired in the same order: competition, then event
+            self.__lock(
+                orm.Competition.__tablename__,
+                (competition.name, competition.timekeeper)),
+            self.__lock(
+                orm.CompetitionEvent.__tablename__,
+                (competition.event, competition.date.start, competition.distance)),
+        )
+        # the ids are cached once committed only
+        for key, runner_id in found.items():
+            self._runners_cache.put(key, runner_id)
+
+    @staticmethod
+    def __map_results(rows: list[dict]) -> dict[int, dict]:
+        """
+        Map each runner's id to its result row.
+
+        Parameters
+        ----------
+        rows: list[dict]
+            The competition's result rows.
+
+        Returns
+        -------
+        dict[int, dict]
+            The mapping runner's id -> result row, without the results whose
+            runner's id is missing.
+        """
+        mapping: dict[int, dict] = {}
+        for row in rows:
+            if row["runner_id"] is None:
+                logger.warning("Missing runner id for result=%s", row)
+                continue
+            mapping[row["runner_id"]] = row
+        return mapping
+
     @asynccontextmanager
     async def __db_session(self) -> AbstractAsyncContextManager[AsyncSession]:
-        async_session = async_sessionmaker(self._engine)
-        async with async_session() as session, session.begin():
+        async with self._session_maker() as session, session.begin():
             yield session
+            # the session's connection is still checked out
+            self._pool_metrics.sample(self._engine.pool.checkedout())
+
+    def __lock(self, table: str, key: object) -> asyncio.Lock:
+        """Get the lock guarding the writes of `key` in `table`."""
+        return self._locks.get(table, key)
 
-    async def __insert(self, stmt: Insert, lock_table: str) -> list[int]:
+    async def __transaction(
+            self,
+            work: Callable[[AsyncSession], Awaitable[T]],
+            *locks: asyncio.Lock
+    ) -> T:
+        """
+        Run some work in a single transaction, retried on deadlocks.
+
+        Parameters
+        ----------
+        work: Callable[[AsyncSession], Awaitable[T]]
+            The statements to execute, given the transaction's session.
+        locks: asyncio.Lock
+            The locks held during the transaction, acquired in order. Useful
+            to avoid upserting the same keys concurrently.
+
+        Returns
+        -------
+        T
+            The result of the work.
+        """
+        attempt = 0
+        while True:
+            try:
+                async with AsyncExitStack() as stack:
+                    for lock in locks:
+                        await stack.enter_async_context(lock)
+                    session = await stack.enter_async_context(self.__db_session())
+                    return await work(session)
+            except DBAPIError as exc:
+                if attempt >= DEADLOCK_RETRIES or not is_retryable(exc):
+                    raise
+                delay = DEADLOCK_RETRY_DELAY * 2 ** attempt
+                logger.warning(
+                    "Transaction deadlocked, retrying in %.2fs: %s", delay, exc.orig)
+                # jitter, so that the deadlocked transactions don't collide again
+                await asyncio.sleep(delay * random.uniform(1, 2))  # noqa: S311
+                attempt += 1
+
+    async def __insert(
+            self,
+            stmt: Insert,
+            lock: asyncio.Lock | None = None
+    ) -> list[int]:
         """
         Execute insert statement.
 
@@ -159,9 +436,8 @@ class MySQLClient(Database):
         ----------
         stmt: Insert
             INSERT stmt to execute.
-        lock_table: str
-            If not None, create an async lock unique to `lock_table` string
-            (usually the table's name). Useful to avoid Deadlocks.
+        lock: asyncio.Lock | None
+            If not None, the lock held during the insertion (see `__lock`).
 
         Returns
         -------
@@ -169,11 +445,15 @@ class MySQLClient(Database):
             the sorted list of newly created ids, in the order
             of the provided data.
         """
-        async with get_lock(lock_table), self.__db_session() as session:
-            result = await session.execute(stmt)
-            return result.inserted_primary_key
+        locks = [lock] if lock is not None else []
+        result = await self.__transaction(lambda session: session.execute(stmt), *locks)
+        return result.inserted_primary_key
 
-    async def __execute(self, stmt: ValuesBase, lock_table: str) -> None:
+    async def __execute(
+            self,
+            stmt: ValuesBase,
+            lock: asyncio.Lock | None = None
+    ) -> None:
         """
         Execute insert statement.
 
@@ -181,12 +461,11 @@ class MySQLClient(Database):
         ----------
         stmt: ValuesBase
             DML stmt to execute.
-        lock_table: str
-            If not None, create an async lock unique to `lock_table` string
-            (usually the table's name). Useful to avoid Deadlocks.
+        lock: asyncio.Lock | None
+            If not None, the lock held during the execution (see `__lock`).
         """
-        async with get_lock(lock_table), self.__db_session() as session:
-            await session.execute(stmt)
+        locks = [lock] if lock is not None else []
+        await self.__transaction(lambda session: session.execute(stmt), *locks)
 
     async def __add_competition(
             self,
@@ -210,7 +489,9 @@ class MySQLClient(Database):
         stmt = stmt.on_duplicate_key_update(
             name=stmt.inserted.name
         )
-        res = await self.__insert(stmt, orm.Competition.__tablename__)
+        res = await self.__insert(stmt, self.__lock(
+            orm.Competition.__tablename__,
+            (competition.name, competition.timekeeper)))
         comp_id = int(res[0])
         if comp_id > 0:
             return comp_id
@@ -242,7 +523,9 @@ class MySQLClient(Database):
         stmt = stmt.on_duplicate_key_update(
             distance=stmt.inserted.distance
         )
-        res = await self.__insert(stmt, orm.CompetitionEvent.__tablename__)
+        res = await self.__insert(stmt, self.__lock(
+            orm.CompetitionEvent.__tablename__,
+            (competition.event, competition.date.start, competition.distance)))
         event_id = int(res[0])
         if event_id > 0:
             return event_id
@@ -252,37 +535,167 @@ class MySQLClient(Database):
             competition.distance,
         )
 
-    async def __add_runner(self, runner: models.Runner) -> int:
+    async def __add_runner(self, runner: dict) -> int:
         """
         Add runners that are not yet stored in the database.
 
         Parameters
         ----------
-        runner: models.Runner
-            The runner to add in the database.
+        runner: dict
+            The row of the runner to add in the database.
 
         Returns
         -------
         int
             The added runner's unique id.
         """
-        obj = orm.Runner.from_model(runner)
-        stmt = insert(orm.Runner).values(obj)
+        stmt = insert(orm.Runner).values(runner)
         stmt = stmt.on_duplicate_key_update(gender=stmt.inserted.gender)
-        res = await self.__insert(stmt, orm.Runner.__tablename__)
+        # without birth year, the runner never collides on the unique key
+        res = await self.__insert(stmt)
         runner_id = int(res[0])
         if runner_id > 0:
             return runner_id
         return await self.__get_runner_id(
-            runner.first_name,
-            runner.last_name,
-            runner.birth_year,
+            runner["first_name"],
+            runner["last_name"],
+            runner["birth_year"],
+        )
+
+    async def __add_runners(
+            self,
+            runners: list[dict]
+    ) -> list[int | None]:
+        """
+        Add runners that are not yet stored in the database, in bulk.
+
+        Runners whose id is cached are not sent to the database. Others are
+        upserted with a single multi-row statement, and their ids are fetched
+        back with a single SELECT on their unique key.
+
+        Runners without birth year never collide on the unique key (NULL is
+        not equal to NULL), hence they are added one by one, as well as the
+        runners whose key is returned differently by the database (the
+        string comparison depends on the column's collation).
+
+        Parameters
+        ----------
+        runners: list[dict]
+            The rows of the runners to add in the database.
+
+        Returns
+        -------
+        list[int | None]
+            The added runners' unique ids, in the same order as `runners`.
+        """
+        keys, unique_rows, ids = self.__split_cached_runners(runners)
+        if unique_rows:
+            await self.__execute(self.__upsert_runners_stmt(unique_rows))
+            found = await self.__get_runner_ids(list(unique_rows))
+            for key, runner_id in found.items():
+                self._runners_cache.put(key, runner_id)
+            ids.update(found)
+
+        async def get_id(key: RunnerKey, runner: dict) -> int | None:
+            """Return the runner's id, querying the database if missing."""
+            if key in ids:
+                return ids[key]
+            if key[2] is None:
+                return await self.__add_runner(runner)
+            runner_id = await self.__get_runner_id(*key)
+            if runner_id is not None:
+                self._runners_cache.put(key, runner_id)
+            return runner_id
+
+        return list(await asyncio.gather(*[
+            get_id(key, runner) for key, runner in zip(keys, runners, strict=True)
+        ]))
+
+    def __split_cached_runners(
+            self,
+            runners: list[dict]
+    ) -> tuple[list[RunnerKey], dict[RunnerKey, dict], dict[RunnerKey, int]]:
+        """
+        Split the runners between the cached ones and the ones to upsert.
+
+        Parameters
+        ----------
+        runners: list[dict]
+            The rows of the runners to add in the database.
+
+        Returns
+        -------
+        list[RunnerKey]
+            The key of each runner, in the same order as `runners`.
+        dict[RunnerKey, dict]
+            The rows to upsert in bulk, without duplicates nor runners
+            without birth year.
+        dict[RunnerKey, int]
+            The ids of the cached runners.
+        """
+        keys: list[RunnerKey] = [
+            (row["first_name"], row["last_name"], row["birth_year"]) for row in runners]
+
+        # remove duplicates: the last row wins, as with ON DUPLICATE KEY UPDATE
+        unique_rows = {
+            key: row for key, row in zip(keys, runners, strict=True)
+            if key[2] is not None
+        }
+        # runners whose id is cached are not sent to the database
+        ids: dict[RunnerKey, int] = {}
+        for key in list(unique_rows):
+            runner_id = self._runners_cache.get(key)
+            if runner_id is not None:
+                ids[key] = runner_id
+                del unique_rows[key]
+        return keys, unique_rows, ids
+
+    def __upsert_runners_stmt(self, unique_rows: dict[RunnerKey, dict]) -> Insert:
+        """Build the statement upserting runners in bulk."""
+        # rows are upserted in the order of the unique key: concurrent
+        # upserts lock the same keys in the same order, and can't deadlock
+        stmt = insert(orm.Runner).values([
+            unique_rows[key] for key in self._locks.order(unique_rows)])
+        return stmt.on_duplicate_key_update(gender=stmt.inserted.gender)
+
+    def __insert_results_stmt(self, results_mapping: dict[int, dict]) -> Insert:
+        """Build the statement inserting an event's result rows."""
+        # rows are inserted in the order of the primary key
+        return insert(orm.Result).values([
+            results_mapping[runner_id]
+            for runner_id in self._locks.order(results_mapping)
+        ])
+
+    @staticmethod
+    def __runner_id_stmt(
+            first_name: str, last_name: str, birth_year: int) -> Select:
+        """Build the statement selecting a runner's id."""
+        return select(orm.Runner.id).where(
+            orm.Runner.first_name == first_name,
+            orm.Runner.last_name == last_name,
+            orm.Runner.birth_year == birth_year
+        )
+
+    @staticmethod
+    def __runner_ids_stmt(keys: list[RunnerKey]) -> Select:
+        """Build the statement selecting many runners ids, with their key."""
+        return select(
+            orm.Runner.id,
+            orm.Runner.first_name,
+            orm.Runner.last_name,
+            orm.Runner.birth_year,
+        ).where(
+            tuple_(
+                orm.Runner.first_name,
+                orm.Runner.last_name,
+                orm.Runner.birth_year,
+            ).in_(keys)
         )
 
     async def __add_competition_results(
             self,
             event_id: int,
-            results_mapping: dict[int, models.Result]
+            results_mapping: dict[int, dict]
     ) -> None:
         """
         Add runners results in the database.
@@ -294,21 +707,75 @@ class MySQLClient(Database):
         ----------
         event_id: int
             The competition event id.
-        results_mapping: dict[int, models.Result]
-            The mapping runner's id -> result to be added in the DB.
+        results_mapping: dict[int, dict]
+            The mapping runner's id -> result row to be added in the DB.
         """
-        async with get_lock(orm.Result.__tablename__), \
-                self.__db_session() as session:
-            # first remove results for this competition
-            stmt = delete(orm.Result).where(orm.Result.event_id == event_id)
-            await session.execute(stmt)
+        await self.__transaction(
+            lambda session: self.__write_results(session, event_id, results_mapping),
+            self.__lock(orm.Result.__tablename__, event_id))
+
+    async def __write_results(
+            self,
+            session: AsyncSession,
+            event_id: int,
+            rows: dict[int, dict]
+    ) -> None:
+        """
+        Replace the results of an event, in the given transaction.
+
+        By default, all the stored results of the event are deleted, then
+        the new ones are inserted. If the diff mode is enabled, the stored
+        results are compared to the new ones instead: only the vanished
+        results are deleted, and only the new & changed ones are upserted.
 
-            # add results
+        Parameters
+        ----------
+        session: AsyncSession
+            The transaction's session.
+        event_id: int
+            The competition event id.
+        rows: dict[int, dict]
+            The mapping runner's id -> result row to be stored in the DB.
+        """
+        if not self._diff_results:
+            await session.execute(
+                delete(orm.Result).where(orm.Result.event_id == event_id))
+            if rows:
+                await session.execute(
+                    self.__insert_results_stmt(rows))
+            return
+
+        res = await session.execute(
+            select(*orm.Result.stored_columns()).where(orm.Result.event_id == event_id))
+        stored = {
+            row["runner_id"]: orm.Result.from_stored(row)
+            for row in res.mappings().all()
+        }
+        new = [runner_id for runner_id in rows if runner_id not in stored]
+        changed = [
+            runner_id for runner_id, row in rows.items()
+            if runner_id in stored and row != stored[runner_id]
+        ]
+        vanished = self._locks.order(set(stored) - set(rows))
+
+        if vanished:
+            await session.execute(delete(orm.Result).where(
+                orm.Result.event_id == event_id,
+                orm.Result.runner_id.in_(vanished),
+            ))
+        if new or changed:
+            # rows are upserted in the order of the primary key
             stmt = insert(orm.Result).values([
-                orm.Result.from_model(result, event_id, runner_id)
-                for runner_id, result in results_mapping.items()
-            ])
+                rows[runner_id] for runner_id in self._locks.order(new + changed)])
+            stmt = stmt.on_duplicate_key_update({
+                column: stmt.inserted[column]
+                for column in RESULT_UPDATED_COLUMNS
+            })
             await session.execute(stmt)
+        logger.info(
+            "Results of event=%d: %d inserted, %d updated, %d deleted, %d unchanged",
+            event_id, len(new), len(changed), len(vanished),
+            len(rows) - len(new) - len(changed))
 
     async def __get_runner_id(
             self, first_name: str, last_name: str, birth_year: int) -> int | None:
@@ -329,16 +796,37 @@ class MySQLClient(Database):
         Optional[int]
             The runner's unique id, if any found.
         """
-        stmt = select(orm.Runner.id).where(
-            orm.Runner.first_name == first_name,
-            orm.Runner.last_name == last_name,
-            orm.Runner.birth_year == birth_year
-        )
+        stmt = self.__runner_id_stmt(first_name, last_name, birth_year)
         async with self.__db_session() as session:
             res = await session.execute(stmt)
             runner_id = res.fetchone()
             return runner_id[0] if runner_id is not None else None
 
+    async def __get_runner_ids(
+            self,
+            keys: list[RunnerKey]
+    ) -> dict[RunnerKey, int]:
+        """
+        Get many runners ids from the database at once.
+
+        Parameters
+        ----------
+        keys: list[RunnerKey]
+            The runners' (first name, last name, birth year).
+
+        Returns
+        -------
+        dict[RunnerKey, int]
+            The mapping (first name, last name, birth year) -> runner's id, for
+            all found runners.
+        """
+        async with self.__db_session() as session:
+            res = await session.execute(self.__runner_ids_stmt(keys))
+            return {
+                (first_name, last_name, birth_year): runner_id
+                for runner_id, first_name, last_name, birth_year in res.all()
+            }
+
     async def __get_competition_id(
             self, name: str, timekeeper: str) -> int | None:
         """
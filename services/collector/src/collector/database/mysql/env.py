@@ -14,11 +14,41 @@ class Environments:
     port: int
     dbname: str
 
+    # maximum number of runners ids cached in memory (0 disables the cache)
+    runners_cache_size: int = 100_000
+    # whether the runners cache is filled from the database at startup
+    runners_cache_warm: bool = False
+
+    # connections kept open in the pool
+    pool_size: int = 5
+    # connections opened on top of the pool when it is saturated
+    pool_max_overflow: int = 10
+    # seconds after which a connection is recycled (-1 to never recycle)
+    pool_recycle: int = -1
+    # whether connections are tested before being used
+    pool_pre_ping: bool = False
+
+    # locks guarding concurrent writes of the same keys (1 serializes writes)
+    lock_stripes: int = 64
+    # whether a competition is stored in a single transaction
+    single_transaction: bool = False
+    # whether only the new, changed & vanished results are written
+    diff_results: bool = False
+
     def url(self) -> str:
         """Provide the Database URL."""
         address = f"{self.host}:{self.port}" if self.port else self.host
         return f"mysql+asyncmy://{self.user}:{self.password}@{address}/{self.dbname}"
 
+    def engine_options(self) -> dict[str, int | bool]:
+        """Provide the connection pool options of the Database engine."""
+        return {
+            "pool_size": self.pool_size,
+            "max_overflow": self.pool_max_overflow,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+        }
+
     @classmethod
     def parse(cls) -> "Environments":
         """Create a DB environment object from the environment file."""
@@ -30,5 +60,25 @@ class Environments:
             password=os.getenv("MYSQL_PASSWORD"),
             host=host,
             port=int(port),
-            dbname=os.getenv("MYSQL_DBNAME")
+            dbname=os.getenv("MYSQL_DBNAME"),
+            runners_cache_size=int(
+                os.getenv("MYSQL_RUNNERS_CACHE_SIZE", str(cls.runners_cache_size))),
+            runners_cache_warm=parse_bool(
+                os.getenv("MYSQL_RUNNERS_CACHE_WARM", str(cls.runners_cache_warm))),
+            pool_size=int(os.getenv("MYSQL_POOL_SIZE", str(cls.pool_size))),
+            pool_max_overflow=int(
+                os.getenv("MYSQL_POOL_MAX_OVERFLOW", str(cls.pool_max_overflow))),
+            pool_recycle=int(os.getenv("MYSQL_POOL_RECYCLE", str(cls.pool_recycle))),
+            pool_pre_ping=parse_bool(
+                os.getenv("MYSQL_POOL_PRE_PING", str(cls.pool_pre_ping))),
+            lock_stripes=int(os.getenv("MYSQL_LOCK_STRIPES", str(cls.lock_stripes))),
+            single_transaction=parse_bool(
+                os.getenv("MYSQL_SINGLE_TRANSACTION", str(cls.single_transaction))),
+            diff_results=parse_bool(
+                os.getenv("MYSQL_DIFF_RESULTS", str(cls.diff_results))),
         )
+
+
+def parse_bool(value: str) -> bool:
+    """Parse a boolean environment variable."""
+    return value.strip().lower() in {"1", "true", "yes", "on"}
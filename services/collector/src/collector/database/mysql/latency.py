@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class LatencyMetrics:
+    """
+    Latency of the competitions ingestion.
+
+    Attributes
+    ----------
+    count: int
+        How many competitions have been stored.
+    total: float
+        The sum of the latencies, in seconds.
+    maximum: float
+        The maximum latency, in seconds.
+    """
+
+    count: int = 0
+    total: float = 0.
+    maximum: float = 0.
+
+    def record(self, seconds: float) -> None:
+        """
+        Record the latency of a competition's ingestion.
+
+        Parameters
+        ----------
+        seconds: float
+            How long it took to store the competition.
+        """
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+
+    @property
+    def mean(self) -> float:
+        """Return the average latency, in seconds."""
+        if self.count == 0:
+            return 0.
+        return self.total / self.count
@@ -0,0 +1,93 @@
+import asyncio
+from collections.abc import Hashable, Iterable
+from typing import TypeVar
+
+# MySQL errors after which a transaction can safely be retried
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+
+K = TypeVar("K")
+
+
+class StripedLocks:
+    """
+    Asyncio locks striped by key.
+
+    Writing the same unique key from concurrent transactions is what makes
+    MySQL upserts deadlock. Instead of a single lock per table, every key
+    is mapped to one of the table's `stripes` locks: writes of the same key
+    are serialized, while writes of different keys (e.g. independent
+    competitions) most likely run in parallel.
+
+    The rows of a bulk write are not guarded one by one: every transaction
+    writes them in the same order instead (see `order`), so that the
+    database row locks can't deadlock.
+
+    Attributes
+    ----------
+    stripes: int
+        The number of locks per table. 1 serializes all the writes of a table.
+    """
+
+    def __init__(self, stripes: int = 64) -> None:
+        self.stripes = max(stripes, 1)
+        self._locks: dict[tuple[str, int], asyncio.Lock] = {}
+
+    def get(self, table: str, key: Hashable) -> asyncio.Lock:
+        """
+        Get the lock of a key.
+
+        Parameters
+        ----------
+        table: str
+            The name of the table the key belongs to.
+        key: Hashable
+            The unique key to write.
+
+        Returns
+        -------
+        asyncio.Lock
+            The lock guarding this key.
+        """
+        stripe = (table, hash(key) % self.stripes)
+        lock = self._locks.get(stripe)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[stripe] = lock
+        return lock
+
+    def order(self, keys: Iterable[K]) -> list[K]:
+        """
+        Sort the keys of the rows written by a bulk statement.
+
+        Parameters
+        ----------
+        keys: Iterable[K]
+            The unique keys of the written rows.
+
+        Returns
+        -------
+        list[K]
+            The keys, in the order the rows must be written.
+        """
+        return sorted(keys)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Check whether a database error is a deadlock or a lock wait timeout.
+
+    Parameters
+    ----------
+    exc: BaseException
+        The error raised by the database driver, possibly wrapped by
+        SQLAlchemy.
+
+    Returns
+    -------
+    bool
+        True if the failed transaction can be retried.
+    """
+    orig = getattr(exc, "orig", exc)
+    args = getattr(orig, "args", ())
+    return bool(args) and args[0] in {ER_LOCK_WAIT_TIMEOUT, ER_LOCK_DEADLOCK}
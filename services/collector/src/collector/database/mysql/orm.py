@@ -1,9 +1,11 @@
 import datetime
 import logging
+import math
+from collections.abc import Mapping, Sequence
 from datetime import date, timedelta
 
 from sqlalchemy import ForeignKey, UniqueConstraint, String, Date, Time, \
-    PrimaryKeyConstraint
+    PrimaryKeyConstraint, ColumnElement, func
 from sqlalchemy.dialects.mysql import SMALLINT, CHAR, INTEGER, YEAR, DECIMAL
 from sqlalchemy.orm import declarative_base, Mapped, mapped_column
 
@@ -120,17 +122,110 @@ class Result(Base):
             runner_id: int
     ) -> dict:
         """Create a result row from the corresponding model."""
+        record = models.ResultRecord.from_model(result)
+        return cls.from_record(record, event_id, runner_id)
+
+    @classmethod
+    def from_record(
+            cls,
+            result: models.ResultRecord,
+            event_id: int,
+            runner_id: int
+    ) -> dict:
+        """Create a result row from the corresponding record."""
+        return cls.__row(
+            event_id,
+            runner_id,
+            result.status,
+            None if result.time is None else result.time.total_seconds(),
+            result.license,
+            result.category,
+            result.scratch,
+            result.gender_ranking,
+            result.category_ranking)
+
+    @classmethod
+    def from_batch(
+            cls,
+            batch: models.ResultsBatch,
+            event_id: int,
+            runner_ids: Sequence[int | None]
+    ) -> list[dict]:
+        """Create the result rows of a batch, as `from_record` does."""
+        return [
+            cls.__row(
+                event_id,
+                runner_id,
+                status,
+                None if math.isnan(seconds) else seconds,
+                license_,
+                category,
+                models.optional_number(scratch),
+                models.optional_number(gender_ranking),
+                models.optional_number(category_ranking))
+            for (
+                runner_id, status, seconds, license_, category, scratch,
+                gender_ranking, category_ranking,
+            ) in zip(
+                runner_ids, batch.statuses, batch.times, batch.licenses,
+                batch.categories, batch.scratch, batch.gender_ranking,
+                batch.category_ranking, strict=True)
+        ]
+
+    @staticmethod
+    def __row(  # noqa: PLR0913
+            event_id: int,
+            runner_id: int | None,
+            status: models.ResultStatus,
+            seconds: float | None,
+            license_: str | None,
+            category: str,
+            scratch: int | None,
+            gender_ranking: int | None,
+            category_ranking: int | None
+    ) -> dict:
+        """Create a result row, from a result's values."""
         return {
             "runner_id": runner_id,
             "event_id": event_id,
-            "status": result.status.value,
-            "time": utils.format_timedelta(
-                result.time) if result.time else None,
-            "license": result.license if result.license else None,
-            "category": result.category,
-            "scratch_ranking": result.rank.scratch if result.rank else None,
-            "gender_ranking": result.rank.gender if result.rank else None,
-            "category_ranking": result.rank.category if result.rank else None,
+            "status": status.value,
+            # a zero time is stored as missing, as it has always been
+            "time": utils.format_seconds(seconds) if seconds else None,
+            "license": license_ or None,
+            "category": category,
+            "scratch_ranking": scratch,
+            "gender_ranking": gender_ranking,
+            "category_ranking": category_ranking,
+        }
+
+    @classmethod
+    def stored_columns(cls) -> list[ColumnElement]:
+        """
+        Return the columns to select, to compare the stored results.
+
+        The time is selected in seconds: the driver reads a TIME column as a
+        `datetime.time`, which fails from 24 hours on (ultra-trails).
+        """
+        return [
+            *(column for column in cls.__table__.columns if column.name != "time"),
+            func.time_to_sec(cls.time).label("time"),
+        ]
+
+    @staticmethod
+    def from_stored(row: Mapping[str, object]) -> dict:
+        """Create a result row from a stored one (see `stored_columns`)."""
+        # an integer, or a decimal with fractional seconds
+        seconds = row["time"]
+        return {
+            "runner_id": row["runner_id"],
+            "event_id": row["event_id"],
+            "status": row["status"],
+            "time": None if seconds is None else utils.format_seconds(seconds),
+            "license": row["license"],
+            "category": row["category"],
+            "scratch_ranking": row["scratch_ranking"],
+            "gender_ranking": row["gender_ranking"],
+            "category_ranking": row["category_ranking"],
         }
 
 
@@ -150,10 +245,37 @@ class Runner(Base):
     )
 
     @classmethod
-    def from_model(cls, runner: models.Runner) -> dict:
-        """Create a runner row from the corresponding model."""
+    def from_model(cls, runner: models.Runner | models.ResultRecord) -> dict:
+        """Create a runner row from the corresponding model, or result record."""
+        return cls.__row(
+            runner.first_name,
+            runner.last_name,
+            runner.birth_year,
+            runner.gender,
+            datetime.datetime.now(tz=datetime.UTC).year)
+
+    @classmethod
+    def from_batch(cls, batch: models.ResultsBatch) -> list[dict]:
+        """Create the runner rows of a batch, as `from_model` does."""
         current_year = datetime.datetime.now(tz=datetime.UTC).year
-        birth_year = runner.birth_year
+        return [
+            cls.__row(
+                first_name, last_name, models.optional_number(birth_year), gender,
+                current_year)
+            for first_name, last_name, birth_year, gender in zip(
+                batch.first_names, batch.last_names, batch.birth_years,
+                batch.genders, strict=True)
+        ]
+
+    @staticmethod
+    def __row(
+            first_name: str,
+            last_name: str,
+            birth_year: int | None,
+            gender: models.Gender,
+            current_year: int
+    ) -> dict:
+        """Create a runner row, without an invalid birth year."""
         # year before 1901 are not accepted (and not relevant anyway)
         if (
                 birth_year is not None
@@ -161,11 +283,11 @@ class Runner(Base):
         ):
             logger.warning(
                 "not valid BirthYear=%d for runner=\"%s %s\"",
-                birth_year, runner.first_name, runner.last_name)
+                birth_year, first_name, last_name)
             birth_year = None
         return {
-            'first_name': runner.first_name,
-            'last_name': runner.last_name,
+            'first_name': first_name,
+            'last_name': last_name,
             'birth_year': birth_year,
-            'gender': runner.gender.value,
+            'gender': gender.value,
         }
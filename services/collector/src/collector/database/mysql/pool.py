@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class PoolMetrics:
+    """
+    Utilization of the database connection pool.
+
+    The number of checked-out connections is sampled every time a session
+    is used, and compared to the pool capacity (pool size + max overflow).
+
+    Attributes
+    ----------
+    capacity: int
+        The maximum number of connections the pool can open.
+    samples: int
+        How many times the pool has been sampled.
+    total_in_use: int
+        The sum of the sampled checked-out connections.
+    peak_in_use: int
+        The maximum sampled checked-out connections.
+    """
+
+    capacity: int
+    samples: int = 0
+    total_in_use: int = 0
+    peak_in_use: int = 0
+
+    def sample(self, in_use: int) -> None:
+        """
+        Record the number of checked-out connections.
+
+        Parameters
+        ----------
+        in_use: int
+            The number of connections currently checked out from the pool.
+        """
+        self.samples += 1
+        self.total_in_use += in_use
+        self.peak_in_use = max(self.peak_in_use, in_use)
+
+    @property
+    def utilization(self) -> float:
+        """Return the average ratio of checked-out connections, from 0 to 1."""
+        if self.samples == 0 or self.capacity <= 0:
+            return 0.
+        return self.total_in_use / self.samples / self.capacity
+
+    @property
+    def peak_utilization(self) -> float:
+        """Return the maximum ratio of checked-out connections, from 0 to 1."""
+        if self.capacity <= 0:
+            return 0.
+        return self.peak_in_use / self.capacity
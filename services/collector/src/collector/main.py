@@ -1,15 +1,20 @@
 import argparse
 import asyncio
+import datetime
 import logging
 
 from collector.controller import BackgroundController
 from collector.database import client as db_client, Database
+from collector.matching import MatchResult, ParallelMatcher
+from collector.pipeline import PipelineConfig, Stage
 from collector.scrapers import (
     discover_timekeepers as discover_timekeepers_scrapers,
     discover_metadata_scrapers,
     ResultsScraper,
     MetadataScraper
 )
+from collector.scrapers.executor import ParseExecutor
+from collector.scrapers.requester import HTTPCache, HTTPClient, TokenBucketLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -17,24 +22,46 @@ scrap_all_type = 'all'
 scrap_timekeepers_type = 'timekeepers'
 scrap_metadata_type = 'metadata'
 
+# requests rate per host, in requests per second
+requests_rate = 1.
 
-async def run_single_results_scraper(scraper: ResultsScraper, db: Database) -> None:
+
+async def run_single_results_scraper(
+        scraper: ResultsScraper,
+        db: Database,
+        horizon: datetime.timedelta | None = None
+) -> None:
     """
     Run a single scraper.
 
-    Run `scraper.scrap()` function to iterate all found competition events
-    and the results
-    Concurrently, add those data in the DB
+    Run the `scraper.pipeline()` stages to fetch and parse all found
+    competition events and their results
+    Concurrently, add those data in the DB, as a last stage
 
     :param scraper: the scraper that will iterate competitions and results
     :param db: the database client
+    :param horizon: if given, the competition events older than this horizon
+        which already have results are not scraped again (incremental mode)
     """
-    controller = BackgroundController()
-
-    async for competition in scraper.scrap():
-        controller.run_in_background(db.add_competition(competition))
-
-    await controller.wait()
+    # the unchanged results pages of those events are not parsed again
+    stored = await db.search_ingested_events()
+    logger.info("%d competition events already ingested", len(stored))
+    skip: set = set()
+    if horizon is not None:
+        before = datetime.datetime.now(tz=datetime.UTC).date() - horizon
+        skip = {key for key in stored if key[2] < before}
+
+    # fetch -> parse -> normalize -> store, each stage with its own workers
+    config = PipelineConfig.from_env()
+    pipeline = scraper.pipeline(skip=skip, stored=stored, config=config)
+    pipeline.add_stage(Stage("store", db.add_competition, workers=config.store_workers))
+    await pipeline.run()
+
+    pipeline.log_metrics()
+    if pipeline.errors:
+        logger.warning(
+            "%d errors collected by %s",
+            len(pipeline.errors), type(scraper).__name__)
 
 
 async def run_metadata_scraper(scraper: MetadataScraper, db: Database) -> None:
@@ -42,6 +69,9 @@ async def run_metadata_scraper(scraper: MetadataScraper, db: Database) -> None:
     Run the scraper to fetch metadata.
 
     Execute `scraper.scrap()` to iterate a set of events' metadata
+    Once all scraped, assign them one-to-one to the DB events, in worker
+    processes if enabled (see `ParallelMatcher.assign`): each event is
+    updated at most once
     Then, concurrently, update the DB events with those metadata
 
     :param scraper: the scraper that will iterate competition events' metadata
@@ -50,41 +80,65 @@ async def run_metadata_scraper(scraper: MetadataScraper, db: Database) -> None:
     controller = BackgroundController()
     all_competitions = await db.search_competitions()
 
-    async for metadata in scraper.scrap():
-        comp_id = metadata.find_best_match(all_competitions)
-        if comp_id is None:
-            logger.debug("%s has a no best match", metadata.event)
-            continue
-        logger.debug(
-            "%s has a best match: %s",
-            metadata.event,
-            all_competitions[comp_id].event)
-        controller.run_in_background(db.update_competition(comp_id, metadata))
-
+    async def update(matches: list[MatchResult]) -> None:
+        """Update the DB events with the matched metadata."""
+        for metadata, comp_id, similarity in matches:
+            if comp_id is None:
+                logger.debug("%s has no match", metadata.event)
+                continue
+            logger.debug(
+                "%s is matched to: %s (similarity=%.3f)",
+                metadata.event,
+                all_competitions[comp_id].event,
+                similarity)
+            await controller.run_in_background(db.update_competition(comp_id, metadata))
+
+    # all metadata are needed to assign them globally
+    all_metadata = [metadata async for metadata in scraper.scrap()]
+    async with ParallelMatcher.from_env(all_competitions) as matcher:
+        await update(await matcher.assign(all_metadata))
+
+    logger.info("Metadata matching stats: %s", matcher.stats)
+    logger.info(
+        "Names similarity cache: %d hits, %d misses",
+        matcher.names_hits, matcher.names_misses)
     await controller.wait()
+    logger.info(
+        "%d competitions updated, %d failed",
+        controller.completed - len(controller.errors), len(controller.errors))
 
 
 async def run(
         type_: str = scrap_all_type,
-        scrapers: list[str] | None = None
+        scrapers: list[str] | None = None,
+        horizon: datetime.timedelta | None = None
 ) -> None:
     """Run all scrapers."""
     # set-up logging
     logging.basicConfig()
     logging.getLogger().setLevel(logging.INFO)
 
-    async with db_client() as db:
+    # a single HTTP client: all scrapers share its connections pool
+    http_client = HTTPClient(
+        limiter=TokenBucketLimiter(rate=requests_rate, burst=1),
+        cache=HTTPCache.from_env())
+    # parse the pages out of the event loop, while fetching the next ones
+    parse_executor = ParseExecutor.from_env()
+
+    async with db_client() as db, http_client, parse_executor:
         if type_ in {scrap_all_type, scrap_timekeepers_type}:
             # first fetch the data from timekeepers
             await asyncio.gather(*[
-                run_single_results_scraper(scraper, db)
-                for scraper in discover_timekeepers_scrapers(scrapers=scrapers)
+                run_single_results_scraper(scraper, db, horizon=horizon)
+                for scraper in discover_timekeepers_scrapers(
+                    http_client, scrapers=scrapers, executor=parse_executor)
             ])
         if type_ in {scrap_all_type, scrap_metadata_type}:
             # then fetch metadata (elevations for example)
             await asyncio.gather(*[
                 run_metadata_scraper(scraper, db)
-                for scraper in discover_metadata_scrapers(scrapers=scrapers)
+                for scraper in discover_metadata_scrapers(
+                    http_client, scrapers=scrapers, executor=parse_executor)
             ])
 
 
@@ -102,7 +156,19 @@ if __name__ == '__main__':
         default='',
         help='comma-separated list of scrapers to run.'
     )
+    parser.add_argument(
+        '-i', '--incremental',
+        type=int,
+        default=None,
+        metavar='DAYS',
+        help='Skip the competitions older than DAYS days which already have results.'
+    )
     args = parser.parse_args()
+    horizon = (
+        datetime.timedelta(days=args.incremental)
+        if args.incremental is not None else None
+    )
 
     # run
-    asyncio.run(run(type_=args.type, scrapers=args.scrapers or None))
+    asyncio.run(run(
+        type_=args.type, scrapers=args.scrapers or None, horizon=horizon))
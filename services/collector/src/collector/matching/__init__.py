@@ -0,0 +1,12 @@
+from collector.matching.assignment import assign
+from collector.matching.index import CompetitionIndex
+from collector.matching.names import NameMatcher
+from collector.matching.parallel import MatchResult, ParallelMatcher
+
+__all__ = [
+    "CompetitionIndex",
+    "MatchResult",
+    "NameMatcher",
+    "ParallelMatcher",
+    "assign",
+]
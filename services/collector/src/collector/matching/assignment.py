@@ -0,0 +1,46 @@
+from collections.abc import Sequence
+
+
+def assign(
+        candidates: Sequence[Sequence[tuple[int, float]]]
+) -> list[tuple[int | None, float]]:
+    """
+    Assign the competitions to the metadata, one-to-one.
+
+    Each metadata gets at most one competition, and each competition at most
+    one metadata. The candidate pairs are assigned greedily, by decreasing
+    similarity: a pair is kept unless its metadata or its competition is
+    already assigned. Only the candidate pairs are considered, which are
+    few (see `CompetitionMetaData.matches`).
+
+    The ties are broken by the metadata order, then by the candidates order:
+    the assignment is deterministic.
+
+    Parameters
+    ----------
+    candidates: Sequence[Sequence[tuple[int, float]]]
+        For each metadata, the matching competitions ids and their
+        similarity.
+
+    Returns
+    -------
+    list[tuple[int | None, float]]
+        For each metadata, in order: the assigned competition id (None if
+        none) and its similarity (0 if none).
+    """
+    pairs = sorted(
+        (
+            (-similarity, i, j, comp_id)
+            for i, matches in enumerate(candidates)
+            for j, (comp_id, similarity) in enumerate(matches)
+        ),
+        key=lambda pair: pair[:3])
+
+    assigned: list[tuple[int | None, float]] = [(None, 0.)] * len(candidates)
+    taken: set[int] = set()
+    for neg_similarity, i, _, comp_id in pairs:
+        if assigned[i][0] is not None or comp_id in taken:
+            continue
+        assigned[i] = (comp_id, -neg_similarity)
+        taken.add(comp_id)
+    return assigned
@@ -0,0 +1,184 @@
+import bisect
+import logging
+import math
+from collections import Counter, defaultdict
+
+from collector import models, utils
+from collector.matching.names import NameMatcher, normalize
+
+logger = logging.getLogger(__name__)
+
+# relative slack added to the blocking windows, to absorb rounding errors
+WINDOW_SLACK = 1e-9
+
+
+class CompetitionIndex:
+    """
+    Index the competitions, to find the best match of a metadata quickly.
+
+    Scoring a metadata against every competition is expensive. Since the
+    similarity is a product of factors lower than 1, any competition whose
+    similarity is above the threshold has each factor above the threshold too.
+    Competitions are then blocked on:
+    - start date: competitions are grouped by start day, and only the days
+      whose date similarity can reach the threshold are looked up.
+    - distance: competitions of a day are sorted by distance, and only the
+      ones whose distance similarity can reach the threshold are kept.
+    - name: competitions sharing too few characters with the metadata can't
+      reach the threshold.
+    Only the remaining block of competitions is scored: its numeric factors
+    are computed in a single vectorized pass (see
+    `models.CompetitionColumns`), and the names of the competitions whose
+    numeric factors reach the threshold are compared (see `NameMatcher`).
+    This gives the same result as a full scan for any similarity above the
+    threshold.
+
+    Attributes
+    ----------
+    similarity_threshold: float
+        Only competitions whose similarity is at least this threshold can be
+        matched.
+    stats: models.SimilarityStats
+        Statistics of all the matches so far.
+    names: NameMatcher
+        Compare the names, with the indexed events names normalized once.
+    """
+
+    def __init__(
+            self,
+            all_competitions: dict[int, models.CompetitionMetaData],
+            similarity_threshold: float = 0.85
+    ) -> None:
+        self.similarity_threshold = similarity_threshold
+        self.stats = models.SimilarityStats()
+        self._columns = models.CompetitionColumns.from_competitions(all_competitions)
+        self.names = NameMatcher(self._columns.events)
+        # characters count of each competition's normalized name
+        self._chars: list[Counter[str]] = [
+            Counter(normalize(event)) for event in self._columns.events]
+
+        # competitions positions per start day, sorted by distance
+        self._days: dict[int, list[tuple[float, int]]] = defaultdict(list)
+        for i, comp in enumerate(all_competitions.values()):
+            self._days[comp.date.start.toordinal()].append((comp.distance, i))
+        for comps in self._days.values():
+            comps.sort()
+
+        # blocking windows
+        self._distance_radius = self.__radius(models.DISTANCE_PERC90_DELTA)
+        # hours differences between two dates are multiple of 24
+        hours_radius = self.__radius(models.START_DATE_PERC90_DELTA)
+        self._days_radius = (
+            math.floor(hours_radius / 24) if math.isfinite(hours_radius) else None)
+
+    def __radius(self, perc90_delta: float) -> float:
+        """Return the maximum difference keeping the similarity threshold."""
+        radius = utils.distance_similarity_radius(
+            self.similarity_threshold, perc90_delta=perc90_delta)
+        return radius * (1 + WINDOW_SLACK)
+
+    def __block(
+            self,
+            metadata: models.CompetitionMetaData
+    ) -> models.CompetitionColumns:
+        """Return the competitions that may match the metadata, in the index order."""
+        if self._days_radius is None:
+            rows = range(len(self._columns))
+        else:
+            rows = []
+            day = metadata.date.start.toordinal()
+            for d in range(day - self._days_radius, day + self._days_radius + 1):
+                rows.extend(self.__distance_block(
+                    self._days.get(d, []), metadata.distance))
+
+        chars = Counter(normalize(metadata.event))
+        block = sorted(
+            i for i in rows
+            if utils.characters_similarity_bound(
+                chars, self._chars[i]) >= self.similarity_threshold
+        )
+
+        blocked = len(self._columns) - len(block)
+        self.stats.compared += blocked
+        self.stats.pruned["blocking"] += blocked
+        logger.debug(
+            "%d/%d candidates for %s", len(block), len(self._columns), metadata.event)
+        return self._columns.take(block)
+
+    def __distance_block(
+            self,
+            comps: list[tuple[float, int]],
+            distance: float
+    ) -> list[int]:
+        """Return the positions of the competitions close enough to `distance`."""
+        start = bisect.bisect_left(comps, (distance - self._distance_radius, -math.inf))
+        end = bisect.bisect_right(comps, (distance + self._distance_radius, math.inf))
+        return [i for _, i in comps[start:end]]
+
+    def find_best_match(self, metadata: models.CompetitionMetaData) -> int | None:
+        """
+        Find the best match of the metadata in the indexed competitions.
+
+        Parameters
+        ----------
+        metadata: models.CompetitionMetaData
+            The metadata to match.
+
+        Returns
+        -------
+        int | None
+            The competition id which has the best match, respecting the
+            minimum threshold. None if no competition reaches it.
+        """
+        comp_id, _ = self.best_match(metadata)
+        return comp_id
+
+    def best_match(
+            self,
+            metadata: models.CompetitionMetaData
+    ) -> tuple[int | None, float]:
+        """
+        Find the best match of the metadata, and its similarity.
+
+        Parameters
+        ----------
+        metadata: models.CompetitionMetaData
+            The metadata to match.
+
+        Returns
+        -------
+        int | None
+            The competition id which has the best match, respecting the
+            minimum threshold. None if no competition reaches it.
+        float
+            The similarity of the best match, 0 if there is none.
+        """
+        return metadata.best_match(
+            self.__block(metadata),
+            similarity_threshold=self.similarity_threshold,
+            stats=self.stats,
+            name_similarity=self.names.similarity)
+
+    def matches(
+            self,
+            metadata: models.CompetitionMetaData
+    ) -> list[tuple[int, float]]:
+        """
+        Find all the competitions matching the metadata.
+
+        Parameters
+        ----------
+        metadata: models.CompetitionMetaData
+            The metadata to match.
+
+        Returns
+        -------
+        list[tuple[int, float]]
+            The ids of the competitions reaching the minimum threshold, and
+            their similarity.
+        """
+        return metadata.matches(
+            self.__block(metadata),
+            similarity_threshold=self.similarity_threshold,
+            stats=self.stats,
+            name_similarity=self.names.similarity)
@@ -0,0 +1,157 @@
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from collector import utils
+
+# up to this number of words, all the words subsets of a name are compared
+MAX_EXHAUSTIVE_WORDS = 10
+
+
+def normalize(name: str) -> str:
+    """
+    Normalize a name before comparing it.
+
+    The name is lower-cased, its accents are removed and its words are
+    separated by a single space.
+
+    Parameters
+    ----------
+    name: str
+        The name to normalize.
+
+    Returns
+    -------
+    str
+        The normalized name.
+    """
+    decomposed = unicodedata.normalize("NFKD", name.lower())
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(folded.split())
+
+
+@dataclass(frozen=True, slots=True)
+class NormalizedName:
+    """
+    A name, ready to be compared.
+
+    Attributes
+    ----------
+    text: str
+        The normalized name (see `normalize`).
+    words: list[str]
+        The name's words.
+    """
+
+    text: str
+    words: list[str]
+
+    @classmethod
+    def from_name(cls, name: str) -> "NormalizedName":
+        """Normalize a name, and split it once for all."""
+        text = normalize(name)
+        return cls(text=text, words=utils.split_words(text))
+
+
+class NameMatcher:
+    """
+    Compare names, reusing their normalization and the computed scores.
+
+    The similarity is the one of `utils.sentence_similarity`, on normalized
+    names: accents are ignored. The indexed names (e.g. all the competition
+    events) are normalized when the matcher is built, the other names when
+    first compared. The normalized names and the scores of the compared pairs
+    are cached, with a Least Recently Used eviction: the same names are
+    compared again and again while matching many metadata.
+
+    Attributes
+    ----------
+    max_size: int
+        The maximum number of cached normalized names, and of cached scores.
+        0 disables the caches.
+    hits: int
+        How many times a score has been found in the cache.
+    misses: int
+        How many times a score was computed.
+    """
+
+    def __init__(self, names: Iterable[str] = (), max_size: int = 100_000) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._names: OrderedDict[str, NormalizedName] = OrderedDict()
+        self._scores: OrderedDict[tuple[str, str], float] = OrderedDict()
+        for name in names:
+            self.normalized(name)
+
+    def __len__(self) -> int:
+        """Return the number of cached scores."""
+        return len(self._scores)
+
+    def normalized(self, name: str) -> NormalizedName:
+        """
+        Return a name, normalized.
+
+        Parameters
+        ----------
+        name: str
+            The name to normalize.
+
+        Returns
+        -------
+        NormalizedName
+            The normalized name, computed once per name.
+        """
+        normalized = self._names.get(name)
+        if normalized is not None:
+            self._names.move_to_end(name)
+            return normalized
+
+        normalized = NormalizedName.from_name(name)
+        _cache(self._names, name, normalized, self.max_size)
+        return normalized
+
+    def similarity(self, s1: str, s2: str) -> float:
+        """
+        Compare s1 to s2, as `utils.sentence_similarity` does.
+
+        The function is symmetrical: inverting s1 and s2 will give the same
+        result, from the same cached score.
+
+        Parameters
+        ----------
+        s1: str
+            The first name to compare to the second one.
+        s2: str
+            The second name to compare to the first one.
+
+        Returns
+        -------
+        float
+            A similarity score between 0 and 1.
+        """
+        key = (s1, s2) if s1 <= s2 else (s2, s1)
+        score = self._scores.get(key)
+        if score is not None:
+            self.hits += 1
+            self._scores.move_to_end(key)
+            return score
+
+        self.misses += 1
+        n1, n2 = self.normalized(s1), self.normalized(s2)
+        score = max(
+            utils.words_similarity(n1.words, n2.text, MAX_EXHAUSTIVE_WORDS),
+            utils.words_similarity(n2.words, n1.text, MAX_EXHAUSTIVE_WORDS),
+        )
+        _cache(self._scores, key, score, self.max_size)
+        return score
+
+
+def _cache(cache: OrderedDict, key: object, value: object, max_size: int) -> None:
+    """Add a value to a LRU cache, evicting the least recently used one if full."""
+    if max_size <= 0:
+        return
+    cache[key] = value
+    if len(cache) > max_size:
+        cache.popitem(last=False)
@@ -0,0 +1,236 @@
+import asyncio
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from collector import models
+from collector.matching import assignment
+from collector.matching.index import CompetitionIndex
+
+# a metadata, the id of its assigned competition (None if none) and their
+# similarity
+MatchResult = tuple[models.CompetitionMetaData, int | None, float]
+
+# the competitions matching a metadata, and their similarity
+Candidates = list[tuple[int, float]]
+
+# the index of a worker process, built once by `_init_worker`
+_index: CompetitionIndex | None = None
+
+
+class ParallelMatcher:
+    """
+    Match many metadata to the competitions, in worker processes.
+
+    Matching is CPU-bound: instead of matching the metadata one after the
+    other on the event loop, they are spread across a pool of processes.
+    The competitions are sent once to each worker, which builds its own
+    `CompetitionIndex` when started. Then, only the metadata and their
+    candidates go back and forth.
+
+    The candidates of each metadata are found as `CompetitionIndex.matches`
+    does, then the metadata are assigned one-to-one to the competitions
+    (see `assign`): the results are the same as a serial run's.
+
+    The matcher is an async context manager: its pool is started when
+    entered, and shut down when exited. Without workers, the metadata are
+    matched on the event loop.
+
+    Attributes
+    ----------
+    similarity_threshold: float
+        Only competitions whose similarity is at least this threshold can be
+        matched.
+    max_workers: int
+        The pool size. 0 matches the metadata on the event loop.
+    stats: models.SimilarityStats
+        Statistics of all the matches so far, of all the workers.
+    names_hits: int
+        How many names scores have been found in the workers caches.
+    names_misses: int
+        How many names scores have been computed by the workers.
+    """
+
+    def __init__(
+            self,
+            all_competitions: dict[int, models.CompetitionMetaData],
+            similarity_threshold: float = 0.85,
+            max_workers: int = 0
+    ) -> None:
+        self.similarity_threshold = similarity_threshold
+        self.max_workers = max(max_workers, 0)
+        self.stats = models.SimilarityStats()
+        self.names_hits = 0
+        self.names_misses = 0
+        self._competitions = all_competitions
+        self._executor: ProcessPoolExecutor | None = None
+        self._index: CompetitionIndex | None = None
+
+    @classmethod
+    def from_env(
+            cls,
+            all_competitions: dict[int, models.CompetitionMetaData]
+    ) -> "ParallelMatcher":
+        """
+        Create the matcher from the environment.
+
+        - `MATCH_WORKERS`: the pool size, 0 (default) to match the metadata
+          on the event loop.
+
+        Parameters
+        ----------
+        all_competitions: dict[int, models.CompetitionMetaData]
+            A mapping id -> competition, of all competitions to match.
+
+        Returns
+        -------
+        ParallelMatcher
+            The matcher.
+        """
+        return cls(all_competitions, max_workers=int(os.getenv("MATCH_WORKERS", "0")))
+
+    async def __aenter__(self) -> "ParallelMatcher":
+        """Start the pool, or build the index in this process."""
+        if self.max_workers > 0:
+            # spawned workers don't inherit the event loop threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._competitions, self.similarity_threshold))
+        else:
+            self._index = CompetitionIndex(
+                self._competitions, similarity_threshold=self.similarity_threshold)
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        """Shut the pool down, without blocking the event loop."""
+        if self._executor is not None:
+            await asyncio.to_thread(
+                self._executor.shutdown, wait=True, cancel_futures=True)
+            self._executor = None
+        self._index = None
+
+    async def assign(
+            self,
+            metadata: list[models.CompetitionMetaData]
+    ) -> list[MatchResult]:
+        """
+        Assign the competitions to the metadata, one-to-one.
+
+        Two metadata never get the same competition: all the competitions
+        matching each metadata are found (in one chunk of metadata per
+        worker), then the best overall pairs are kept (see
+        `assignment.assign`). A metadata whose competitions all went to better
+        matching metadata is left without match.
+
+        Parameters
+        ----------
+        metadata: list[models.CompetitionMetaData]
+            The metadata to match, all together.
+
+        Returns
+        -------
+        list[MatchResult]
+            For each metadata, in order: the metadata, the id of its assigned
+            competition (None if none) and its similarity.
+
+        Raises
+        ------
+        RuntimeError
+            If the matcher isn't entered.
+        """
+        candidates = await self.__candidates(metadata)
+        return [
+            (m, comp_id, score)
+            for m, (comp_id, score) in zip(
+                metadata, assignment.assign(candidates), strict=True)
+        ]
+
+    async def __candidates(
+            self,
+            metadata: list[models.CompetitionMetaData]
+    ) -> list[Candidates]:
+        """Find the candidates of each metadata, and gather the statistics."""
+        if self._index is not None:
+            results, stats, hits, misses = _match_with(self._index, metadata)
+        elif self._executor is not None:
+            results, stats, hits, misses = await self.__match_in_pool(metadata)
+        else:
+            msg = "The matcher must be entered first, with `async with`"
+            raise RuntimeError(msg)
+
+        self.stats.merge(stats)
+        self.names_hits += hits
+        self.names_misses += misses
+        return results
+
+    async def __match_in_pool(
+            self,
+            metadata: list[models.CompetitionMetaData]
+    ) -> tuple[list[Candidates], models.SimilarityStats, int, int]:
+        """Match the metadata chunks in the workers, and gather their results."""
+        size = math.ceil(len(metadata) / self.max_workers) or 1
+        chunks = [metadata[i:i + size] for i in range(0, len(metadata), size)]
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*[
+            loop.run_in_executor(self._executor, _match_chunk, chunk)
+            for chunk in chunks
+        ])
+
+        matches: list[Candidates] = []
+        stats = models.SimilarityStats()
+        hits = misses = 0
+        for chunk_matches, chunk_stats, chunk_hits, chunk_misses in results:
+            matches.extend(chunk_matches)
+            stats.merge(chunk_stats)
+            hits += chunk_hits
+            misses += chunk_misses
+        return matches, stats, hits, misses
+
+
+def _init_worker(
+        all_competitions: dict[int, models.CompetitionMetaData],
+        similarity_threshold: float
+) -> None:
+    """Build the index of a worker process, once."""
+    global _index  # noqa: PLW0603
+    _index = CompetitionIndex(
+        all_competitions, similarity_threshold=similarity_threshold)
+
+
+def _match_chunk(
+        metadata: list[models.CompetitionMetaData]
+) -> tuple[list[Candidates], models.SimilarityStats, int, int]:
+    """Match a chunk of metadata, in a worker process."""
+    return _match_with(_index, metadata)
+
+
+def _match_with(
+        index: CompetitionIndex,
+        metadata: list[models.CompetitionMetaData]
+) -> tuple[list[Candidates], models.SimilarityStats, int, int]:
+    """
+    Match the metadata with an index.
+
+    Returns
+    -------
+    list[Candidates]
+        The candidates of each metadata (see `CompetitionIndex.matches`).
+    models.SimilarityStats
+        The statistics of these matches only.
+    int
+        The names scores found in the cache, for these matches only.
+    int
+        The names scores computed, for these matches only.
+    """
+    index.stats = models.SimilarityStats()
+    hits, misses = index.names.hits, index.names.misses
+    matches = [index.matches(m) for m in metadata]
+    return (
+        matches,
+        index.stats,
+        index.names.hits - hits,
+        index.names.misses - misses,
+    )
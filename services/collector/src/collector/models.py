@@ -1,10 +1,31 @@
 import datetime
 import enum
-
+import math
+import sys
+from array import array
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+
+import numpy as np
 import pydantic
 
 from collector import utils
 
+# differences giving a similarity of 0.9 between two competitions
+DISTANCE_PERC90_DELTA = 2  # km
+ELEVATION_PERC90_DELTA = 200  # m
+START_DATE_PERC90_DELTA = 4  # hours
+
+# numeric similarity factors, in the order they are computed
+NUMERIC_STAGES = ("distance", "positive_elevation", "negative_elevation", "date")
+
+# a missing number, in the integer columns of a `ResultsBatch`
+MISSING_NUMBER = -1
+
+# a competition event's unique key: competition, event, start date & distance
+EventKey = tuple[str, str, datetime.date, float]
+
 
 @enum.unique
 class Gender(enum.StrEnum):
@@ -96,6 +117,276 @@ class Result(pydantic.BaseModel):
     category: str
 
 
+@dataclass(slots=True)
+class ResultRecord:
+    """
+    Runner's result for a given race, as a compact record.
+
+    Scraped results go from the parsers to the database as records: unlike
+    `Result`, a record is a single flat object, and isn't validated. The
+    `Result` model is only built on request, see `to_model`.
+
+    Attributes
+    ----------
+    first_name: str
+        First name of the runner.
+    last_name: str
+        Last name of the runner.
+    gender: Gender
+        The gender of the runner.
+    status: ResultStatus
+        The race result status.
+    race_number: int
+        The runner's race number.
+    category: str
+        The runner's category.
+    birth_year: int | None
+        Birth year of the runner.
+    time: datetime.timedelta | None
+        The race time, if the runner finished.
+    license: str | None
+        The runner's license.
+    scratch: int | None
+        The scratch ranking, if the runner finished.
+    gender_ranking: int | None
+        The gender ranking, if the runner finished.
+    category_ranking: int | None
+        The category's ranking, if the runner finished.
+    """
+
+    first_name: str
+    last_name: str
+    gender: Gender
+    status: ResultStatus
+    race_number: int
+    category: str
+    birth_year: int | None = None
+    time: datetime.timedelta | None = None
+    license: str | None = None
+    scratch: int | None = None
+    gender_ranking: int | None = None
+    category_ranking: int | None = None
+
+    @property
+    def ranked(self) -> bool:
+        """Return true if the result has a ranking."""
+        return self.scratch is not None
+
+    @classmethod
+    def from_model(cls, result: Result) -> "ResultRecord":
+        """Create a record from a result model."""
+        rank = result.rank
+        return cls(
+            first_name=result.runner.first_name,
+            last_name=result.runner.last_name,
+            gender=result.runner.gender,
+            status=result.status,
+            race_number=result.race_number,
+            category=result.category,
+            birth_year=result.runner.birth_year,
+            time=result.time,
+            license=result.license,
+            scratch=rank.scratch if rank else None,
+            gender_ranking=rank.gender if rank else None,
+            category_ranking=rank.category if rank else None,
+        )
+
+    def to_model(self) -> Result:
+        """Create the (validated) result model of this record."""
+        rank = None
+        if self.ranked:
+            rank = Rank(
+                scratch=self.scratch,
+                gender=self.gender_ranking,
+                category=self.category_ranking,
+            )
+        return Result(
+            runner=Runner(
+                first_name=self.first_name,
+                last_name=self.last_name,
+                birth_year=self.birth_year,
+                gender=self.gender,
+            ),
+            time=self.time,
+            rank=rank,
+            status=self.status,
+            race_number=self.race_number,
+            license=self.license,
+            category=self.category,
+        )
+
+
+@dataclass
+class ResultsBatch:
+    """
+    A competition's results, stored as columns.
+
+    Each attribute is a column, and each result is a row. The numbers are
+    stored in typed arrays, and the repeated strings are interned: a batch
+    takes a fraction of the memory of the equivalent `Result` models. A row
+    is read back as a `ResultRecord`, by index or iteration.
+
+    Attributes
+    ----------
+    first_names: list[str]
+        The runners first names.
+    last_names: list[str]
+        The runners last names.
+    genders: list[Gender]
+        The runners genders.
+    statuses: list[ResultStatus]
+        The race result statuses.
+    categories: list[str]
+        The runners categories.
+    licenses: list[str | None]
+        The runners licenses.
+    race_numbers: array
+        The runners race numbers.
+    birth_years: array
+        The runners birth years, `MISSING_NUMBER` if missing.
+    times: array
+        The race times in seconds, NaN if missing.
+    scratch: array
+        The scratch rankings, `MISSING_NUMBER` if not ranked.
+    gender_ranking: array
+        The gender rankings, `MISSING_NUMBER` if not ranked.
+    category_ranking: array
+        The category's rankings, `MISSING_NUMBER` if not ranked.
+    """
+
+    first_names: list[str] = field(default_factory=list)
+    last_names: list[str] = field(default_factory=list)
+    genders: list[Gender] = field(default_factory=list)
+    statuses: list[ResultStatus] = field(default_factory=list)
+    categories: list[str] = field(default_factory=list)
+    licenses: list[str | None] = field(default_factory=list)
+    race_numbers: array = field(default_factory=lambda: array("q"))
+    birth_years: array = field(default_factory=lambda: array("q"))
+    times: array = field(default_factory=lambda: array("d"))
+    scratch: array = field(default_factory=lambda: array("q"))
+    gender_ranking: array = field(default_factory=lambda: array("q"))
+    category_ranking: array = field(default_factory=lambda: array("q"))
+
+    @classmethod
+    def from_records(cls, records: Iterable[ResultRecord]) -> "ResultsBatch":
+        """Create a batch from result records."""
+        batch = cls()
+        for record in records:
+            batch.append(record)
+        return batch
+
+    def __len__(self) -> int:
+        """Return the number of results."""
+        return len(self.first_names)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the results row by row: missing times (NaN) are equal."""
+        if not isinstance(other, ResultsBatch):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other, strict=True))
+
+    def __getitem__(self, i: int) -> ResultRecord:
+        """Return the i-th result, as a record."""
+        seconds = self.times[i]
+        return ResultRecord(
+            first_name=self.first_names[i],
+            last_name=self.last_names[i],
+            gender=self.genders[i],
+            status=self.statuses[i],
+            race_number=self.race_numbers[i],
+            category=self.categories[i],
+            birth_year=optional_number(self.birth_years[i]),
+            time=None if math.isnan(seconds) else datetime.timedelta(seconds=seconds),
+            license=self.licenses[i],
+            scratch=optional_number(self.scratch[i]),
+            gender_ranking=optional_number(self.gender_ranking[i]),
+            category_ranking=optional_number(self.category_ranking[i]),
+        )
+
+    def __iter__(self) -> Iterator[ResultRecord]:
+        """Iterate the results, as records."""
+        for i in range(len(self)):
+            yield self[i]
+
+    def append(self, record: ResultRecord) -> None:
+        """
+        Add a result at the end of the batch.
+
+        Raises
+        ------
+        OverflowError
+            If a number doesn't fit its column. The batch is left unchanged.
+        """
+        size = len(self)
+        try:
+            self.race_numbers.append(record.race_number)
+            self.birth_years.append(_number(record.birth_year))
+            self.scratch.append(_number(record.scratch))
+            self.gender_ranking.append(_number(record.gender_ranking))
+            self.category_ranking.append(_number(record.category_ranking))
+        except OverflowError:
+            for column in self._arrays():
+                del column[size:]
+            raise
+        self.times.append(
+            math.nan if record.time is None else record.time.total_seconds())
+        self.first_names.append(sys.intern(record.first_name))
+        self.last_names.append(sys.intern(record.last_name))
+        self.genders.append(record.gender)
+        self.statuses.append(record.status)
+        self.categories.append(sys.intern(record.category))
+        self.licenses.append(
+            None if record.license is None else sys.intern(record.license))
+
+    def _arrays(self) -> list[array]:
+        """Return the integer columns."""
+        return [
+            self.race_numbers, self.birth_years, self.scratch,
+            self.gender_ranking, self.category_ranking,
+        ]
+
+
+def optional_number(value: int) -> int | None:
+    """Read a number of a `ResultsBatch` integer column: None if missing."""
+    return None if value == MISSING_NUMBER else value
+
+
+def _number(value: int | None) -> int:
+    """Write a number in a `ResultsBatch` integer column."""
+    return MISSING_NUMBER if value is None else value
+
+
+@dataclass
+class SimilarityStats:
+    """
+    Statistics of the competitions similarity scoring.
+
+    Attributes
+    ----------
+    compared: int
+        How many competitions have been compared.
+    pruned: Counter[str]
+        How many competitions have been pruned, per scoring stage (see
+        `NUMERIC_STAGES`, "blocking" when discarded by an index before any
+        scoring, and "best" when the best similarity so far can't be
+        reached). A pruned competition's name is not compared.
+    """
+
+    compared: int = 0
+    pruned: Counter[str] = field(default_factory=Counter)
+
+    def merge(self, other: "SimilarityStats") -> None:
+        """Add the statistics of other scorings, e.g. made in another process."""
+        self.compared += other.compared
+        self.pruned.update(other.pruned)
+
+    @property
+    def names_compared(self) -> int:
+        """Return how many competitions had their name compared."""
+        return self.compared - sum(self.pruned.values())
+
+
 class CompetitionMetaData(pydantic.BaseModel):
     """Competition meta-data."""
 
@@ -106,88 +397,325 @@ class CompetitionMetaData(pydantic.BaseModel):
     positive_elevation: int | None = None
     negative_elevation: int | None = None
 
-    def __similarity(self, metadata: "CompetitionMetaData") -> float:
+    def numeric_similarities(self, columns: "CompetitionColumns") -> np.ndarray:
         """
-        Return the similarity score between 2 competitions.
+        Return the numeric similarity factors with many competitions at once.
 
-        Compare:
-          - competition name
+        Compare, in this order:
           - distance
           - positive elevation
           - negative elevation
           - date
-        and return a score between 0 and 1.
+        Missing values give a neutral factor of 1.0.
+
+        Parameters
+        ----------
+        columns: CompetitionColumns
+            The competitions to compare with self.
 
         Returns
         -------
-        float
-            a float between 0 and 1. 0 is no similarity, 1 is the maximum
-            similarity.
+        np.ndarray
+            A (4, len(columns)) array of factors between 0 and 1, one row per
+            compared field (see `NUMERIC_STAGES`).
         """
-        return (
-            utils.distance_similarity(
+        hours = (columns.start_date - self.date.start.toordinal()) * 24
+        return np.stack([
+            utils.distance_similarities(
                 self.distance,
-                metadata.distance,
-                perc90_delta=2) *
-            utils.distance_similarity(
+                columns.distance,
+                perc90_delta=DISTANCE_PERC90_DELTA),
+            utils.distance_similarities(
                 self.positive_elevation,
-                metadata.positive_elevation,
-                perc90_delta=200) *
-            utils.distance_similarity(
+                columns.positive_elevation,
+                perc90_delta=ELEVATION_PERC90_DELTA),
+            utils.distance_similarities(
                 self.negative_elevation,
-                metadata.negative_elevation,
-                perc90_delta=200) *
-            utils.distance_similarity(
-                utils.hours_diff(self.date.start, metadata.date.start),
+                columns.negative_elevation,
+                perc90_delta=ELEVATION_PERC90_DELTA),
+            utils.distance_similarities(
                 0,
-                perc90_delta=4) *
-            utils.sentence_similarity(self.event, metadata.event)
-        )
+                hours.astype(float),
+                perc90_delta=START_DATE_PERC90_DELTA),
+        ])
 
     def find_best_match(
             self,
-            all_competitions: dict[int, "CompetitionMetaData"],
-            similarity_threshold: float = 0.85
+            all_competitions: "dict[int, CompetitionMetaData] | CompetitionColumns",
+            similarity_threshold: float = 0.85,
+            stats: SimilarityStats | None = None,
+            name_similarity: Callable[[str, str], float] = utils.sentence_similarity
     ) -> int | None:
         """
         Find the best match in all given competitions.
 
+        See `best_match`, without the similarity.
+
+        Returns
+        -------
+        int
+            The competition id which has the best match, respecting the minimum
+            threshold.
+        """
+        comp_id, _ = self.best_match(
+            all_competitions,
+            similarity_threshold=similarity_threshold,
+            stats=stats,
+            name_similarity=name_similarity)
+        return comp_id
+
+    def best_match(
+            self,
+            all_competitions: "dict[int, CompetitionMetaData] | CompetitionColumns",
+            similarity_threshold: float = 0.85,
+            stats: SimilarityStats | None = None,
+            name_similarity: Callable[[str, str], float] = utils.sentence_similarity
+    ) -> tuple[int | None, float]:
+        """
+        Find the best match in all given competitions, and its similarity.
+
         Compare self to all competitions and return the id of the ones that
-        matches at best
+        matches at best.
+
+        The similarity is the product of the numeric factors (see
+        `numeric_similarities`), computed for all competitions at once, and of
+        the names similarity. Since every factor is at most 1, the numeric
+        product is an upper bound of the similarity: names are only compared
+        for the competitions whose upper bound reaches the threshold and the
+        best similarity so far.
 
         Parameters
         ----------
-        all_competitions: dict[int, CompetitionMetaData]
+        all_competitions: dict[int, CompetitionMetaData] | CompetitionColumns
             A mapping id -> competition, of all competitions to be compared
-            with self.
+            with self. Or the same competitions, already as columns.
         similarity_threshold: float
             Only consider competitions whose similarity score is at least this
             threshold. If no competitions meets this minimum, None is returned.
+        stats: SimilarityStats | None
+            If provided, count the comparisons and the pruned ones.
+        name_similarity: Callable[[str, str], float]
+            Compare the events names, e.g. `NameMatcher.similarity` to reuse
+            the names normalization and scores.
 
         Returns
         -------
-        int
+        int | None
             The competition id which has the best match, respecting the minimum
             threshold.
+        float
+            The similarity of the best match, 0 if there is none.
         """
+        columns, bounds = self.__numeric_bounds(
+            all_competitions, similarity_threshold, stats)
+
         sim, comp_id = 0, None
-        for cid, comp in all_competitions.items():
-            s = self.__similarity(comp)
+        for i in np.flatnonzero(bounds >= similarity_threshold):
+            bound = bounds[i]
+            if bound < sim:
+                if stats is not None:
+                    stats.pruned["best"] += 1
+                continue
+            s = bound * name_similarity(self.event, columns.events[i])
             if s < sim:
                 continue
             sim = s
-            comp_id = cid
-        return comp_id if sim >= similarity_threshold else None
+            comp_id = columns.ids[i]
+        if comp_id is None or sim < similarity_threshold:
+            return None, 0.
+        return comp_id, float(sim)
+
+    def matches(
+            self,
+            all_competitions: "dict[int, CompetitionMetaData] | CompetitionColumns",
+            similarity_threshold: float = 0.85,
+            stats: SimilarityStats | None = None,
+            name_similarity: Callable[[str, str], float] = utils.sentence_similarity
+    ) -> list[tuple[int, float]]:
+        """
+        Find all the competitions matching self, and their similarity.
+
+        As `best_match`, but every competition reaching the threshold is
+        returned, not only the best one: the names are compared for all the
+        competitions whose numeric factors reach the threshold.
+
+        Parameters
+        ----------
+        all_competitions: dict[int, CompetitionMetaData] | CompetitionColumns
+            A mapping id -> competition, of all competitions to be compared
+            with self. Or the same competitions, already as columns.
+        similarity_threshold: float
+            Only return the competitions whose similarity score is at least
+            this threshold.
+        stats: SimilarityStats | None
+            If provided, count the comparisons and the pruned ones.
+        name_similarity: Callable[[str, str], float]
+            Compare the events names.
+
+        Returns
+        -------
+        list[tuple[int, float]]
+            The ids of the matching competitions and their similarity, in the
+            competitions order.
+        """
+        columns, bounds = self.__numeric_bounds(
+            all_competitions, similarity_threshold, stats)
+
+        matches = []
+        for i in np.flatnonzero(bounds >= similarity_threshold):
+            s = bounds[i] * name_similarity(self.event, columns.events[i])
+            if s >= similarity_threshold:
+                matches.append((columns.ids[i], float(s)))
+        return matches
+
+    def __numeric_bounds(
+            self,
+            all_competitions: "dict[int, CompetitionMetaData] | CompetitionColumns",
+            similarity_threshold: float,
+            stats: SimilarityStats | None
+    ) -> tuple["CompetitionColumns", np.ndarray]:
+        """
+        Compute the upper bound of the similarity with each competition.
+
+        Returns
+        -------
+        CompetitionColumns
+            The competitions, as columns.
+        np.ndarray
+            The product of the numeric factors of each competition.
+        """
+        columns = all_competitions
+        if not isinstance(columns, CompetitionColumns):
+            columns = CompetitionColumns.from_competitions(all_competitions)
+
+        # partial products of the numeric factors, in the stages order
+        bounds = np.cumprod(self.numeric_similarities(columns), axis=0)
+        if stats is not None:
+            pruned = bounds < similarity_threshold
+            stats.compared += len(columns)
+            # stage at which each competition is pruned
+            stages = np.argmax(pruned, axis=0)[pruned[-1]]
+            counts = np.bincount(stages, minlength=len(NUMERIC_STAGES))
+            for stage, count in zip(NUMERIC_STAGES, counts, strict=True):
+                if count > 0:
+                    stats.pruned[stage] += int(count)
+        return columns, bounds[-1]
+
+
+@dataclass
+class CompetitionColumns:
+    """
+    Competitions metadata stored as columns.
+
+    Each attribute is a column, and each competition is a row. Missing
+    elevations are stored as NaN.
+
+    Attributes
+    ----------
+    ids: list[int]
+        The competitions ids.
+    events: list[str]
+        The competitions events names.
+    distance: np.ndarray
+        The competitions distances.
+    positive_elevation: np.ndarray
+        The competitions positive elevations.
+    negative_elevation: np.ndarray
+        The competitions negative elevations.
+    start_date: np.ndarray
+        The competitions start dates, as proleptic Gregorian ordinals.
+    """
+
+    ids: list[int]
+    events: list[str]
+    distance: np.ndarray
+    positive_elevation: np.ndarray
+    negative_elevation: np.ndarray
+    start_date: np.ndarray
+
+    def __len__(self) -> int:
+        """Return the number of competitions."""
+        return len(self.ids)
+
+    def take(self, rows: list[int]) -> "CompetitionColumns":
+        """
+        Return some of the competitions, as columns.
+
+        Parameters
+        ----------
+        rows: list[int]
+            The positions of the competitions to keep, in the new order.
+
+        Returns
+        -------
+        CompetitionColumns
+            The kept competitions.
+        """
+        return CompetitionColumns(
+            ids=[self.ids[i] for i in rows],
+            events=[self.events[i] for i in rows],
+            distance=self.distance[rows],
+            positive_elevation=self.positive_elevation[rows],
+            negative_elevation=self.negative_elevation[rows],
+            start_date=self.start_date[rows],
+        )
+
+    @classmethod
+    def from_competitions(
+            cls,
+            all_competitions: dict[int, CompetitionMetaData]
+    ) -> "CompetitionColumns":
+        """Create the columns from a mapping id -> competition."""
+        comps = all_competitions.values()
+        return cls(
+            ids=list(all_competitions),
+            events=[c.event for c in comps],
+            distance=np.array([c.distance for c in comps], dtype=float),
+            positive_elevation=np.array(
+                [c.positive_elevation for c in comps], dtype=float),
+            negative_elevation=np.array(
+                [c.negative_elevation for c in comps], dtype=float),
+            start_date=np.array(
+                [c.date.start.toordinal() for c in comps], dtype=np.int64),
+        )
 
 
 class Competition(CompetitionMetaData):
     """Competition data."""
 
+    model_config = pydantic.ConfigDict(arbitrary_types_allowed=True)
+
     name: str
     timekeeper: str
-    results: list[Result] = pydantic.Field(default_factory=list)
+    # scraped results are stored as columns, see `ResultsBatch`
+    results: list[Result | ResultRecord] | ResultsBatch = pydantic.Field(
+        default_factory=list)
 
     def __hash__(self) -> int:
         """Return a unique id for this competition."""
         return hash(
             f"{self.name}:{self.event}:{self.timekeeper}:{self.date.start}")
+
+    def results_batch(self) -> ResultsBatch:
+        """Return the results as columns, converting the result models."""
+        if isinstance(self.results, ResultsBatch):
+            return self.results
+        return ResultsBatch.from_records(
+            result if isinstance(result, ResultRecord)
+            else ResultRecord.from_model(result)
+            for result in self.results
+        )
+
+    @property
+    def key(self) -> EventKey:
+        """
+        Return the unique key of this competition's event.
+
+        The distance is rounded to 100m, as stored in the database.
+        """
+        return self.name, self.event, self.date.start, event_distance(self.distance)
+
+
+def event_distance(distance: float) -> float:
+    """Round an event distance to 100m, as part of its key (see `EventKey`)."""
+    return round(float(distance), 1)
@@ -0,0 +1,318 @@
+import asyncio
+import logging
+import os
+import time
+from collections.abc import (
+    AsyncGenerator, AsyncIterable, AsyncIterator, Awaitable, Callable
+)
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# marks the end of the pipeline's outputs
+_DONE = object()
+
+
+def _cpu_count() -> int:
+    """Return the number of cores."""
+    return os.cpu_count() or 1
+
+
+@dataclass
+class PipelineConfig:
+    """
+    Pipeline settings.
+
+    Attributes
+    ----------
+    queue_size: int
+        The maximum number of items waiting between two stages. A full queue
+        makes the previous stage wait (backpressure).
+    fetch_workers: int
+        How many pages are downloaded at once.
+    parse_workers: int
+        How many pages are parsed at once (see `ParseExecutor`).
+    normalize_workers: int
+        How many parsed pages are converted to models at once.
+    store_workers: int
+        How many competitions are stored at once.
+    """
+
+    queue_size: int = 16
+    fetch_workers: int = 4
+    parse_workers: int = field(default_factory=_cpu_count)
+    normalize_workers: int = 1
+    store_workers: int = 8
+
+    @classmethod
+    def from_env(cls) -> "PipelineConfig":
+        """
+        Create the pipeline settings from the environment.
+
+        - `PIPELINE_QUEUE_SIZE`
+        - `PIPELINE_FETCH_WORKERS`
+        - `PIPELINE_PARSE_WORKERS`
+        - `PIPELINE_NORMALIZE_WORKERS`
+        - `PIPELINE_STORE_WORKERS`
+
+        Returns
+        -------
+        PipelineConfig
+            The pipeline settings, with defaults for the missing variables.
+        """
+        default = cls()
+        return cls(**{
+            name: int(os.getenv(f"PIPELINE_{name.upper()}", str(value)))
+            for name, value in vars(default).items()
+        })
+
+
+@dataclass
+class Stage:
+    """
+    A pipeline stage.
+
+    Attributes
+    ----------
+    name: str
+        The stage name, for the metrics.
+    func: Callable[[Any], Awaitable[Any]]
+        Process an item of the previous stage. Returning None drops the item,
+        except in the last stage: its items have nowhere to go anyway (e.g.
+        once stored).
+    workers: int
+        How many items are processed at once.
+    """
+
+    name: str
+    func: Callable[[Any], Awaitable[Any]]
+    workers: int = 1
+
+
+@dataclass
+class StageMetrics:
+    """
+    Metrics of a pipeline stage.
+
+    Attributes
+    ----------
+    name: str
+        The stage name.
+    workers: int
+        How many items are processed at once.
+    processed: int
+        How many items were processed successfully.
+    failed: int
+        How many items raised an error.
+    dropped: int
+        How many items were filtered out, not passed to the next stage. Always
+        0 for the last stage.
+    total_latency: float
+        The sum of the processing times, in seconds.
+    max_latency: float
+        The maximum processing time, in seconds.
+    depth_samples: int
+        How many times the input queue was sampled.
+    total_depth: int
+        The sum of the sampled input queue sizes.
+    max_depth: int
+        The maximum sampled input queue size.
+    elapsed: float
+        For how long the pipeline has run, in seconds.
+    """
+
+    name: str
+    workers: int = 1
+    processed: int = 0
+    failed: int = 0
+    dropped: int = 0
+    total_latency: float = 0.
+    max_latency: float = 0.
+    depth_samples: int = 0
+    total_depth: int = 0
+    max_depth: int = 0
+    elapsed: float = 0.
+
+    def sample_depth(self, depth: int) -> None:
+        """Record the size of the input queue."""
+        self.depth_samples += 1
+        self.total_depth += depth
+        self.max_depth = max(self.max_depth, depth)
+
+    def record(self, seconds: float) -> None:
+        """Record the processing time of an item."""
+        self.total_latency += seconds
+        self.max_latency = max(self.max_latency, seconds)
+
+    @property
+    def mean_depth(self) -> float:
+        """Return the average input queue size."""
+        if self.depth_samples == 0:
+            return 0.
+        return self.total_depth / self.depth_samples
+
+    @property
+    def mean_latency(self) -> float:
+        """Return the average processing time, in seconds."""
+        done = self.processed + self.failed
+        if done == 0:
+            return 0.
+        return self.total_latency / done
+
+    @property
+    def throughput(self) -> float:
+        """Return the processed items per second."""
+        if self.elapsed <= 0:
+            return 0.
+        return self.processed / self.elapsed
+
+
+class Pipeline:
+    """
+    Process items through stages, connected by bounded queues.
+
+    The items of the source go through the stages in order. Each stage has
+    its own workers, taking the items from its input queue and putting their
+    results in the next stage's queue. Since the queues are bounded, a slow
+    stage makes the previous ones wait, instead of piling items up in memory.
+
+    An item raising an error in a stage is dropped: the error is logged and
+    collected, and the other items go on. An error of the source stops the
+    feeding: it is raised once the items fed so far went through the stages.
+
+    The pipeline is an async iterator of the last stage's results, and stops
+    all its workers when the iteration stops. Iterating it twice runs it
+    twice.
+
+    Attributes
+    ----------
+    stages: list[Stage]
+        The stages, in order.
+    queue_size: int
+        The size of the queues between the stages.
+    metrics: dict[str, StageMetrics]
+        The metrics of each stage.
+    errors: list[Exception]
+        The errors raised by the stages.
+    """
+
+    def __init__(
+            self,
+            source: AsyncIterable[Any],
+            stages: list[Stage],
+            queue_size: int = 16
+    ) -> None:
+        self.stages = list(stages)
+        self.queue_size = queue_size
+        self.metrics: dict[str, StageMetrics] = {
+            stage.name: StageMetrics(name=stage.name, workers=stage.workers)
+            for stage in self.stages
+        }
+        self.errors: list[Exception] = []
+        self._source = source
+
+    def add_stage(self, stage: Stage) -> None:
+        """Add a stage, after the current last one."""
+        self.stages.append(stage)
+        self.metrics[stage.name] = StageMetrics(name=stage.name, workers=stage.workers)
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        """Run the pipeline, and iterate the last stage's results."""
+        # a queue before each stage, and the output queue
+        queues = [asyncio.Queue(self.queue_size) for _ in range(len(self.stages) + 1)]
+        workers = [
+            [
+                asyncio.create_task(self.__work(stage, queues[i], queues[i + 1]))
+                for _ in range(max(stage.workers, 1))
+            ]
+            for i, stage in enumerate(self.stages)
+        ]
+        start = time.perf_counter()
+        closer = asyncio.create_task(self.__run(queues, workers))
+        try:
+            while (item := await queues[-1].get()) is not _DONE:
+                yield item
+            # raise the source error, if any
+            await closer
+        finally:
+            tasks = [closer, *(w for stage in workers for w in stage)]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            elapsed = time.perf_counter() - start
+            for metrics in self.metrics.values():
+                metrics.elapsed = elapsed
+
+    async def run(self) -> None:
+        """Run the pipeline, discarding the last stage's results."""
+        async for _ in self:
+            pass
+
+    def log_metrics(self) -> None:
+        """Log the metrics of every stage."""
+        for m in self.metrics.values():
+            logger.info(
+                "Stage %s (%d workers): %d processed (%.2f/s), %d failed, "
+                "%d dropped, %.3fs average latency, %.3fs max, "
+                "queue depth %.1f average, %d max",
+                m.name, m.workers, m.processed, m.throughput, m.failed,
+                m.dropped, m.mean_latency, m.max_latency, m.mean_depth,
+                m.max_depth)
+
+    async def __run(
+            self,
+            queues: list[asyncio.Queue],
+            workers: list[list[asyncio.Task]]
+    ) -> None:
+        """Feed the source, then stop each stage once its queue is drained."""
+        error: Exception | None = None
+        source = aiter(self._source)
+        try:
+            async for item in source:
+                await queues[0].put(item)
+        except Exception as exc:  # noqa: BLE001
+            # the source failed: finish the items fed so far, then raise
+            error = exc
+        finally:
+            if isinstance(source, AsyncGenerator):
+                await source.aclose()
+        for queue, stage_workers in zip(queues, workers, strict=False):
+            await queue.join()
+            for task in stage_workers:
+                task.cancel()
+        await queues[-1].put(_DONE)
+        if error is not None:
+            raise error
+
+    async def __work(
+            self,
+            stage: Stage,
+            queue: asyncio.Queue,
+            output: asyncio.Queue
+    ) -> None:
+        """Process the items of a stage's queue, forever."""
+        metrics = self.metrics[stage.name]
+        last = stage is self.stages[-1]
+        while True:
+            item = await queue.get()
+            try:
+                metrics.sample_depth(queue.qsize())
+                start = time.perf_counter()
+                try:
+                    result = await stage.func(item)
+                except Exception as exc:
+                    logger.exception("Stage %s failed", stage.name)
+                    metrics.failed += 1
+                    self.errors.append(exc)
+                    continue
+                finally:
+                    metrics.record(time.perf_counter() - start)
+                metrics.processed += 1
+                if result is None:
+                    if not last:
+                        metrics.dropped += 1
+                    continue
+                await output.put(result)
+            finally:
+                queue.task_done()
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# where the html pages are parsed
+PROCESS = "process"
+THREAD = "thread"
+INLINE = "inline"
+KINDS = (PROCESS, THREAD, INLINE)
+
+
+class ParseExecutor:
+    """
+    Parse the html pages out of the event loop.
+
+    Parsing a big page is CPU-bound: on the event loop, it blocks every other
+    request and database write meanwhile. Instead, the parsing functions are
+    run in a pool of processes (by default, using all the cores), or threads.
+    The functions must be picklable for a process pool, i.e. defined at
+    module level, and so must be their arguments and results: the raw html
+    goes in, and plain rows or models come back.
+
+    The executor is an async context manager: its pool is started when
+    entered, and shut down when exited. Until then, or with the "inline"
+    kind, the functions are run directly on the event loop.
+
+    Attributes
+    ----------
+    kind: str
+        Where the pages are parsed: "process", "thread" or "inline".
+    max_workers: int | None
+        The pool size. None uses the number of cores.
+    """
+
+    def __init__(self, kind: str = PROCESS, max_workers: int | None = None) -> None:
+        if kind not in KINDS:
+            msg = f"Unknown parse executor kind={kind}, expected one of {KINDS}"
+            raise ValueError(msg)
+        self.kind = kind
+        self.max_workers = max_workers
+        self._executor: Executor | None = None
+
+    @classmethod
+    def from_env(cls) -> "ParseExecutor":
+        """
+        Create the executor from the environment.
+
+        - `PARSE_EXECUTOR`: "process" (default), "thread" or "inline".
+        - `PARSE_WORKERS`: the pool size, the number of cores by default.
+
+        Returns
+        -------
+        ParseExecutor
+            The parse executor.
+        """
+        workers = os.getenv("PARSE_WORKERS")
+        return cls(
+            kind=os.getenv("PARSE_EXECUTOR", PROCESS),
+            max_workers=int(workers) if workers else None,
+        )
+
+    async def __aenter__(self) -> "ParseExecutor":
+        """Start the pool."""
+        if self.kind == PROCESS:
+            # spawned workers don't inherit the event loop threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(logging.getLogger().level,))
+        elif self.kind == THREAD:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="parser")
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        """Shut the pool down, without blocking the event loop."""
+        if self._executor is not None:
+            await asyncio.to_thread(
+                self._executor.shutdown, wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, func: Callable[..., T], *args: object) -> T:
+        """
+        Run a parsing function in the pool.
+
+        Parameters
+        ----------
+        func: Callable[..., T]
+            The parsing function.
+        args: object
+            The function's arguments, e.g. the html page.
+
+        Returns
+        -------
+        T
+            The function's result.
+        """
+        if self._executor is None:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+
+def _init_worker(level: int) -> None:
+    """Set the logging up in a worker process, as in the main process."""
+    logging.basicConfig()
+    logging.getLogger().setLevel(level)
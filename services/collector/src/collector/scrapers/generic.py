@@ -1,32 +1,240 @@
 import abc
-from collections.abc import AsyncIterator
+import logging
+from collections.abc import AsyncIterator, Container
+from contextlib import aclosing
+from dataclasses import dataclass
 
 from collector import models
+from collector.pipeline import Pipeline, PipelineConfig, Stage
+from collector.scrapers.executor import INLINE, ParseExecutor
+from collector.scrapers.requester import HTTPClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ResultsPage:
+    """
+    A competition's results page, going through the scraping stages.
+
+    Attributes
+    ----------
+    url: str
+        The results page URL.
+    competition: models.Competition
+        The competition the results belong to.
+    html: bytes | None
+        The page, once fetched. Released once parsed.
+    results: models.ResultsBatch | None
+        The parsed results, before being added to the competition.
+    stored: bool
+        Whether the competition event already has results in the DB: an
+        unchanged page doesn't need to be parsed again.
+    """
+
+    url: str
+    competition: models.Competition
+    html: bytes | None = None
+    results: models.ResultsBatch | None = None
+    stored: bool = False
 
 
 class ResultsScraper(abc.ABC):
-    """Generic Results Scraper."""
+    """
+    Generic Results Scraper.
+
+    The scraping is split in stages, run as a pipeline (see `pipeline`):
+    1. list the competitions results pages
+    2. fetch each page
+    3. parse each page into a results batch
+    4. normalize the results into the competition
+
+    Parameters
+    ----------
+    client: HTTPClient
+        The HTTP client sending the requests, opened by the caller.
+    executor: ParseExecutor | None
+        Where the pages are parsed, opened by the caller. By default, they are
+        parsed on the event loop.
+    """
 
     name: str
 
+    def __init__(
+            self,
+            client: HTTPClient,
+            executor: ParseExecutor | None = None
+    ) -> None:
+        self._client = client
+        self._executor = executor or ParseExecutor(kind=INLINE)
+        # errors during each competition scraping
+        # we collect them and log them at the end
+        self._errors: list[Exception] = []
+
+    @abc.abstractmethod
+    async def results_pages(
+            self,
+            skip: Container[models.EventKey] = frozenset(),
+            stored: Container[models.EventKey] = frozenset()
+    ) -> AsyncIterator[ResultsPage]:
+        """
+        List the results pages to scrap.
+
+        Parameters
+        ----------
+        skip: Container[models.EventKey]
+            The competition events already ingested: their results are not
+            scraped again.
+        stored: Container[models.EventKey]
+            The competition events with results in the DB: their results are
+            scraped again only if their page changed.
+
+        Returns
+        -------
+        AsyncIterator[ResultsPage]
+            Iterate the results pages, not fetched yet.
+        """
+        yield
+
     @abc.abstractmethod
-    async def scrap(self) -> AsyncIterator[models.Competition]:
+    async def fetch(self, page: ResultsPage) -> ResultsPage | None:
+        """
+        Fetch a results page.
+
+        Parameters
+        ----------
+        page: ResultsPage
+            The page to fetch.
+
+        Returns
+        -------
+        ResultsPage | None
+            The page with its html, or None if it doesn't need to be parsed.
+        """
+
+    @abc.abstractmethod
+    async def parse(self, page: ResultsPage) -> ResultsPage:
+        """
+        Parse a fetched results page into a results batch.
+
+        Parameters
+        ----------
+        page: ResultsPage
+            The fetched page.
+
+        Returns
+        -------
+        ResultsPage
+            The page with its results.
+        """
+
+    @abc.abstractmethod
+    async def normalize(self, page: ResultsPage) -> models.Competition:
+        """
+        Add the results of a parsed page to the competition.
+
+        Parameters
+        ----------
+        page: ResultsPage
+            The parsed page.
+
+        Returns
+        -------
+        models.Competition
+            The competition, with its results.
+        """
+
+    def pipeline(
+            self,
+            skip: Container[models.EventKey] = frozenset(),
+            stored: Container[models.EventKey] = frozenset(),
+            config: PipelineConfig | None = None
+    ) -> Pipeline:
+        """
+        Build the scraping pipeline.
+
+        Parameters
+        ----------
+        skip: Container[models.EventKey]
+            The competition events already ingested: their results are not
+            scraped again.
+        stored: Container[models.EventKey]
+            The competition events with results in the DB: their results are
+            scraped again only if their page changed.
+        config: PipelineConfig | None
+            The pipeline settings, default ones if None.
+
+        Returns
+        -------
+        Pipeline
+            The pipeline, iterating the scraped competitions. Its errors are
+            the scraper's ones.
+        """
+        config = config or PipelineConfig()
+        pipeline = Pipeline(
+            self.results_pages(skip, stored),
+            [
+                Stage("fetch", self.fetch, workers=config.fetch_workers),
+                Stage("parse", self.parse, workers=config.parse_workers),
+                Stage("normalize", self.normalize, workers=config.normalize_workers),
+            ],
+            queue_size=config.queue_size)
+        pipeline.errors = self._errors
+        return pipeline
+
+    async def scrap(
+            self,
+            skip: Container[models.EventKey] = frozenset(),
+            stored: Container[models.EventKey] = frozenset()
+    ) -> AsyncIterator[models.Competition]:
         """
         Scrap whatever webpage is inheriting from Scraper.
 
+        Parameters
+        ----------
+        skip: Container[models.EventKey]
+            The competition events already ingested: their results are not
+            scraped again.
+        stored: Container[models.EventKey]
+            The competition events with results in the DB: their results are
+            scraped again only if their page changed.
+
         Returns
         -------
         AsyncIterator[models.Competition]
-            Iterate all scraped competitions.
+            Iterate all scraped competitions, as soon as scraped.
         """
-        yield
+        # stop the pipeline as soon as the iteration stops
+        async with aclosing(aiter(self.pipeline(skip, stored))) as competitions:
+            async for competition in competitions:
+                yield competition
+        if self._errors:
+            logger.warning("%d collected!", len(self._errors))
 
 
 class MetadataScraper(abc.ABC):
-    """Generic Metadata Scraper."""
+    """
+    Generic Metadata Scraper.
+
+    Parameters
+    ----------
+    client: HTTPClient
+        The HTTP client sending the requests, opened by the caller.
+    executor: ParseExecutor | None
+        Where the pages are parsed, opened by the caller. By default, they are
+        parsed on the event loop.
+    """
 
     name: str
 
+    def __init__(
+            self,
+            client: HTTPClient,
+            executor: ParseExecutor | None = None
+    ) -> None:
+        self._client = client
+        self._executor = executor or ParseExecutor(kind=INLINE)
+
     @abc.abstractmethod
     async def scrap(self) -> AsyncIterator[models.CompetitionMetaData]:
         """
@@ -1,27 +1,35 @@
 from collections.abc import Iterable
 
+from collector.scrapers.executor import ParseExecutor
 from collector.scrapers.generic import ResultsScraper, MetadataScraper
+from collector.scrapers.requester import HTTPClient
 from collector.scrapers.runraid import RunRaidScraper
 from collector.scrapers.sportpro import SportproScraper
 
-timekeepers_scrapers: dict[str, ResultsScraper] = {
-    'sportpro': SportproScraper(),
+timekeepers_scrapers: dict[str, type[ResultsScraper]] = {
+    'sportpro': SportproScraper,
 }
 
-metadata_scrapers: dict[str, MetadataScraper] = {
-    'runraid': RunRaidScraper(),
+metadata_scrapers: dict[str, type[MetadataScraper]] = {
+    'runraid': RunRaidScraper,
 }
 
 
 def discover_timekeepers(
-        scrapers: list[str] | None = None) -> Iterable[ResultsScraper]:
+        client: HTTPClient,
+        scrapers: list[str] | None = None,
+        executor: ParseExecutor | None = None) -> Iterable[ResultsScraper]:
     """
     Discover timekeepers scrappers.
 
     Parameters
     ----------
+    client : HTTPClient
+        The HTTP client shared by the scrapers.
     scrapers : list[str] | None
         The list of scrapers to return. If None, return all of them.
+    executor : ParseExecutor | None
+        The parse executor shared by the scrapers.
 
     Returns
     -------
@@ -30,19 +38,25 @@ def discover_timekeepers(
         or the ones corresponding to scrapers names.
     """
     if scrapers is None:
-        return timekeepers_scrapers.values()
-    return [timekeepers_scrapers[s] for s in scrapers]
+        scrapers = list(timekeepers_scrapers)
+    return [timekeepers_scrapers[s](client, executor) for s in scrapers]
 
 
 def discover_metadata_scrapers(
-        scrapers: list[str] | None = None) -> Iterable[MetadataScraper]:
+        client: HTTPClient,
+        scrapers: list[str] | None = None,
+        executor: ParseExecutor | None = None) -> Iterable[MetadataScraper]:
     """
     Discover metadata scrappers.
 
     Parameters
     ----------
+    client : HTTPClient
+        The HTTP client shared by the scrapers.
     scrapers : list[str] | None
         The list of scrapers to return. If None, return all of them.
+    executor : ParseExecutor | None
+        The parse executor shared by the scrapers.
 
     Returns
     -------
@@ -51,5 +65,5 @@ def discover_metadata_scrapers(
         or the ones corresponding to scrapers names.
     """
     if scrapers is None:
-        return metadata_scrapers.values()
-    return [metadata_scrapers[s] for s in scrapers]
+        scrapers = list(metadata_scrapers)
+    return [metadata_scrapers[s](client, executor) for s in scrapers]
@@ -1,65 +1,543 @@
 import asyncio
+import datetime
+import hashlib
+import json
 import logging
+import os
+import random
+import re
+import tempfile
+import time
 from collections.abc import Callable, Awaitable
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
 from http import HTTPStatus
 from http.client import responses
+from pathlib import Path
+from urllib.parse import urlencode, urlparse
 
 import aiohttp
 
 logger = logging.getLogger(__name__)
 
 
+# response headers used to revalidate a cached response
+VALIDATION_HEADERS = ("ETag", "Last-Modified")
+
+# responses asking to slow down
+THROTTLING_STATUSES = frozenset({
+    HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE})
+
+
 class HTTPError(Exception):
     """Custom HTTP Exception with the http status code."""
 
-    def __init__(self, status: int = 200) -> None:
+    def __init__(self, status: int = 200, retry_after: float | None = None) -> None:
         self._status = status
+        self._retry_after = retry_after
 
     @property
     def status(self) -> int:
         """Return the http status code."""
         return self._status
 
+    @property
+    def retry_after(self) -> float | None:
+        """Return how many seconds to wait before retrying, if the server told."""
+        return self._retry_after
 
-class HTTPClient:
-    """Implement an HTTP client."""
 
-    def __init__(self, nb_retries: int = 3) -> None:
-        # Maximum number of retries if failure.
-        self._nb_retries = nb_retries
-        # The HTTP session.
-        self._session: aiohttp.ClientSession | None = None
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a `Retry-After` header.
 
-    def __del__(self) -> None:
-        """Close the http session."""
-        if self._session is not None:
-            self._session._connector._close()  # noqa: SLF001
+    Parameters
+    ----------
+    value: str | None
+        The header's value: a number of seconds, or an HTTP date.
 
-    def __initialize_session(self) -> None:
+    Returns
+    -------
+    float | None
+        How many seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.)
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = datetime.datetime.now(tz=date.tzinfo or datetime.UTC)
+    return max((date - now).total_seconds(), 0.)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    When and how to retry a failed request.
+
+    The delay before the n-th retry is drawn uniformly between
+    `(1 - jitter) * d` and `d`, where `d = min(backoff * 2**n, max_backoff)`,
+    unless the server told how long to wait (`Retry-After`).
+
+    Each host has a retry budget, shared by all its requests: a host can't be
+    retried more than `budget_min + budget_ratio * requests` times, so that a
+    failing host isn't flooded with retries.
+
+    Attributes
+    ----------
+    max_retries: int
+        Maximum number of retries of a request.
+    statuses: frozenset[int]
+        The response status codes to retry.
+    exceptions: tuple[type[BaseException], ...]
+        The errors to retry (timeouts, connection resets, ...).
+    backoff: float
+        The base delay, in seconds.
+    max_backoff: float
+        The maximum delay between two tries, in seconds.
+    jitter: float
+        The randomized part of the delay, from 0 (none) to 1 (full jitter).
+    deadline: float | None
+        How long a request can take in total, retries included, in seconds.
+        No retry is attempted if it would end after the deadline.
+    budget_min: int
+        The number of retries always allowed per host.
+    budget_ratio: float
+        The number of retries allowed per request sent to the host.
+    """
+
+    max_retries: int = 3
+    statuses: frozenset[int] = field(default_factory=lambda: frozenset({
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    }))
+    exceptions: tuple[type[BaseException], ...] = (
+        TimeoutError,
+        aiohttp.ClientConnectionError,
+        aiohttp.ClientPayloadError,
+    )
+    backoff: float = 0.5
+    max_backoff: float = 30.
+    jitter: float = 1.
+    deadline: float | None = 60.
+    budget_min: int = 10
+    budget_ratio: float = 0.2
+
+    def delay(self, retry_no: int, retry_after: float | None = None) -> float:
         """
-        Initialize the http session.
+        Compute how long to wait before retrying.
+
+        Parameters
+        ----------
+        retry_no: int
+            How many retries have been done already.
+        retry_after: float | None
+            How long the server asked to wait, if it did.
 
-        The session should be initialized inside the running loop context.
+        Returns
+        -------
+        float
+            The delay in seconds.
         """
+        if retry_after is not None:
+            return retry_after
+        delay = min(self.backoff * 2 ** retry_no, self.max_backoff)
+        return random.uniform((1 - self.jitter) * delay, delay)  # noqa: S311
+
+
+@dataclass
+class ConnectionMetrics:
+    """
+    Statistics of the connections pool.
+
+    Attributes
+    ----------
+    created: int
+        How many connections were opened.
+    reused: int
+        How many requests were sent on an already opened connection.
+    dns_cache_hits: int
+        How many hosts were resolved from the DNS cache.
+    dns_cache_misses: int
+        How many hosts were resolved by a DNS query.
+    """
+
+    created: int = 0
+    reused: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Return the share of requests sent on an already opened connection."""
+        total = self.created + self.reused
+        if total == 0:
+            return 0.
+        return self.reused / total
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return the aiohttp tracing hooks filling these statistics."""
+        trace_config = aiohttp.TraceConfig()
+
+        def count(name: str) -> Callable[..., Awaitable[None]]:
+            async def hook(*_: object) -> None:
+                setattr(self, name, getattr(self, name) + 1)
+            return hook
+
+        trace_config.on_connection_create_end.append(count("created"))
+        trace_config.on_connection_reuseconn.append(count("reused"))
+        trace_config.on_dns_cache_hit.append(count("dns_cache_hits"))
+        trace_config.on_dns_cache_miss.append(count("dns_cache_misses"))
+        return trace_config
+
+
+@dataclass
+class _HostRetries:
+    """Requests & retries sent to a host, for its retry budget."""
+
+    requests: int = 0
+    retries: int = 0
+
+
+class HTTPClient:
+    """
+    Implement an HTTP client.
+
+    Failed requests are retried according to the retry policy. If a limiter
+    is given, every request (including the retries) waits for it, and the
+    throttling responses make it back off. If a cache is given, the responses
+    are stored, and sent again only if they changed (see `HTTPCache`).
+
+    The client is an async context manager: its session and connections pool
+    are opened when entered, in the running event loop, and closed when
+    exited. A single client is meant to be shared by all the scrapers, so
+    that they share the connections pool.
+
+    Attributes
+    ----------
+    cache: HTTPCache | None
+        The responses cache, if any.
+    connections: ConnectionMetrics
+        Statistics of the connections pool.
+    """
+
+    def __init__(  # noqa: PLR0913
+            self,
+            nb_retries: int = 3,
+            limiter: "TokenBucketLimiter | None" = None,
+            retry_policy: RetryPolicy | None = None,
+            cache: "HTTPCache | None" = None,
+            limit: int = 100,
+            limit_per_host: int = 4,
+            ttl_dns_cache: int = 300,
+            keepalive_timeout: float = 30.
+    ) -> None:
+        # When & how to retry failed requests.
+        self._retry_policy = retry_policy or RetryPolicy(max_retries=nb_retries)
+        # Limit the requests rate per host.
+        self._limiter = limiter
+        # Store the responses on disk.
+        self.cache = cache
+        # Requests & retries per host.
+        self._retries: dict[str, _HostRetries] = {}
+        # Connections pool tuning: maximum connections (in total & per host),
+        # DNS cache TTL and idle connections lifetime.
+        self._connector_options = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "ttl_dns_cache": ttl_dns_cache,
+            "keepalive_timeout": keepalive_timeout,
+        }
+        self.connections = ConnectionMetrics()
+        # The HTTP session & its connections pool, while opened.
+        self._connector: aiohttp.TCPConnector | None = None
+        self._session: aiohttp.ClientSession | None = None
+
+    async def __aenter__(self) -> "HTTPClient":
+        """Open the http session, in the running event loop."""
+        self._connector = aiohttp.TCPConnector(ssl=False, **self._connector_options)
         self._session = aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(
-                verify_ssl=False,
-            ),
+            connector=self._connector,
+            connector_owner=False,
             timeout=aiohttp.ClientTimeout(10),
+            trace_configs=[self.connections.trace_config()],
             trust_env=True,
         )
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        """Close the http session and its connections."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the http session and its connections, and log statistics."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+
+        logger.info(
+            "HTTP connections: %d opened, %d reused (%.0f%%), "
+            "%d DNS cache hits, %d DNS queries",
+            self.connections.created, self.connections.reused,
+            100 * self.connections.reuse_ratio,
+            self.connections.dns_cache_hits, self.connections.dns_cache_misses)
+        if self._limiter is not None:
+            for host, metrics in self._limiter.metrics.items():
+                logger.info(
+                    "Requests to %s: %d sent, %.2fs average wait, %.2fs max wait, "
+                    "%d throttled, current rate %.2f rqs",
+                    host, metrics.requests, metrics.mean_wait, metrics.max_wait,
+                    metrics.throttled, metrics.rate)
+        if self.cache is not None:
+            logger.info(
+                "HTTP cache: %d hits, %d revalidated, %d misses",
+                self.cache.hits, self.cache.revalidated, self.cache.misses)
 
     async def get(
             self,
             url: str,
-            params: dict[str, str] | None = None,
-            retry_no: int = 0
+            params: dict[str, str] | None = None
     ) -> bytes:
         """
         Send a GET request.
 
         Send a request to URL, and fetch its response's body to return it
-        Response status code are handled and logged accordingly
+        Response status code are handled and logged accordingly. Failed
+        requests are retried according to the retry policy. If the response is
+        cached and didn't change, the cached body is returned.
+
+        Parameters
+        ----------
+        url: str
+            requested url.
+        params: dict[str, str]
+            dict of query parameters
+
+        Returns
+        -------
+        bytes
+            The response body.
+        """
+        body, _ = await self.__get_cached(url, params)
+        return body
+
+    async def get_if_modified(
+            self,
+            url: str,
+            params: dict[str, str] | None = None
+    ) -> bytes | None:
+        """
+        Send a GET request, unless the cached response is still valid.
+
+        Parameters
+        ----------
+        url: str
+            requested url.
+        params: dict[str, str]
+            dict of query parameters
+
+        Returns
+        -------
+        bytes | None
+            The response body, or None if it didn't change since it was
+            cached: there is no need to parse it again.
+        """
+        body, modified = await self.__get_cached(url, params)
+        return body if modified else None
+
+    async def __get_cached(
+            self,
+            url: str,
+            params: dict[str, str] | None
+    ) -> tuple[bytes, bool]:
+        """
+        Send a GET request, through the cache if any.
+
+        A fresh cached response is returned without any request. Otherwise, a
+        conditional request is sent, and the cached response is returned if
+        the server answers 304 Not Modified.
+
+        Parameters
+        ----------
+        url: str
+            requested url.
+        params: dict[str, str]
+            dict of query parameters
+
+        Returns
+        -------
+        bytes
+            The response body.
+        bool
+            Whether the body changed since it was cached.
+        """
+        if self.cache is None:
+            _, body, _ = await self.__get_with_retries(url, params, {})
+            return body, True
+
+        entry = await self.cache.lookup(url, params)
+        if entry is not None and entry.is_fresh():
+            self.cache.hits += 1
+            return entry.body, False
+        headers = entry.conditional_headers() if entry is not None else {}
+        status, body, validators = await self.__get_with_retries(url, params, headers)
+        if status == HTTPStatus.NOT_MODIFIED and entry is not None:
+            self.cache.revalidated += 1
+            await self.cache.refresh(entry, validators)
+            return entry.body, False
+        self.cache.misses += 1
+        await self.cache.store(url, params, body, validators)
+        return body, True
+
+    async def __get_with_retries(
+            self,
+            url: str,
+            params: dict[str, str] | None,
+            headers: dict[str, str]
+    ) -> tuple[int, bytes, dict[str, str]]:
+        """
+        Send a GET request, retried according to the retry policy.
+
+        Parameters
+        ----------
+        url: str
+            requested url.
+        params: dict[str, str]
+            dict of query parameters
+        headers: dict[str, str]
+            The request headers.
+
+        Returns
+        -------
+        int
+            The response status.
+        bytes
+            The response body.
+        dict[str, str]
+            The response validation headers (see `VALIDATION_HEADERS`).
+
+        Raises
+        ------
+        HTTPError
+            If the request failed, after all the retries. Its status is -1 if
+            no response was received.
+        RuntimeError
+            If the client isn't opened (see `__aenter__`).
+        """
+        if self._session is None:
+            msg = "The HTTP client must be opened with `async with` first"
+            raise RuntimeError(msg)
+        policy = self._retry_policy
+        host = urlparse(url).netloc
+        retries = self._retries.setdefault(host, _HostRetries())
+        deadline = None
+        if policy.deadline is not None:
+            deadline = asyncio.get_running_loop().time() + policy.deadline
+
+        retry_no = 0
+        while True:
+            retries.requests += 1
+            try:
+                return await self.__get_once(url, params, headers, retry_no)
+            except HTTPError as e:
+                error = e
+                if e.status not in policy.statuses:
+                    raise
+            except (*policy.exceptions, aiohttp.ClientError) as e:
+                # no response received
+                error = HTTPError(status=-1)
+                error.__cause__ = e
+                if not isinstance(e, policy.exceptions):
+                    raise error from e
+
+            reason = type(error.__cause__).__name__ if error.status < 0 else \
+                str(error.status)
+            delay = policy.delay(retry_no, error.retry_after)
+            give_up = self.__give_up_reason(host, retry_no, delay, deadline)
+            if give_up is not None:
+                reason = f"{reason}, {give_up}"
+                logger.warning(
+                    "Giving up \"GET %s\" after %d retries (%s)", url, retry_no, reason,
+                    extra={
+                        "method": "GET",
+                        "url": url,
+                        "retry": retry_no,
+                        "reason": reason,
+                    })
+                raise error
+
+            retries.retries += 1
+            logger.info(
+                "Retrying \"GET %s\" in %.2fs (%s)", url, delay, reason,
+                extra={
+                    "method": "GET",
+                    "url": url,
+                    "retry": retry_no + 1,
+                    "delay": delay,
+                    "reason": reason,
+                })
+            # the limiter already waits for the throttling responses
+            if self._limiter is None or error.status not in THROTTLING_STATUSES:
+                await asyncio.sleep(delay)
+            retry_no += 1
+
+    def __give_up_reason(
+            self,
+            host: str,
+            retry_no: int,
+            delay: float,
+            deadline: float | None
+    ) -> str | None:
+        """
+        Check whether a failed request can be retried.
+
+        Parameters
+        ----------
+        host: str
+            The requested host.
+        retry_no: int
+            How many retries have been done already.
+        delay: float
+            How long to wait before retrying, in seconds.
+        deadline: float | None
+            When the request must be done, in event loop time.
+
+        Returns
+        -------
+        str | None
+            Why the request can't be retried, or None if it can.
+        """
+        policy = self._retry_policy
+        retries = self._retries[host]
+        if retry_no >= policy.max_retries:
+            return "no retry left"
+        first_requests = retries.requests - retries.retries
+        if retries.retries >= policy.budget_min + policy.budget_ratio * first_requests:
+            return f"retry budget of {host} exhausted"
+        now = asyncio.get_running_loop().time()
+        if deadline is not None and now + delay > deadline:
+            return "deadline exceeded"
+        return None
+
+    async def __get_once(
+            self,
+            url: str,
+            params: dict[str, str] | None,
+            headers: dict[str, str],
+            retry_no: int
+    ) -> tuple[int, bytes, dict[str, str]]:
+        """
+        Send a GET request, without retrying.
 
         Parameters
         ----------
@@ -67,29 +545,48 @@ class HTTPClient:
             requested url.
         params: dict[str, str]
             dict of query parameters
+        headers: dict[str, str]
+            The request headers.
         retry_no: int
             how many tries we already retried before
 
         Returns
         -------
+        int
+            The response status.
         bytes
             The response body.
+        dict[str, str]
+            The response validation headers (see `VALIDATION_HEADERS`).
+
+        Raises
+        ------
+        HTTPError
+            If the response status is an error.
         """
-        if self._session is None:
-            self.__initialize_session()
+        if self._limiter is not None:
+            await self._limiter.acquire(url)
         status: int = -1
+        retry_after: float | None = None
         logger.debug("Starting request to %s ...", url)
         try:
-            async with self._session.get(url, params=params) as resp:
+            async with self._session.get(url, params=params, headers=headers) as resp:
                 status = resp.status
+                if status in THROTTLING_STATUSES:
+                    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
                 resp.raise_for_status()
-                return await resp.read()
+                body = await resp.read()
+                validators = {
+                    name: resp.headers[name]
+                    for name in VALIDATION_HEADERS if name in resp.headers
+                }
         except aiohttp.ClientError as e:
-            if status == HTTPStatus.TOO_MANY_REQUESTS:
-                if retry_no >= self._nb_retries:
-                    raise HTTPError(status=status) from e
-                return await self.get(url, params=params, retry_no=retry_no + 1)
-            raise HTTPError(status=status) from e
+            if status < HTTPStatus.BAD_REQUEST:
+                # the connection failed: the retry policy decides
+                raise
+            if status in THROTTLING_STATUSES and self._limiter is not None:
+                self._limiter.throttle(url, retry_after)
+            raise HTTPError(status=status, retry_after=retry_after) from e
         finally:
             msg = f"\"GET {url}\" {status}"
             if status >= 0:
@@ -98,65 +595,449 @@ class HTTPClient:
                 "method": "GET",
                 "url": url,
                 "status_code": status,
+                "retry": retry_no,
             })
+        if self._limiter is not None:
+            self._limiter.succeed(url)
+        return status, body, validators
+
+
+@dataclass
+class LimiterMetrics:
+    """
+    Metrics of the requests sent to a host.
+
+    Attributes
+    ----------
+    rate: float
+        The current allowed rate, in requests per second.
+    requests: int
+        How many requests have been allowed.
+    throttled: int
+        How many throttling responses (429, 503) have been received.
+    total_wait: float
+        How long the requests waited in total, in seconds.
+    max_wait: float
+        The longest a request waited, in seconds.
+    """
+
+    rate: float
+    requests: int = 0
+    throttled: int = 0
+    total_wait: float = 0.
+    max_wait: float = 0.
+
+    @property
+    def mean_wait(self) -> float:
+        """Return how long a request waited on average, in seconds."""
+        if self.requests == 0:
+            return 0.
+        return self.total_wait / self.requests
+
+
+@dataclass
+class _Bucket:
+    """
+    Token bucket of a host.
+
+    Attributes
+    ----------
+    rate: float
+        The current allowed rate, in requests per second.
+    allowed_at: float
+        When the next request is allowed, in event loop time.
+    blocked: int
+        How many times the host has blocked the requests. The requests
+        scheduled before a block are scheduled again.
+    failures: int
+        The number of consecutive throttling responses.
+    """
+
+    rate: float
+    allowed_at: float = 0.
+    blocked: int = 0
+    failures: int = 0
+
+
+class TokenBucketLimiter:
+    """
+    Limit the rate of requests per host, with a token bucket.
+
+    Each host gets `burst` tokens, refilled at `rate` tokens per second, and
+    each request takes a token. The tokens aren't refilled by a background
+    task: the bucket only stores when the next request is allowed, and each
+    request waits until its own turn (virtual scheduling).
+
+    When the host answers 429 or 503, the requests are blocked for the
+    `Retry-After` delay (or an exponential backoff if missing), and the
+    host's rate is halved. Each successful response increases it back, by a
+    tenth of the configured rate.
+
+    Attributes
+    ----------
+    rate: float
+        The configured rate, in requests per second.
+    burst: int
+        How many requests can be sent at once, after some inactivity.
+    min_rate: float
+        The lowest rate after backing off.
+    backoff: float
+        The first backoff delay in seconds, when `Retry-After` is missing.
+    max_backoff: float
+        The maximum backoff delay, in seconds.
+    metrics: dict[str, LimiterMetrics]
+        The metrics of each host.
+    """
+
+    def __init__(
+            self,
+            rate: float = 1.,
+            burst: int = 1,
+            min_rate: float | None = None,
+            backoff: float = 1.,
+            max_backoff: float = 60.
+    ) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.metrics: dict[str, LimiterMetrics] = {}
+        self._buckets: dict[str, _Bucket] = {}
+
+    def __bucket(self, url: str) -> tuple[_Bucket, LimiterMetrics]:
+        """Get the bucket & metrics of the URL's host."""
+        host = urlparse(url).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _Bucket(rate=self.rate)
+            self.metrics[host] = LimiterMetrics(rate=self.rate)
+        return bucket, self.metrics[host]
+
+    async def acquire(self, url: str) -> float:
+        """
+        Wait until a request to the URL's host is allowed.
+
+        Parameters
+        ----------
+        url: str
+            The requested URL.
+
+        Returns
+        -------
+        float
+            How long the request waited, in seconds.
+        """
+        bucket, metrics = self.__bucket(url)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        while True:
+            now = loop.time()
+            # the bucket is full after `burst` intervals of inactivity
+            allowed_at = max(bucket.allowed_at, now - (self.burst - 1) / bucket.rate)
+            bucket.allowed_at = allowed_at + 1 / bucket.rate
+            blocked = bucket.blocked
+            if allowed_at > now:
+                await asyncio.sleep(allowed_at - now)
+            # the host blocked the requests meanwhile: wait for a new turn
+            if bucket.blocked == blocked:
+                break
+        wait = loop.time() - start
+        metrics.requests += 1
+        metrics.total_wait += wait
+        metrics.max_wait = max(metrics.max_wait, wait)
+        return wait
+
+    def throttle(self, url: str, retry_after: float | None = None) -> None:
+        """
+        Back off after a throttling response from the URL's host.
+
+        Parameters
+        ----------
+        url: str
+            The requested URL.
+        retry_after: float | None
+            How long the host asked to wait, in seconds. If None, wait with an
+            exponential backoff instead.
+        """
+        bucket, metrics = self.__bucket(url)
+        if retry_after is None:
+            retry_after = min(self.backoff * 2 ** bucket.failures, self.max_backoff)
+        bucket.failures += 1
+        bucket.blocked += 1
+        bucket.rate = max(bucket.rate / 2, self.min_rate)
+        bucket.allowed_at = asyncio.get_running_loop().time() + retry_after
+        metrics.throttled += 1
+        metrics.rate = bucket.rate
+        logger.warning(
+            "Throttled by %s: waiting %.1fs, rate lowered to %.2f rqs",
+            urlparse(url).netloc, retry_after, bucket.rate)
+
+    def succeed(self, url: str) -> None:
+        """
+        Increase back the rate after a successful response from the URL's host.
+
+        Parameters
+        ----------
+        url: str
+            The requested URL.
+        """
+        bucket, metrics = self.__bucket(url)
+        bucket.failures = 0
+        bucket.rate = min(bucket.rate + self.rate / 10, self.rate)
+        metrics.rate = bucket.rate
 
 
-class Limiter:
+@dataclass
+class CacheEntry:
     """
-    Limit the number of concurrent requests.
+    A response stored in the HTTP cache.
+
+    Attributes
+    ----------
+    key: str
+        The unique key of the request (see `HTTPCache.key`).
+    url: str
+        The requested URL.
+    body: bytes
+        The response body.
+    stored_at: float
+        When the response was stored or revalidated, as a timestamp.
+    ttl: float
+        How long the response is used without revalidation, in seconds.
+    etag: str | None
+        The response `ETag` header.
+    last_modified: str | None
+        The response `Last-Modified` header.
+    """
+
+    key: str
+    url: str
+    body: bytes
+    stored_at: float
+    ttl: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_fresh(self) -> bool:
+        """Return whether the response can be used without revalidation."""
+        return time.time() - self.stored_at < self.ttl
 
-    This is based on a semaphore. Only a given amount of request can go in
-    parallel, and the lock is released after 1 second.
+    def conditional_headers(self) -> dict[str, str]:
+        """Return the headers revalidating the response."""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
 
-    Used to limit the rqs for a given website.
+
+class HTTPCache:
+    """
+    Store the HTTP responses on disk.
+
+    Each response is stored as 2 files in `directory`: its body, and its
+    metadata (URL, `ETag` & `Last-Modified` headers, storage time). The files
+    are read and written in threads, not to block the event loop, and each
+    file is replaced atomically. An unreadable response is a miss.
+
+    A response is used without any request during its TTL, given by the first
+    pattern matching its URL. Once expired, it is revalidated with a
+    conditional request (`If-None-Match`, `If-Modified-Since`): a 304 Not
+    Modified response means the stored body can be used again.
 
     Attributes
     ----------
-    release_time: int
-        Ho long to wait until the lock is released.
+    directory: Path
+        Where the responses are stored.
+    ttls: list[tuple[re.Pattern, float]]
+        The TTL in seconds of the URLs matching each pattern.
+    default_ttl: float
+        The TTL of the URLs matching no pattern. 0 always revalidates.
+    hits: int
+        How many responses were used without any request.
+    revalidated: int
+        How many responses were used after a 304 Not Modified response.
+    misses: int
+        How many responses were downloaded.
     """
 
-    release_time = 1  # 1sec
+    def __init__(
+            self,
+            directory: str | Path,
+            ttls: list[tuple[str, float]] | None = None,
+            default_ttl: float = 0.
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in ttls or []]
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "HTTPCache | None":
+        """
+        Create the cache from the environment, if enabled.
+
+        - `HTTP_CACHE_DIR`: where the responses are stored. The cache is
+          disabled if missing.
+        - `HTTP_CACHE_TTLS`: comma-separated list of `pattern=seconds`.
+        - `HTTP_CACHE_DEFAULT_TTL`: the TTL of the other URLs, in seconds.
+
+        Returns
+        -------
+        HTTPCache | None
+            The cache, or None if disabled.
+        """
+        directory = os.getenv("HTTP_CACHE_DIR")
+        if not directory:
+            return None
+        ttls = []
+        for item in os.getenv("HTTP_CACHE_TTLS", "").split(","):
+            pattern, _, ttl = item.strip().rpartition("=")
+            if pattern:
+                ttls.append((pattern, float(ttl)))
+        default_ttl = float(os.getenv("HTTP_CACHE_DEFAULT_TTL", "0"))
+        return cls(directory, ttls=ttls, default_ttl=default_ttl)
+
+    @staticmethod
+    def key(url: str, params: dict[str, str] | None = None) -> str:
+        """
+        Compute the unique key of a request.
+
+        Parameters
+        ----------
+        url: str
+            requested url.
+        params: dict[str, str]
+            dict of query parameters
+
+        Returns
+        -------
+        str
+            The request's key.
+        """
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()))}"
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def ttl(self, url: str) -> float:
+        """Return the TTL of a URL, in seconds."""
+        for pattern, ttl in self.ttls:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
 
-    def __init__(self, rqs: int) -> None:
-        # how many request per second allowed
-        self._sem = asyncio.Semaphore(rqs)
-        # keep a reference of the background tasks
-        self.__releasing_tasks: set[asyncio.Future] = set()
+    async def lookup(
+            self,
+            url: str,
+            params: dict[str, str] | None = None
+    ) -> CacheEntry | None:
+        """
+        Find a stored response.
 
-    async def __acquire_call(self) -> None:
+        Parameters
+        ----------
+        url: str
+            requested url.
+        params: dict[str, str]
+            dict of query parameters
+
+        Returns
+        -------
+        CacheEntry | None
+            The stored response, if any.
         """
-        Acquire a call during 1 second.
+        return await asyncio.to_thread(self.__read, self.key(url, params), url)
+
+    def __read(self, key: str, url: str) -> CacheEntry | None:
+        """Read a stored response, None if missing or corrupted."""
+        try:
+            metadata = json.loads(self.__path(key, "json").read_text())
+            body = self.__path(key, "body").read_bytes()
+            # the TTL may have been changed since stored
+            metadata["ttl"] = self.ttl(url)
+            return CacheEntry(body=body, **metadata)
+        except (OSError, ValueError, TypeError):
+            return None
 
-        Releasing the semaphore is done in background independently on the
-        status of any other tasks.
+    async def store(
+            self,
+            url: str,
+            params: dict[str, str] | None,
+            body: bytes,
+            validators: dict[str, str]
+    ) -> CacheEntry:
         """
-        await self._sem.acquire()
+        Store a response.
 
-        async def release() -> None:
-            """Release 1 unit of the semaphore."""
-            await asyncio.sleep(self.release_time)
-            self._sem.release()
+        Parameters
+        ----------
+        url: str
+            requested url.
+        params: dict[str, str]
+            dict of query parameters
+        body: bytes
+            The response body.
+        validators: dict[str, str]
+            The response `ETag` & `Last-Modified` headers, if any.
 
-        # run the task in background
-        task = asyncio.ensure_future(asyncio.shield(release()))
-        self.__releasing_tasks.add(task)
-        task.add_done_callback(self.__releasing_tasks.discard)
+        Returns
+        -------
+        CacheEntry
+            The stored response.
+        """
+        entry = CacheEntry(
+            key=self.key(url, params),
+            url=url,
+            body=body,
+            stored_at=time.time(),
+            ttl=self.ttl(url),
+            etag=validators.get("ETag"),
+            last_modified=validators.get("Last-Modified"),
+        )
+        await asyncio.to_thread(self.__write, entry, body)
+        return entry
 
-    def __call__(self, func: Callable[[...], Awaitable]) -> Callable:
+    async def refresh(self, entry: CacheEntry, validators: dict[str, str]) -> None:
         """
-        Act as a decorator.
+        Mark a stored response as revalidated.
 
-        Acquire a lock and release it in background after a sec.
+        Parameters
+        ----------
+        entry: CacheEntry
+            The revalidated response.
+        validators: dict[str, str]
+            The new `ETag` & `Last-Modified` headers, if any.
         """
-        async def wrapper(*args, **kwargs) -> Awaitable:  # noqa: ANN003,ANN002
-            await self.__acquire_call()
-            return await func(*args, **kwargs)
-        return wrapper
+        entry.stored_at = time.time()
+        entry.etag = validators.get("ETag", entry.etag)
+        entry.last_modified = validators.get("Last-Modified", entry.last_modified)
+        await asyncio.to_thread(self.__write, entry)
 
-    async def __aenter__(self) -> None:
-        """Acquire the lock."""
-        await self.__acquire_call()
+    def __write(self, entry: CacheEntry, body: bytes | None = None) -> None:
+        """Write the metadata of a stored response, and its body if given."""
+        if body is not None:
+            self.__replace(self.__path(entry.key, "body"), body)
+        metadata = asdict(entry)
+        del metadata["body"], metadata["ttl"]
+        self.__replace(self.__path(entry.key, "json"), json.dumps(metadata).encode())
+
+    def __replace(self, path: Path, data: bytes) -> None:
+        """Write a file atomically: readers see either the old or the new one."""
+        with tempfile.NamedTemporaryFile(
+                dir=self.directory, prefix=f".{path.name}.", delete=False) as tmp:
+            tmp.write(data)
+        tmp_path = Path(tmp.name)
+        try:
+            tmp_path.replace(path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:  # noqa: ANN001
-        """Nothing done here when leaving the context."""
+    def __path(self, key: str, suffix: str) -> Path:
+        """Return the path of a stored response's file."""
+        return self.directory / f"{key}.{suffix}"
@@ -171,31 +171,43 @@ class ResultRow(Row):
         """Return true if a birth is provided."""
         return self.birth is not None
 
-    def to_model(self) -> models.Result:
-        """Transform this row into a Result model."""
-        rank: models.Rank | None = None
+    def to_record(self) -> models.ResultRecord:
+        """
+        Transform this row into a result record.
+
+        Raises
+        ------
+        ValueError
+            If the race number, the gender or a finisher's rankings are not
+            valid.
+        TypeError
+            If a finisher's ranking is missing.
+        """
         status = self.get_status()
+        scratch = sex_ranking = category_ranking = None
         if status == models.ResultStatus.FINISHER:
-            rank = models.Rank(
-                scratch=self.scratch,
-                gender=self.sex_ranking,
-                category=self.category_ranking,
-            )
-        return models.Result(
-            time=self.time,
+            scratch = int(self.scratch)
+            sex_ranking = int(self.sex_ranking)
+            category_ranking = int(self.category_ranking)
+        return models.ResultRecord(
+            first_name=self.first_name,
+            last_name=self.last_name,
+            gender=models.Gender(self.gender),
             status=status,
-            rank=rank,
-            license=self.license,
+            race_number=int(self.race_number),
             category=self.category,
-            race_number=self.race_number,
-            runner=models.Runner(
-                first_name=self.first_name,
-                last_name=self.last_name,
-                birth_year=self.birth,
-                gender=models.Gender(self.gender),
-            ),
+            birth_year=self.birth,
+            time=self.time,
+            license=self.license,
+            scratch=scratch,
+            gender_ranking=sex_ranking,
+            category_ranking=category_ranking,
         )
 
+    def to_model(self) -> models.Result:
+        """Transform this row into a Result model."""
+        return self.to_record().to_model()
+
     def get_status(self) -> models.ResultStatus:
         """Convert the scrapped status into a more readable one (in english)."""
         match self.status:
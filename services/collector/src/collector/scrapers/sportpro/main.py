@@ -1,23 +1,16 @@
-import asyncio
 import logging
-from collections.abc import AsyncIterator, Iterator
+from collections.abc import AsyncIterator, Container, Iterator
 from typing import TypeVar
 
-from bs4 import BeautifulSoup, Tag
-
 from collector import models
-from collector.scrapers.generic import ResultsScraper
-from collector.scrapers.requester import HTTPClient, Limiter
-from collector.scrapers.sportpro import data
+from collector.scrapers.generic import ResultsPage, ResultsScraper
+from collector.scrapers.sportpro import data, parser
 from collector.scrapers.sportpro import utils
 
 __all__ = ["SportproScraper"]
 
 logger = logging.getLogger(__name__)
 
-limiter = Limiter(1)
-client = HTTPClient()
-
 RowType = TypeVar("RowType", bound=data.Row)
 
 
@@ -27,148 +20,183 @@ class SportproScraper(ResultsScraper):
     host = "https://www.sportpro.re"
     results_path = "/resultats/"
 
-    def __init__(self) -> None:
-        # collections of competitions scraped
-        # when we scrap a single competition, a future is created and associated
-        # to it in this dictionary
-        self._scraping_tasks: dict[models.Competition, asyncio.Future | None] = {}
-
-        # errors during each competition scraping
-        # we collect them and log them at the end
-        self._errors: list[Exception] = []
-
-    async def scrap(self) -> AsyncIterator[models.Competition]:
+    async def results_pages(
+            self,
+            skip: Container[models.EventKey] = frozenset(),
+            stored: Container[models.EventKey] = frozenset()
+    ) -> AsyncIterator[ResultsPage]:
         """
-        Scrap the sportpro results page.
+        List the competitions results pages, from the sportpro results page.
+
+        Parameters
+        ----------
+        skip: Container[models.EventKey]
+            The competition events already ingested: their results are not
+            scraped again.
+        stored: Container[models.EventKey]
+            The competition events with results in the DB: their results are
+            scraped again only if their page changed.
 
         Returns
         -------
-        AsyncIterator[models.Competition]
-            An iterator of all scraped competitions from the website.
+        AsyncIterator[ResultsPage]
+            Iterate the results pages, not fetched yet.
         """
-        async with limiter:
-            html = await client.get(f"{self.host}{self.results_path}")
-
-        # find competitions and scrap the corresponding results
-        for url, competition in self.__scrap_competitions(html):
-            self._scraping_tasks[competition] = asyncio.ensure_future(
-                self.__scrap_results(url, competition))
+        html = await self._client.get(f"{self.host}{self.results_path}")
 
+        pages = skipped = 0
+        for url, competition in await self._executor.run(parse_competitions, html):
+            if competition.key in skip:
+                skipped += 1
+                continue
+            pages += 1
+            yield ResultsPage(
+                url=url, competition=competition, stored=competition.key in stored)
         logger.info(
-            "About to scrap results for %d competitions",
-            len(self._scraping_tasks))
-        while len(self._scraping_tasks) > 0:
-            done = set()
-
-            # find all competition that are scraped already
-            for comp, fut in self._scraping_tasks.items():
-                if fut.done():
-                    try:
-                        fut.result()
-                        yield comp
-                    except Exception as exc:  # noqa: BLE001
-                        self._errors.append(exc)
-                    done.add(comp)
-
-            # remove the ones that are done
-            for comp in done:
-                del self._scraping_tasks[comp]
-
-            # sleep 5 ms
-            await asyncio.sleep(0.005)
-
-        # handle errors
-        if self._errors:
-            logger.warning("%d collected!", len(self._errors))
-
-    def __scrap_competitions(
-            self,
-            html: bytes
-    ) -> Iterator[tuple[str | None, models.Competition]]:
-        """Parse html page into a competition model and its URL."""
-        soup = BeautifulSoup(html, "lxml")
-        table = soup.find_all("table", attrs={"id": "resList"})[0]
-        for row in self.__parse_table(table, data.CompetitionRow):
-            competition = row.to_model()
-            yield row.results_url, competition
-            logger.debug("Successfully scraped competition=%s", competition)
-
-    async def __scrap_results(
-            self, url: str, competition: models.Competition) -> None:
+            "Listed results for %d competitions (%d already ingested)",
+            pages, skipped)
+
+    async def fetch(self, page: ResultsPage) -> ResultsPage | None:
         """
-        Extract results from the html page under url.
+        Fetch a competition's results page.
 
-        Add the fetched results into `competition`.
+        The page of a competition already stored is dropped if it didn't
+        change since cached (see `HTTPClient.get_if_modified`): its results
+        are already in the DB. Any other page is parsed, even unchanged: it
+        may never have been stored, e.g. if its storage failed.
 
         Parameters
         ----------
-        url : str
-            The URL where the results can be found.
-        competition: models.Competition
-            The competition to which the results belong. Fetched results are
-            added to this competition.
+        page: ResultsPage
+            The page to fetch.
+
+        Returns
+        -------
+        ResultsPage | None
+            The page with its html, or None if it doesn't need to be parsed.
         """
-        async with limiter:
-            html = await client.get(utils.complete_url(self.host, url))
-        soup = BeautifulSoup(html, "lxml")
-        table = soup.find_all("table", attrs={"id": "resList"})[0]
-        for row in self.__parse_table(table, data.ResultRow):
-            try:
-                competition.results.append(row.to_model())
-            except Exception:
-                logger.exception("Error formatting row=%s (url=%s)",  row, url)
-        logger.debug(
-            "Successfully scraped %d results for competition=%s",
-            len(competition.results), competition)
+        url = utils.complete_url(self.host, page.url)
+        if not page.stored:
+            page.html = await self._client.get(url)
+            return page
+
+        page.html = await self._client.get_if_modified(url)
+        if page.html is None:
+            logger.debug("Results unchanged for competition=%s", page.competition)
+            return None
+        return page
+
+    async def parse(self, page: ResultsPage) -> ResultsPage:
+        """
+        Parse a competition's results page into a results batch.
 
-    @staticmethod
-    def __parse_table(table: Tag, output: type[data.Row]) -> Iterator[RowType]:
+        Parameters
+        ----------
+        page: ResultsPage
+            The fetched page.
+
+        Returns
+        -------
+        ResultsPage
+            The page with its results, without its html anymore.
         """
-        Parse an html table.
+        page.results = await self._executor.run(parse_results, page.html)
+        page.html = None
+        return page
 
-        1. find the headers which will be the dictionaries keys
-        2. parse all rows and associate the found values to the headers as a
-            dict.
+    async def normalize(self, page: ResultsPage) -> models.Competition:
+        """
+        Add the results of a parsed page to its competition.
 
         Parameters
         ----------
-        table : Tag
-            HTML table to parse.
-        output : type[data.Row]
-            The output wrapper for each table's row that are scraped.
+        page: ResultsPage
+            The parsed page.
 
         Returns
         -------
-        Iterator[RowType]
-            Iterate the scraped rows from the table.
+        models.Competition
+            The competition, with its results.
         """
-        headers: list[str] = []
-        for row in table.find_all("tr"):
-            # everytime we encounter a header, we store it to better
-            # extract the following rows
-            if "header" in (row.get("class") or []):
-                headers = [r.text for r in row.find_all("th")]
-                continue
-
-            # extract the row, and map its values to the headers
-            d = {}
-            # needed for colspan attributes, to target the right header
-            offset: int = 0
-            for i, column in enumerate(row.find_all("td")):
-                # too many entries compared to the current headers
-                if i >= len(headers):
-                    break
-                header = headers[i + offset]
-                # update offset
-                offset += int(column.get("colspan", "1")) - 1
-                try:
-                    if header == "Résultats":  # find the URL to the results page
-                        d[header] = column.find_all("a")[0]["href"]
-                    else:
-                        d[header] = column.text
-                except (IndexError, KeyError, AttributeError):
-                    logger.debug("Error parsing row=%s", row)
-                    continue
-            res = output.from_dict(d)
-            if res is not None and res.is_valid():
-                yield res
+        competition = page.competition
+        competition.results = page.results
+        logger.debug(
+            "Successfully scraped %d results for competition=%s",
+            len(competition.results), competition)
+        return competition
+
+
+def parse_competitions(html: bytes) -> list[tuple[str | None, models.Competition]]:
+    """
+    Parse the results page into competition models and their results URL.
+
+    Run in the parse executor: the arguments and results are picklable.
+
+    Parameters
+    ----------
+    html : bytes
+        The results page.
+
+    Returns
+    -------
+    list[tuple[str | None, models.Competition]]
+        The competitions, and the URL of their results page.
+    """
+    competitions = []
+    for row in _parse_table(html, data.CompetitionRow):
+        competition = row.to_model()
+        competitions.append((row.results_url, competition))
+        logger.debug("Successfully scraped competition=%s", competition)
+    return competitions
+
+
+def parse_results(html: bytes) -> models.ResultsBatch:
+    """
+    Parse a competition's results page into a results batch.
+
+    Run in the parse executor: the arguments and results are picklable. The
+    rows go into the batch columns as soon as parsed: only the batch is sent
+    back to the event loop.
+
+    Parameters
+    ----------
+    html : bytes
+        The results page.
+
+    Returns
+    -------
+    models.ResultsBatch
+        The results of the valid rows.
+    """
+    batch = models.ResultsBatch()
+    for row in _parse_table(html, data.ResultRow):
+        try:
+            batch.append(row.to_record())
+        except Exception:
+            logger.exception("Error formatting row=%s", row)
+    return batch
+
+
+def _parse_table(html: bytes, output: type[data.Row]) -> Iterator[RowType]:
+    """
+    Parse the html table of a page.
+
+    The rows are streamed from the page, mapped to their headers (see
+    `parser.iter_table_rows`), without building the whole html tree.
+
+    Parameters
+    ----------
+    html : bytes
+        HTML page to parse.
+    output : type[data.Row]
+        The output wrapper for each table's row that are scraped.
+
+    Returns
+    -------
+    Iterator[RowType]
+        Iterate the scraped rows from the table.
+    """
+    for d in parser.iter_table_rows(html):
+        res = output.from_dict(d)
+        if res is not None and res.is_valid():
+            yield res
@@ -0,0 +1,127 @@
+import io
+import logging
+from collections.abc import Iterator
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# id of the html table listing competitions or results
+TABLE_ID = "resList"
+# header of the column linking to a competition's results page
+RESULTS_HEADER = "Résultats"
+# sportpro pages encoding (libxml2 defaults to latin-1 without a charset)
+ENCODING = "utf-8"
+
+
+def iter_table_rows(
+        html: bytes | str,
+        table_id: str = TABLE_ID
+) -> Iterator[dict[str, str]]:
+    """
+    Stream the rows of an html table, mapped to their headers.
+
+    The page is parsed incrementally (`lxml.etree.iterparse`): no whole tree
+    is built. Every element is freed once parsed, and the parsing stops at
+    the end of the table.
+
+    1. every row with the "header" class gives the headers of the following
+        rows.
+    2. every other row is yielded as a dict header -> column's text. The
+        results column gives its link instead.
+
+    Parameters
+    ----------
+    html: bytes | str
+        The html page.
+    table_id: str
+        The id of the table to parse. Only the first table with this id is
+        parsed.
+
+    Returns
+    -------
+    Iterator[dict[str, str]]
+        Iterate the table's rows.
+
+    Raises
+    ------
+    ValueError
+        If the page has no such table.
+    """
+    if isinstance(html, str):
+        html = html.encode(ENCODING)
+    events = etree.iterparse(
+        io.BytesIO(html), events=("start", "end"), html=True, encoding=ENCODING)
+    table = _find_table(events, table_id)
+    if table is None:
+        msg = f"No table with id={table_id} found"
+        raise ValueError(msg)
+
+    headers: list[str] = []
+    for event, elem in events:
+        if elem is table:
+            return
+        if event != "end" or elem.tag != "tr":
+            continue
+
+        # everytime we encounter a header, we store it to better
+        # extract the following rows
+        if "header" in (elem.get("class") or "").split():
+            headers = [_text(th) for th in elem.iter("th")]
+        else:
+            yield _parse_row(elem, headers)
+        # nested rows are freed with their outer row
+        if next(elem.iterancestors("tr"), None) is None:
+            _free(elem)
+
+
+def _find_table(
+        events: Iterator[tuple[str, etree._Element]],
+        table_id: str
+) -> etree._Element | None:
+    """Consume the parsing events until the table starts, and return it."""
+    for event, elem in events:
+        if event == "start" and elem.tag == "table" and elem.get("id") == table_id:
+            return elem
+        if event == "end":
+            # outside the table: not needed anymore
+            _free(elem)
+    return None
+
+
+def _parse_row(row: etree._Element, headers: list[str]) -> dict[str, str]:
+    """Map the columns of a row to the headers."""
+    d = {}
+    # needed for colspan attributes, to target the right header
+    offset: int = 0
+    for i, column in enumerate(row.iter("td")):
+        # too many entries compared to the current headers
+        if i >= len(headers):
+            break
+        header = headers[i + offset]
+        # update offset
+        offset += int(column.get("colspan", "1")) - 1
+        if header == RESULTS_HEADER:  # find the URL to the results page
+            link = next(column.iter("a"), None)
+            if link is None or link.get("href") is None:
+                logger.debug("Error parsing row=%s", _text(row))
+                continue
+            d[header] = link.get("href")
+        else:
+            d[header] = _text(column)
+    return d
+
+
+def _text(elem: etree._Element) -> str:
+    """Return the text of an element and all its descendants."""
+    return "".join(elem.itertext())
+
+
+def _free(elem: etree._Element) -> None:
+    """Free a parsed element, and its already parsed previous siblings."""
+    elem.clear(keep_tail=True)
+    parent = elem.getparent()
+    if parent is None:
+        return
+    while elem.getprevious() is not None:
+        del parent[0]
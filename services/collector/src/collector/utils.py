@@ -1,9 +1,12 @@
 import datetime
+import itertools
 import math
-from collections.abc import Callable
+from collections import Counter
+from collections.abc import Callable, Iterator
 from typing import TypeVar
 
 import Levenshtein
+import numpy as np
 
 __all__ = ["sentence_similarity"]
 
@@ -72,6 +75,99 @@ def distance_similarity(d1: float, d2: float, perc90_delta: float = 2) -> float:
     return math.exp(- (d2 - d1) ** 2 / coeff)
 
 
+def distance_similarities(
+        d1: float | None,
+        d2: np.ndarray,
+        perc90_delta: float = 2
+) -> np.ndarray:
+    """
+    Calculate the distance similarity between a float and an array of floats.
+
+    It is the vectorized version of `distance_similarity`. NaN values in `d2`
+    stand for missing values: as None in `distance_similarity`, their
+    similarity is 1.0.
+
+    Parameters
+    ----------
+    d1: float | None
+        distance to compare to each value of d2.
+    d2: np.ndarray
+        distances to compare.
+    perc90_delta: float
+        what difference between d1 and d2 should give the
+        value 0.9.
+
+    Returns
+    -------
+    np.ndarray
+        A score between 0 and 1 for each value of d2.
+    """
+    if d1 is None:
+        return np.ones(d2.shape)
+    coeff = perc90_delta ** 2 / 0.10536
+    sims = np.exp(- (d2 - d1) ** 2 / coeff)
+    return np.where(np.isnan(d2), 1., sims)
+
+
+def distance_similarity_radius(similarity: float, perc90_delta: float = 2) -> float:
+    """
+    Calculate the maximum difference keeping a given distance similarity.
+
+    It is the inverse of `distance_similarity`: any two floats whose
+    difference is greater than the radius have a similarity lower than
+    `similarity`.
+
+    Parameters
+    ----------
+    similarity: float
+        The minimum distance similarity.
+    perc90_delta: float
+        what difference between two floats should give the value 0.9.
+
+    Returns
+    -------
+    float
+        The maximum difference between two floats. It is infinite if
+        `similarity` is not positive.
+    """
+    if similarity <= 0:
+        return math.inf
+    if similarity >= 1:
+        return 0.
+    coeff = perc90_delta ** 2 / 0.10536
+    return math.sqrt(- math.log(similarity) * coeff)
+
+
+def characters_similarity_bound(
+        chars1: Counter[str],
+        chars2: Counter[str]
+) -> float:
+    """
+    Calculate an upper bound of the sentence similarity.
+
+    Any words subset of a sentence can't have more characters in common with
+    another sentence than the whole sentence. Hence, the levenshtein ratio
+    of any words subset is bounded by the number of common characters.
+
+    Parameters
+    ----------
+    chars1: Counter[str]
+        The characters count of the first sentence, lower-cased and stripped.
+    chars2: Counter[str]
+        The characters count of the second sentence, lower-cased and stripped.
+
+    Returns
+    -------
+    float
+        A score between 0 and 1, greater or equal than the sentence
+        similarity.
+    """
+    if not chars1 or not chars2:
+        return 0.
+    common = (chars1 & chars2).total()
+    return 2 * common / (common + min(chars1.total(), chars2.total()))
+
+
 def sentence_similarity(s1: str, s2: str) -> float:
     """
     Compare s1 to s2.
@@ -94,11 +190,220 @@ def sentence_similarity(s1: str, s2: str) -> float:
     """
     s1, s2 = s1.lower(), s2.lower()
     return max(
-        sentence_similarity_rec(s1, s2),
-        sentence_similarity_rec(s2, s1)
+        subsequence_similarity(s1, s2),
+        subsequence_similarity(s2, s1)
     )
 
 
+def split_words(s: str) -> list[str]:
+    """
+    Split a sentence into words, the same way `sentence_similarity_rec` does.
+
+    Parameters
+    ----------
+    s: str
+        The sentence to split.
+
+    Returns
+    -------
+    list[str]
+        The sentence's words, in order.
+    """
+    words: list[str] = []
+    s = s.strip()
+    while " " in s:
+        word = s.split()[0]
+        words.append(word)
+        s = s[len(word):].strip()
+    if s:
+        words.append(s)
+    return words
+
+
+def subsequence_similarity(
+        s1: str,
+        s2: str,
+        max_exhaustive_words: int = 10
+) -> float:
+    """
+    Calculate the similarity between two sentences, in polynomial time.
+
+    Return the same score as `sentence_similarity_rec`: the best
+    `Levenshtein.ratio` between any ordered subset of s1's words and s2.
+
+    Few-words sentences are enumerated exhaustively, which is the fastest for
+    them. Longer sentences are solved with dynamic programming (see
+    `_subsequence_similarity_dp`), whose cost is polynomial in the sentence
+    length.
+
+    Parameters
+    ----------
+    s1: str
+        The first sentence, from which we take the subsets of words.
+    s2: str
+        The second sentence to which we compare the subsets of words.
+    max_exhaustive_words: int
+        Up to this number of words in s1, all the words subsets are evaluated.
+
+    Returns
+    -------
+    float
+        A similarity score between 0 and 1.
+    """
+    return words_similarity(
+        split_words(s1), s2, max_exhaustive_words=max_exhaustive_words)
+
+
+def words_subsets(words: list[str]) -> Iterator[str]:
+    """
+    Iterate all the ordered subsets of a sentence's words.
+
+    The subsets are generated lazily: there are `2 ** len(words) - 1` of them.
+
+    Parameters
+    ----------
+    words: list[str]
+        The sentence's words.
+
+    Returns
+    -------
+    Iterator[str]
+        The non-empty subsets of words, in order, joined with spaces.
+    """
+    for size in range(1, len(words) + 1):
+        for subset in itertools.combinations(words, size):
+            yield " ".join(subset)
+
+
+def words_similarity(
+        words: list[str],
+        s2: str,
+        max_exhaustive_words: int = 10
+) -> float:
+    """
+    Calculate the similarity between a sentence's words and another sentence.
+
+    See `subsequence_similarity`, on an already split sentence.
+
+    Parameters
+    ----------
+    words: list[str]
+        The first sentence's words, from which we take the subsets of words.
+    s2: str
+        The second sentence to which we compare the subsets of words.
+    max_exhaustive_words: int
+        Up to this number of words, all the words subsets are evaluated.
+
+    Returns
+    -------
+    float
+        A similarity score between 0 and 1.
+    """
+    s2 = s2.strip()
+    if not words or s2 == "":
+        return 0.
+
+    if len(words) > max_exhaustive_words:
+        return _subsequence_similarity_dp(words, s2)
+
+    return max(Levenshtein.ratio(subset, s2) for subset in words_subsets(words))
+
+
+def _subsequence_similarity_dp(words: list[str], s2: str) -> float:
+    """
+    Find the best words subset of a sentence compared to s2.
+
+    `Levenshtein.ratio(a, b)` is `2 * lcs(a, b) / (len(a) + len(b))`, where
+    `lcs` is the longest common subsequence. Maximizing a ratio is done with
+    Dinkelbach's method: for a given ratio `r`, we look for the words subset
+    maximizing `2 * lcs - r * len`, which is a LCS dynamic programming where
+    words can be skipped. If this subset has a better ratio than `r`, we
+    start over with its ratio, otherwise `r` is the optimum.
+
+    Each iteration costs O(len(s1) * len(s2)), and only a few iterations are
+    needed in practice.
+
+    Parameters
+    ----------
+    words: list[str]
+        The first sentence's words.
+    s2: str
+        The second sentence to which we compare the subsets of words.
+
+    Returns
+    -------
+    float
+        A similarity score between 0 and 1.
+    """
+    num, den = 0, 1  # current ratio, as a fraction
+    while True:
+        lcs, length = _best_words_subset(words, s2, num, den)
+        if 2 * lcs * den <= num * (length + len(s2)):
+            break
+        num, den = 2 * lcs, length + len(s2)
+    return num / den
+
+
+def _best_words_subset(
+        words: list[str],
+        s2: str,
+        num: int,
+        den: int
+) -> tuple[int, int]:
+    """
+    Find the words subset maximizing `2 * den * lcs - num * len`.
+
+    The joined subset and s2 are both prefixed with a space: it makes every
+    word start with a space, and adds exactly 1 to the lcs and the length.
+
+    Every score is stored as a single integer, `score * size + length`, so
+    that the length of the best subset is known once the table is filled.
+
+    Parameters
+    ----------
+    words: list[str]
+        The first sentence's words.
+    s2: str
+        The second sentence to which we compare the subsets of words.
+    num: int
+        The ratio's numerator.
+    den: int
+        The ratio's denominator.
+
+    Returns
+    -------
+    tuple[int, int]
+        The lcs and length of the best words subset.
+    """
+    s2 = f" {s2}"
+    size = sum(len(word) + 1 for word in words) + 1
+    char_cost = 1 - num * size
+    match_gain = 2 * den * size
+
+    # best score for each prefix of s2, when no word is taken yet
+    empty = [0] * (len(s2) + 1)
+    # best score for each prefix of s2, when at least one word is taken
+    taken: list[int] | None = None
+
+    for word in words:
+        row = empty if taken is None else [max(v, 0) for v in taken]
+        for c in f" {word}":
+            new_row = [row[0] + char_cost]
+            for j, c2 in enumerate(s2):
+                score = row[j + 1] + char_cost
+                if c == c2:
+                    score = max(score, row[j] + char_cost + match_gain)
+                new_row.append(max(score, new_row[j]))
+            row = new_row
+        taken = row if taken is None else [
+            max(a, b) for a, b in zip(taken, row, strict=True)]
+
+    best = taken[-1]
+    length = best % size
+    lcs = (best // size + num * length) // (2 * den)
+    return lcs - 1, length - 1
+
+
 def sentence_similarity_rec(s1: str, s2: str, prefix: str = "") -> float:
     """
     Calculate the similarity between two sentences.
@@ -0,0 +1,28 @@
+from collector.database.mysql.cache import RunnersCache
+
+
+def test_RunnersCache():
+    cache = RunnersCache(max_size=2)
+    cache.put(("Georges", "POMPIDOU", 1992), 1)
+    cache.put(("Jacques", "CHIRAC", 1990), 2)
+
+    assert cache.get(("Georges", "POMPIDOU", 1992)) == 1
+    assert cache.get(("Valery", "GISCARD", 1991)) is None
+
+    # "Jacques CHIRAC" is the least recently used
+    cache.put(("Valery", "GISCARD", 1991), 3)
+    assert len(cache) == 2
+    assert cache.get(("Jacques", "CHIRAC", 1990)) is None
+    assert cache.get(("Georges", "POMPIDOU", 1992)) == 1
+    assert cache.get(("Valery", "GISCARD", 1991)) == 3
+
+    assert cache.hits == 3
+    assert cache.misses == 2
+
+
+def test_RunnersCache_disabled():
+    cache = RunnersCache(max_size=0)
+    cache.put(("Georges", "POMPIDOU", 1992), 1)
+
+    assert len(cache) == 0
+    assert cache.get(("Georges", "POMPIDOU", 1992)) is None
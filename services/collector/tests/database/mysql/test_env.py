@@ -37,3 +37,45 @@ def test_Environments(envs: dict[str, str], expected_url: str):
     finally:
         for name in envs:
             del os.environ[name]
+
+
+@pytest.mark.parametrize(
+    "envs,expected_size,expected_warm",
+    [
+        ({}, 100_000, False),
+        ({"MYSQL_RUNNERS_CACHE_SIZE": "10", "MYSQL_RUNNERS_CACHE_WARM": "True"}, 10, True),
+        ({"MYSQL_RUNNERS_CACHE_SIZE": "0", "MYSQL_RUNNERS_CACHE_WARM": "no"}, 0, False),
+    ]
+)
+def test_Environments_runners_cache(envs: dict[str, str], expected_size: int, expected_warm: bool):
+    envs = {"MYSQL_ADDRESS": "localhost", **envs}
+    os.environ.update(envs)
+    try:
+        e = env.Environments.parse()
+        assert e.runners_cache_size == expected_size
+        assert e.runners_cache_warm is expected_warm
+    finally:
+        for name in envs:
+            del os.environ[name]
+
+
+def test_Environments_engine_options():
+    envs = {
+        "MYSQL_ADDRESS": "localhost",
+        "MYSQL_POOL_SIZE": "20",
+        "MYSQL_POOL_MAX_OVERFLOW": "5",
+        "MYSQL_POOL_RECYCLE": "3600",
+        "MYSQL_POOL_PRE_PING": "true",
+    }
+    os.environ.update(envs)
+    try:
+        e = env.Environments.parse()
+        assert e.engine_options() == {
+            "pool_size": 20,
+            "max_overflow": 5,
+            "pool_recycle": 3600,
+            "pool_pre_ping": True,
+        }
+    finally:
+        for name in envs:
+            del os.environ[name]
@@ -0,0 +1,13 @@
+from collector.database.mysql.latency import LatencyMetrics
+
+
+def test_LatencyMetrics():
+    metrics = LatencyMetrics()
+    assert metrics.mean == 0.
+
+    for seconds in [0.5, 2., 0.5]:
+        metrics.record(seconds)
+
+    assert metrics.count == 3
+    assert metrics.mean == 1.
+    assert metrics.maximum == 2.
@@ -0,0 +1,30 @@
+import asyncio
+
+from sqlalchemy.exc import OperationalError
+
+from collector.database.mysql.locks import StripedLocks, is_retryable
+
+
+def test_StripedLocks():
+    locks = StripedLocks(stripes=4)
+    # the same key always gets the same lock
+    assert locks.get("runners", ("A", "B", 1)) is locks.get("runners", ("A", "B", 1))
+    # tables don't share their locks
+    assert locks.get("runners", 1) is not locks.get("results", 1)
+    # keys are spread over the stripes
+    assert len({id(locks.get("results", i)) for i in range(100)}) == 4
+    assert all(isinstance(lock, asyncio.Lock) for lock in locks._locks.values())
+
+
+def test_StripedLocks_single_stripe():
+    locks = StripedLocks(stripes=0)
+    assert locks.stripes == 1
+    assert locks.get("results", 1) is locks.get("results", 2)
+
+
+def test_is_retryable():
+    assert is_retryable(OperationalError("", {}, Exception(1213, "Deadlock found")))
+    assert is_retryable(OperationalError("", {}, Exception(1205, "Lock wait timeout")))
+    assert not is_retryable(OperationalError("", {}, Exception(2013, "Lost connection")))
+    assert not is_retryable(OperationalError("", {}, Exception()))
+    assert not is_retryable(ValueError("wrong"))
@@ -1,6 +1,8 @@
 from datetime import date, timedelta
+from decimal import Decimal
 
 import pytest
+from sqlalchemy import select
 
 from collector import models
 from collector.database.mysql import orm
@@ -121,6 +123,79 @@ def test_Result(result: models.Result, expected: dict):
     event_id, runner_id = 1, 2
     res = orm.Result.from_model(result, event_id, runner_id)
     assert res == expected
+    record = models.ResultRecord.from_model(result)
+    assert orm.Result.from_record(record, event_id, runner_id) == expected
+    batch = models.ResultsBatch.from_records([record])
+    assert orm.Result.from_batch(batch, event_id, [runner_id]) == [expected]
+
+
+def test_Result_record_batch_edge_values():
+    """Records and batches give the same rows, on the edge values too."""
+    records = [
+        models.ResultRecord(
+            first_name="Georges",
+            last_name="POMPIDOU",
+            gender=models.Gender.MALE,
+            status=models.ResultStatus.FINISHER,
+            race_number=1,
+            category="SEH",
+            time=timedelta(0),
+            scratch=0,
+            gender_ranking=70_000,
+            category_ranking=None,
+        ),
+        models.ResultRecord(
+            first_name="Georges",
+            last_name="POMPIDOU",
+            gender=models.Gender.MALE,
+            status=models.ResultStatus.FINISHER,
+            race_number=2,
+            category="SEH",
+            time=timedelta(seconds=0.5),
+            license="",
+        ),
+    ]
+    rows = [orm.Result.from_record(record, 1, i) for i, record in enumerate(records)]
+    batch = models.ResultsBatch.from_records(records)
+    assert orm.Result.from_batch(batch, 1, [0, 1]) == rows
+    assert rows[0]["time"] is None
+    assert rows[1]["time"] == "00:00:00"
+    assert rows[1]["license"] is None
+    assert (
+        rows[0]["scratch_ranking"], rows[0]["gender_ranking"], rows[0]["category_ranking"]
+    ) == (0, 70_000, None)
+
+
+@pytest.mark.parametrize(
+    "seconds,expected_time",
+    [
+        # TIME_TO_SEC gives a decimal with fractional seconds
+        (Decimal("110075.000000"), "30:34:35"),
+        (3723, "01:02:03"),
+        (None, None),
+    ]
+)
+def test_Result_from_stored(seconds: Decimal | int | None, expected_time: str | None):
+    row = dict(
+        runner_id=2,
+        event_id=1,
+        status="finisher",
+        time=seconds,
+        license=None,
+        category="SEH",
+        scratch_ranking=23,
+        gender_ranking=None,
+        category_ranking=13,
+    )
+    assert orm.Result.from_stored(row) == dict(row, time=expected_time)
+
+
+def test_Result_stored_columns():
+    stmt = select(*orm.Result.stored_columns())
+    sql = str(stmt.compile()).lower()
+    assert "time_to_sec(results.time) as time" in sql
+    assert [c.name for c in stmt.selected_columns] == [
+        c.name for c in orm.Result.__table__.columns if c.name != "time"] + ["time"]
 
 
 @pytest.mark.parametrize(
@@ -186,3 +261,15 @@ def test_Result(result: models.Result, expected: dict):
 def test_Runner(runner: models.Runner, expected: dict):
     res = orm.Runner.from_model(runner)
     assert res == expected
+    batch = models.ResultsBatch.from_records([
+        models.ResultRecord(
+            first_name=runner.first_name,
+            last_name=runner.last_name,
+            gender=runner.gender,
+            birth_year=runner.birth_year,
+            status=models.ResultStatus.UNKNOWN,
+            race_number=1,
+            category="SEH",
+        )
+    ])
+    assert orm.Runner.from_batch(batch) == [expected]
@@ -0,0 +1,22 @@
+from collector.database.mysql.pool import PoolMetrics
+
+
+def test_PoolMetrics():
+    metrics = PoolMetrics(capacity=10)
+    assert metrics.utilization == 0.
+    assert metrics.peak_utilization == 0.
+
+    for in_use in [2, 4, 9]:
+        metrics.sample(in_use)
+
+    assert metrics.samples == 3
+    assert metrics.utilization == 0.5
+    assert metrics.peak_in_use == 9
+    assert metrics.peak_utilization == 0.9
+
+
+def test_PoolMetrics_no_capacity():
+    metrics = PoolMetrics(capacity=0)
+    metrics.sample(1)
+    assert metrics.utilization == 0.
+    assert metrics.peak_utilization == 0.
@@ -0,0 +1,32 @@
+from collector.matching import assign
+
+
+def test_assign():
+    assert assign([
+        [(1, 0.9), (2, 0.95)],
+        [(2, 0.99)],
+        [(1, 0.92), (3, 0.9)],
+        [],
+    ]) == [
+        # 2 goes to the better match, then 1 too
+        (None, 0.),
+        (2, 0.99),
+        (1, 0.92),
+        (None, 0.),
+    ]
+
+
+def test_assign_fallback():
+    # the second best competition is assigned when the best one is taken
+    assert assign([[(1, 0.9), (2, 0.88)], [(1, 0.95)]]) == [(2, 0.88), (1, 0.95)]
+
+
+def test_assign_ties():
+    """The ties go to the first metadata, then to its first candidate."""
+    assert assign([[(1, 0.9)], [(1, 0.9)]]) == [(1, 0.9), (None, 0.)]
+    assert assign([[(2, 0.9), (1, 0.9)], [(1, 0.9), (2, 0.9)]]) == [
+        (2, 0.9), (1, 0.9)]
+
+
+def test_assign_empty():
+    assert assign([]) == []
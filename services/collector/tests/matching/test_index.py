@@ -0,0 +1,90 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from collector import models
+from collector.matching import CompetitionIndex
+
+events = [
+    "Trail de l'Eden",
+    "Trail de l'Eden en relais",
+    "Trail des griffes du diable",
+    "Trail de la Griffe du Diable",
+    "Cross du Piton des Neiges",
+    "Boucle du Piton des Neiges",
+    "D-Tour 45 et 70 km",
+    "Le D'TOUR",
+    "Tangue",
+    "Course Tangue 2024",
+    "course autour du lac",
+]
+
+
+def random_metadata(rand: random.Random) -> models.CompetitionMetaData:
+    return models.CompetitionMetaData(
+        event=rand.choice(events),
+        date=models.Date(start=date(2024, 7, 1) + timedelta(days=rand.randint(0, 3))),
+        distance=rand.choice([10, 21.1, 23, 24, 25.5, 42.195]),
+        positive_elevation=rand.choice([None, 900, 1000, 1500]),
+        negative_elevation=rand.choice([None, 900, 1000]),
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("similarity_threshold", [0., 0.5, 0.85])
+def test_find_best_match(seed: int, similarity_threshold: float):
+    """The index should give the same result as a full scan."""
+    rand = random.Random(seed)
+    all_competitions = {i: random_metadata(rand) for i in range(100)}
+    index = CompetitionIndex(all_competitions, similarity_threshold=similarity_threshold)
+
+    for _ in range(20):
+        metadata = random_metadata(rand)
+        expected = metadata.find_best_match(
+            all_competitions, similarity_threshold=similarity_threshold)
+        comp_id = index.find_best_match(metadata)
+        assert comp_id == expected
+
+
+def test_blocking():
+    all_competitions = {
+        1: models.CompetitionMetaData(
+            event="Trail de l'Eden", date=models.Date(start=date(2024, 7, 1)), distance=23),
+        # another day
+        2: models.CompetitionMetaData(
+            event="Trail de l'Eden", date=models.Date(start=date(2024, 7, 2)), distance=23),
+        # too far
+        3: models.CompetitionMetaData(
+            event="Trail de l'Eden", date=models.Date(start=date(2024, 7, 1)), distance=28),
+        # no common characters
+        4: models.CompetitionMetaData(
+            event="xyz", date=models.Date(start=date(2024, 7, 1)), distance=23),
+        # close enough
+        5: models.CompetitionMetaData(
+            event="Trail de l'Eden en relais", date=models.Date(start=date(2024, 7, 1)),
+            distance=22),
+        0: models.CompetitionMetaData(
+            event="Trail de l'Eden", date=models.Date(start=date(2024, 7, 1)), distance=24),
+    }
+    index = CompetitionIndex(all_competitions)
+    metadata = models.CompetitionMetaData(
+        event="Trail de l'Eden", date=models.Date(start=date(2024, 7, 1)), distance=23.5)
+
+    # 2 (date), 3 (distance) and 4 (characters) are blocked
+    assert [comp_id for comp_id, _ in index.matches(metadata)] == [1, 5, 0]
+    assert index.stats.compared == 6
+    assert index.stats.pruned["blocking"] == 3
+
+
+def test_find_best_match_stats():
+    rand = random.Random(0)
+    all_competitions = {i: random_metadata(rand) for i in range(100)}
+    index = CompetitionIndex(all_competitions)
+
+    for _ in range(10):
+        index.find_best_match(random_metadata(rand))
+
+    assert index.stats.compared == 10 * 100
+    assert index.stats.pruned["blocking"] > 0
+    assert index.stats.names_compared < 10 * 100
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from collector import utils
+from collector.matching import names
+
+events = [
+    "Trail de l'Eden",
+    "Trail des griffes du diable",
+    "Cross du Piton des Neiges",
+    "D-Tour 45 et 70 km",
+    "Le D'TOUR",
+    "Tangue",
+    "Course Tangue 2024",
+    "",
+]
+
+
+@pytest.mark.parametrize(
+    "name,expected",
+    [
+        ("Trail de l'Eden", "trail de l'eden"),
+        ("  Grand   Raid\tRéunion ", "grand raid reunion"),
+        ("Écotrail DU Piton", "ecotrail du piton"),
+        ("", ""),
+    ]
+)
+def test_normalize(name: str, expected: str):
+    assert names.normalize(name) == expected
+
+
+def test_NormalizedName():
+    name = names.NormalizedName.from_name("Boucle  du Piton")
+    assert name.text == "boucle du piton"
+    assert name.words == ["boucle", "du", "piton"]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_NameMatcher_similarity(seed: int):
+    """Without accents, the matcher gives the same scores as `sentence_similarity`."""
+    rand = random.Random(seed)
+    matcher = names.NameMatcher(events)
+    for _ in range(50):
+        s1, s2 = rand.choice(events), rand.choice(events)
+        assert matcher.similarity(s1, s2) == pytest.approx(
+            utils.sentence_similarity(s1, s2))
+
+
+def test_NameMatcher_accents():
+    matcher = names.NameMatcher()
+    assert matcher.similarity("Trail de la Réunion", "trail de la reunion") == 1.
+
+
+def test_NameMatcher_cache():
+    matcher = names.NameMatcher(events)
+    matcher.similarity("Tangue", "Course Tangue 2024")
+    # symmetrical: the same score is reused
+    matcher.similarity("Course Tangue 2024", "Tangue")
+    assert (matcher.hits, matcher.misses) == (1, 1)
+    assert len(matcher) == 1
+
+
+def test_NameMatcher_eviction():
+    matcher = names.NameMatcher(max_size=2)
+    matcher.similarity("a", "b")
+    matcher.similarity("a", "c")
+    # "a", "b" is now the most recently used
+    matcher.similarity("a", "b")
+    matcher.similarity("a", "d")
+    assert len(matcher) == 2
+    matcher.similarity("a", "c")
+    assert (matcher.hits, matcher.misses) == (1, 4)
+
+
+def test_NameMatcher_no_cache():
+    matcher = names.NameMatcher(max_size=0)
+    matcher.similarity("a", "b")
+    matcher.similarity("a", "b")
+    assert len(matcher) == 0
+    assert matcher.misses == 2
+
+
+def test_NameMatcher_names_bounded():
+    matcher = names.NameMatcher(events, max_size=2)
+    # only the most recently used names are kept
+    assert len(matcher._names) == 2
+    assert list(matcher._names) == events[-2:]
+    assert matcher.normalized("Tangue").text == "tangue"
+    assert list(matcher._names) == ["", "Tangue"]
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from collector.matching import CompetitionIndex, ParallelMatcher, assign
+
+from tests.matching.test_index import random_metadata
+
+
+@pytest.fixture()
+def competitions():
+    rand = random.Random(0)
+    return {i: random_metadata(rand) for i in range(100)}
+
+
+@pytest.fixture()
+def metadata():
+    rand = random.Random(1)
+    return [random_metadata(rand) for _ in range(30)]
+
+
+class TestParallelMatcher:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("max_workers", [0, 2])
+    async def test_assign(self, competitions, metadata, max_workers: int):
+        """Each competition is assigned once, the same way as in a serial run."""
+        index = CompetitionIndex(competitions, similarity_threshold=0.5)
+        candidates = [index.matches(m) for m in metadata]
+
+        matcher = ParallelMatcher(
+            competitions, similarity_threshold=0.5, max_workers=max_workers)
+        async with matcher:
+            matches = await matcher.assign(metadata)
+        expected = [(m, *match) for m, match in zip(metadata, assign(candidates))]
+
+        assert matches == expected
+        comp_ids = [comp_id for _, comp_id, _ in matches if comp_id is not None]
+        assert comp_ids
+        assert len(comp_ids) == len(set(comp_ids))
+        # the statistics of all workers are gathered
+        assert matcher.stats == index.stats
+        assert matcher.names_hits + matcher.names_misses == index.stats.names_compared
+
+    @pytest.mark.asyncio
+    async def test_assign_empty(self, competitions):
+        async with ParallelMatcher(competitions, max_workers=2) as matcher:
+            assert await matcher.assign([]) == []
+
+    @pytest.mark.asyncio
+    async def test_not_entered(self, competitions, metadata):
+        with pytest.raises(RuntimeError):
+            await ParallelMatcher(competitions).assign(metadata)
+
+    def test_from_env(self, competitions, monkeypatch):
+        monkeypatch.setenv("MATCH_WORKERS", "3")
+        assert ParallelMatcher.from_env(competitions).max_workers == 3
+        monkeypatch.delenv("MATCH_WORKERS")
+        assert ParallelMatcher.from_env(competitions).max_workers == 0
@@ -1,5 +1,5 @@
 import os
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import Mock
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -38,13 +38,10 @@ def mock_http_client():
 
 
 class TestRunRaidScraper:
-    @patch("collector.scrapers.runraid.main.limiter.__aenter__", AsyncMock())
-    @patch("collector.scrapers.runraid.main.limiter.__aexit__", AsyncMock())
     @pytest.mark.asyncio
     async def test_scrap(self, mock_http_client):
-        scraper = RunRaidScraper()
-        with patch("collector.scrapers.runraid.main.client", mock_http_client):
-            competitions = [c async for c in scraper.scrap()]
+        scraper = RunRaidScraper(mock_http_client)
+        competitions = [c async for c in scraper.scrap()]
         assert len(competitions) == 258
 
         # check if some competitions are in
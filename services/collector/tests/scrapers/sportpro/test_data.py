@@ -291,3 +291,24 @@ def test_ResultRow(
         assert r.is_valid() == is_valid
         m = r.to_model()
         assert m == model
+        assert r.to_record() == models.ResultRecord.from_model(model)
+
+
+@pytest.mark.parametrize(
+    "update",
+    [
+        {"race_number": "A12"},
+        {"gender": "X"},
+        {"scratch": "DNF"},
+        {"sex_ranking": None},
+    ]
+)
+def test_ResultRow_to_record_invalid(update: dict):
+    r = data.ResultRow(
+        license="", category="SEH", race_number="12", first_name="Jean",
+        last_name="DUPONT", gender="M", scratch=1, sex_ranking=1,
+        category_ranking=1)
+    for name, value in update.items():
+        setattr(r, name, value)
+    with pytest.raises((ValueError, TypeError)):
+        r.to_record()
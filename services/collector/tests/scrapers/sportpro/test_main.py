@@ -1,10 +1,12 @@
+import asyncio
 import os
 from pathlib import Path
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import Mock
 from urllib.parse import urlparse
 
 import pytest
 
+from collector.scrapers.executor import PROCESS, ParseExecutor
 from collector.scrapers.sportpro import SportproScraper
 
 curr_dir = os.path.dirname(os.path.realpath(__file__))
@@ -39,17 +41,15 @@ def mock_http_client():
                 raise ValueError(f"url={url} not supported for testing")
 
     client.get = get
+    client.cache = None
     return client
 
 
 class TestSportproScraper:
-    @patch("collector.scrapers.sportpro.main.limiter.__aenter__", AsyncMock())
-    @patch("collector.scrapers.sportpro.main.limiter.__aexit__", AsyncMock())
     @pytest.mark.asyncio
     async def test_scrap(self, mock_http_client):
-        scraper = SportproScraper()
-        with patch("collector.scrapers.sportpro.main.client", mock_http_client):
-            competitions = list([c async for c in scraper.scrap()])
+        scraper = SportproScraper(mock_http_client)
+        competitions = list([c async for c in scraper.scrap()])
         assert len(competitions) == 2, f"errors={scraper._errors}"
         assert len(scraper._errors) == 2
 
@@ -60,5 +60,99 @@ class TestSportproScraper:
         # check tangue results
         tangue = [c for c in competitions if c.event == "Tangue"][0]
         assert len(tangue.results) == 544 + 192
-        assert len([r for r in tangue.results if r.rank is not None]) == 544
-        assert len([r for r in tangue.results if r.rank is None]) == 192
+        assert len([r for r in tangue.results if r.ranked]) == 544
+        assert len([r for r in tangue.results if not r.ranked]) == 192
+
+    @pytest.mark.asyncio
+    async def test_scrap_process_executor(self, mock_http_client):
+        """Pages parsed in worker processes give the same competitions."""
+        async with ParseExecutor(kind=PROCESS, max_workers=2) as executor:
+            scraper = SportproScraper(mock_http_client, executor)
+            competitions = {c.event: c async for c in scraper.scrap()}
+        expected = {c.event: c async for c in SportproScraper(mock_http_client).scrap()}
+        assert competitions == expected
+        assert len(competitions["Tangue"].results) == 544 + 192
+
+    @pytest.mark.asyncio
+    async def test_scrap_skip(self, mock_http_client):
+        """Competitions already ingested are not scraped again."""
+        requested = []
+        get = mock_http_client.get
+
+        async def spy_get(url: str):
+            requested.append(url)
+            return await get(url)
+
+        mock_http_client.get = spy_get
+        scraper = SportproScraper(mock_http_client)
+        all_keys = [c.key async for c in scraper.scrap()]
+        requested.clear()
+        tangue = next(key for key in all_keys if key[1] == "Tangue")
+        events = [c.event async for c in scraper.scrap(skip={tangue})]
+        assert events == ["Transvolcano Version Longue"]
+        assert not any("tangue" in url for url in requested)
+
+    @pytest.mark.asyncio
+    async def test_scrap_not_modified(self, mock_http_client):
+        """Stored competitions whose results page didn't change are not parsed."""
+        async def get_if_modified(url: str):
+            return None
+
+        mock_http_client.get_if_modified = get_if_modified
+        scraper = SportproScraper(mock_http_client)
+        all_keys = [c.key async for c in scraper.scrap()]
+        tangue = next(key for key in all_keys if key[1] == "Tangue")
+
+        parsed = []
+        parse = scraper.parse
+
+        async def spy_parse(page):
+            parsed.append(page.competition.event)
+            return await parse(page)
+
+        scraper.parse = spy_parse
+        events = [c.event async for c in scraper.scrap(stored={tangue})]
+        # a not modified page, never stored, is still parsed
+        assert events == ["Transvolcano Version Longue"]
+        assert "Tangue" not in parsed
+        assert parsed == events
+
+    @pytest.mark.asyncio
+    async def test_scrap_completion_order(self, mock_http_client):
+        """Competitions are yielded as soon as their results are scraped."""
+        get = mock_http_client.get
+
+        async def slow_get(url: str):
+            if "transvolcano" in url:
+                await asyncio.sleep(0.05)
+            return await get(url)
+
+        mock_http_client.get = slow_get
+        scraper = SportproScraper(mock_http_client)
+        events = [c.event async for c in scraper.scrap()]
+        assert events == ["Tangue", "Transvolcano Version Longue"]
+
+    @pytest.mark.asyncio
+    async def test_scrap_stopped(self, mock_http_client):
+        """The remaining scraping tasks are cancelled when the iteration stops."""
+        get = mock_http_client.get
+        cancelled = []
+
+        async def slow_get(url: str):
+            if "transvolcano" in url:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(url)
+                    raise
+            return await get(url)
+
+        mock_http_client.get = slow_get
+        scraper = SportproScraper(mock_http_client)
+        competitions = scraper.scrap()
+        competition = await anext(competitions)
+        await competitions.aclose()
+        await asyncio.sleep(0)
+        assert competition.event == "Tangue"
+        # both transvolcano competitions were still being scraped
+        assert len(cancelled) == 2
@@ -0,0 +1,62 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from collector.scrapers.sportpro import parser
+
+curr_dir = os.path.dirname(os.path.realpath(__file__))
+
+
+def read_data_file(name: str) -> bytes:
+    with open(Path(curr_dir, 'data', name), 'rb') as f:
+        return f.read()
+
+
+html = """
+<html><body>
+<table id="other"><tr class="header"><th>A</th></tr><tr><td>other</td></tr></table>
+<table id="resList">
+  <tr class="header toHide"><th>Date</th><th>Infos</th><th>Ville</th><th>Résultats</th></tr>
+  <tr><td>07/04/2024</td><td colspan="2"><p>10 km<br/>Saint-Denis</p></td><td><a href="/r/1/">go</a></td></tr>
+  <tr><td>08/04/2024</td><td>5 km</td><td>Saint-Paul</td><td>N/D</td></tr>
+  <tr class="header"><th>Nom</th></tr>
+  <tr><td>DUPONT</td><td>too many</td></tr>
+</table>
+<table id="resList"><tr class="header"><th>A</th></tr><tr><td>second</td></tr></table>
+</body></html>
+"""
+
+
+@pytest.mark.parametrize("page", [html, html.encode()])
+def test_iter_table_rows(page: str | bytes):
+    assert list(parser.iter_table_rows(page)) == [
+        # colspan skips the next header
+        {"Date": "07/04/2024", "Infos": "10 kmSaint-Denis", "Résultats": "/r/1/"},
+        # the results column without link is dropped
+        {"Date": "08/04/2024", "Infos": "5 km", "Ville": "Saint-Paul"},
+        # new headers
+        {"Nom": "DUPONT"},
+    ]
+
+
+def test_iter_table_rows_id():
+    assert list(parser.iter_table_rows(html, table_id="other")) == [{"A": "other"}]
+
+
+def test_iter_table_rows_not_found():
+    with pytest.raises(ValueError):
+        list(parser.iter_table_rows(html, table_id="unknown"))
+
+
+@pytest.mark.parametrize(
+    "name,nb_rows",
+    [
+        ("resultats.html.test", 5),
+        ("tangue.html.test", 736),
+        ("transvolcano-longue.html.test", 336),
+    ]
+)
+def test_iter_table_rows_pages(name: str, nb_rows: int):
+    rows = list(parser.iter_table_rows(read_data_file(name)))
+    assert len(rows) == nb_rows
@@ -0,0 +1,70 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from collector.scrapers import executor
+
+
+def blocking_parse(seconds: float) -> int:
+    time.sleep(seconds)
+    return threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_ParseExecutor_inline():
+    async with executor.ParseExecutor(kind=executor.INLINE) as parse_executor:
+        assert await parse_executor.run(blocking_parse, 0) == threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_ParseExecutor_not_entered():
+    parse_executor = executor.ParseExecutor()
+    assert await parse_executor.run(blocking_parse, 0) == threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_ParseExecutor_thread():
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(tick())
+    async with executor.ParseExecutor(kind=executor.THREAD, max_workers=2) as parse_executor:
+        ident = await parse_executor.run(blocking_parse, 0.1)
+    task.cancel()
+    assert ident != threading.get_ident()
+    # the event loop kept running while parsing
+    assert ticks >= 5
+    assert parse_executor._executor is None
+
+
+@pytest.mark.asyncio
+async def test_ParseExecutor_process():
+    async with executor.ParseExecutor(kind=executor.PROCESS, max_workers=1) as parse_executor:
+        assert await parse_executor.run(os.getpid) != os.getpid()
+
+
+def test_ParseExecutor_unknown_kind():
+    with pytest.raises(ValueError):
+        executor.ParseExecutor(kind="unknown")
+
+
+def test_ParseExecutor_from_env(monkeypatch):
+    monkeypatch.delenv("PARSE_EXECUTOR", raising=False)
+    monkeypatch.delenv("PARSE_WORKERS", raising=False)
+    parse_executor = executor.ParseExecutor.from_env()
+    assert parse_executor.kind == executor.PROCESS
+    assert parse_executor.max_workers is None
+
+    monkeypatch.setenv("PARSE_EXECUTOR", "thread")
+    monkeypatch.setenv("PARSE_WORKERS", "3")
+    parse_executor = executor.ParseExecutor.from_env()
+    assert parse_executor.kind == executor.THREAD
+    assert parse_executor.max_workers == 3
@@ -1,3 +1,5 @@
+from unittest.mock import Mock
+
 import pytest
 
 from collector.scrapers import MetadataScraper, ResultsScraper, \
@@ -8,46 +10,50 @@ from collector.scrapers.sportpro import SportproScraper
 
 def is_equal(
         res: list[MetadataScraper | ResultsScraper],
-        expected: list[MetadataScraper | ResultsScraper]
+        expected: list[type[MetadataScraper | ResultsScraper]],
+        client: Mock
 ):
     assert len(res) == len(expected)
     for i in range(len(res)):
-        assert isinstance(res[i], expected[i].__class__)
+        assert isinstance(res[i], expected[i])
+        assert res[i]._client is client
 
 
 @pytest.mark.parametrize(
     "scrapers_,expected",
     [
-        (None, [RunRaidScraper()]),
-        (['runraid'], [RunRaidScraper()]),
+        (None, [RunRaidScraper]),
+        (['runraid'], [RunRaidScraper]),
     ]
 )
 def test_discover_metadata_scrapers(
         scrapers_: list[str] | None,
-        expected: list[MetadataScraper] | Exception):
-    res = list(discover_metadata_scrapers(scrapers=scrapers_))
-    is_equal(res, expected)
+        expected: list[type[MetadataScraper]]):
+    client = Mock()
+    res = list(discover_metadata_scrapers(client, scrapers=scrapers_))
+    is_equal(res, expected, client)
 
 
 def test_discover_metadata_scrapers_error():
     with pytest.raises(KeyError):
-        discover_metadata_scrapers(scrapers=["unknown"])
+        discover_metadata_scrapers(Mock(), scrapers=["unknown"])
 
 
 @pytest.mark.parametrize(
     "scrapers_,expected",
     [
-        (None, [SportproScraper()]),
-        (['sportpro'], [SportproScraper()]),
+        (None, [SportproScraper]),
+        (['sportpro'], [SportproScraper]),
     ]
 )
 def test_discover_timekeepers(
         scrapers_: list[str] | None,
-        expected: list[ResultsScraper] | Exception):
-    res = list(discover_timekeepers(scrapers=scrapers_))
-    is_equal(res, expected)
+        expected: list[type[ResultsScraper]]):
+    client = Mock()
+    res = list(discover_timekeepers(client, scrapers=scrapers_))
+    is_equal(res, expected, client)
 
 
 def test_discover_timekeepers_scrapers_error():
     with pytest.raises(KeyError):
-        discover_timekeepers(scrapers=["unknown"])
+        discover_timekeepers(Mock(), scrapers=["unknown"])
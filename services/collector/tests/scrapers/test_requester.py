@@ -1,10 +1,14 @@
 import asyncio
 from collections.abc import Callable
+from datetime import datetime, timedelta, UTC
+from email.utils import format_datetime
 from contextlib import asynccontextmanager
 from unittest.mock import patch, Mock, AsyncMock
 
 import aiohttp
 import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 
 from collector.scrapers import requester
 
@@ -13,8 +17,13 @@ from collector.scrapers import requester
 def mock_session() -> Callable[[int, str | Exception], Mock]:
     """Mock an aiohttp session object."""
 
-    def get_session(status: int, expected: str | Exception) -> Mock:
+    def get_session(
+            status: int,
+            expected: str | Exception,
+            headers: dict[str, str] | None = None
+    ) -> Mock:
         _session = Mock()
+        _session.close = AsyncMock()
         _session.nb_get_calls = 0
 
         @asynccontextmanager
@@ -22,6 +31,7 @@ def mock_session() -> Callable[[int, str | Exception], Mock]:
             _session.nb_get_calls += 1
             res = Mock()
             res.status = status
+            res.headers = headers or {}
             res.raise_for_status.side_effect = (
                 aiohttp.ClientError() if isinstance(expected, Exception) else
                 expected
@@ -56,65 +66,413 @@ class TestHTTPClient:
         url = "http://example.com"
 
         with patch("aiohttp.ClientSession", return_value=session):
-            client = requester.HTTPClient()
-            if isinstance(expected, requester.HTTPError):
-                with pytest.raises(expected.__class__) as exc:
-                    await client.get(url)
-                assert exc.type is requester.HTTPError
-            else:
-                assert await client.get(url) == expected
-            assert session.nb_get_calls == nb_get_calls
+            async with requester.HTTPClient(retry_policy=requester.RetryPolicy(backoff=0.001)) as client:
+                if isinstance(expected, requester.HTTPError):
+                    with pytest.raises(expected.__class__) as exc:
+                        await client.get(url)
+                    assert exc.type is requester.HTTPError
+                else:
+                    assert await client.get(url) == expected
+                assert session.nb_get_calls == nb_get_calls
+
 
+    @staticmethod
+    def flaky_session(outcomes: list[int | BaseException]) -> Mock:
+        """Mock a session whose responses are the given statuses, or errors."""
+        _session = Mock()
+        _session.close = AsyncMock()
+        _session.nb_get_calls = 0
 
-class TestLimiter:
+        @asynccontextmanager
+        async def get(*args, **kwargs):
+            outcome = outcomes[min(_session.nb_get_calls, len(outcomes) - 1)]
+            _session.nb_get_calls += 1
+            if isinstance(outcome, BaseException):
+                raise outcome
+            res = Mock()
+            res.status = outcome
+            res.headers = {}
+            res.raise_for_status.side_effect = aiohttp.ClientError() if outcome >= 400 else None
+            res.read = AsyncMock(return_value=b"body")
+            yield res
+
+        _session.get = get
+        return _session
+
+    @pytest.mark.parametrize(
+        "outcomes,nb_get_calls",
+        [
+            ([aiohttp.ServerDisconnectedError(), asyncio.TimeoutError(), 200], 3),
+            ([503, 502, 504, 200], 4),
+            ([aiohttp.ClientPayloadError(), 200], 2),
+        ]
+    )
     @pytest.mark.asyncio
-    async def test_as_decorator(self):
-        limiter = requester.Limiter(3)
-        limiter.release_time = 0.01
-        counter = 0
+    async def test_get_retried(self, outcomes: list, nb_get_calls: int, caplog):
+        session = self.flaky_session(outcomes)
+        with patch("aiohttp.ClientSession", return_value=session), \
+                caplog.at_level("INFO", logger=requester.__name__):
+            async with requester.HTTPClient(retry_policy=requester.RetryPolicy(backoff=0.001)) as client:
+                assert await client.get("http://example.com") == b"body"
+        assert session.nb_get_calls == nb_get_calls
 
-        @limiter
-        async def count():
-            nonlocal counter
-            counter += 1
+        # retries are logged
+        retries = [r for r in caplog.records if r.msg.startswith("Retrying")]
+        assert [r.retry for r in retries] == list(range(1, nb_get_calls))
+        requests = [r for r in caplog.records if hasattr(r, "status_code")]
+        assert [r.retry for r in requests] == list(range(len(requests)))
 
-        for _ in range(5):
-            asyncio.ensure_future(count())
+    @pytest.mark.asyncio
+    async def test_get_retries_exhausted(self):
+        session = self.flaky_session([asyncio.TimeoutError()])
+        with patch("aiohttp.ClientSession", return_value=session):
+            async with requester.HTTPClient(
+                retry_policy=requester.RetryPolicy(max_retries=2, backoff=0.001)) as client:
+                with pytest.raises(requester.HTTPError) as exc:
+                    await client.get("http://example.com")
+        assert exc.value.status == -1
+        assert isinstance(exc.value.__cause__, asyncio.TimeoutError)
+        assert session.nb_get_calls == 3
+
+    @pytest.mark.parametrize(
+        "error,expected",
+        [
+            # not a connection error: not retried, but still an HTTP error
+            (aiohttp.InvalidURL("url"), requester.HTTPError),
+            # not an HTTP error at all
+            (ValueError(), ValueError),
+        ]
+    )
+    @pytest.mark.asyncio
+    async def test_get_not_retried(self, error: Exception, expected: type[Exception]):
+        session = self.flaky_session([error])
+        with patch("aiohttp.ClientSession", return_value=session):
+            async with requester.HTTPClient(retry_policy=requester.RetryPolicy(backoff=0.001)) as client:
+                with pytest.raises(expected):
+                    await client.get("http://example.com")
+        assert session.nb_get_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_get_deadline(self, caplog):
+        session = self.flaky_session([503])
+        policy = requester.RetryPolicy(backoff=0.02, jitter=0, deadline=0.05)
+        with patch("aiohttp.ClientSession", return_value=session), \
+                caplog.at_level("WARNING", logger=requester.__name__):
+            async with requester.HTTPClient(retry_policy=policy) as client:
+                with pytest.raises(requester.HTTPError):
+                    await client.get("http://example.com")
+        # 0.02s then 0.04s: the second retry would end after the deadline
+        assert session.nb_get_calls == 2
+        assert "deadline exceeded" in caplog.records[-1].reason
+
+    @pytest.mark.asyncio
+    async def test_get_budget(self):
+        session = self.flaky_session([503])
+        policy = requester.RetryPolicy(backoff=0.001, budget_min=1, budget_ratio=1)
+        with patch("aiohttp.ClientSession", return_value=session):
+            async with requester.HTTPClient(retry_policy=policy) as client:
+                with pytest.raises(requester.HTTPError):
+                    await client.get("http://example.com/1")
+                # 1 + 1 retries allowed: the first request retried 2 times
+                assert session.nb_get_calls == 3
+                with pytest.raises(requester.HTTPError):
+                    await client.get("http://example.com/2")
+                # 1 + 2 retries allowed: the second request retried once
+                assert session.nb_get_calls == 5
+                # other hosts have their own budget
+                with pytest.raises(requester.HTTPError):
+                    await client.get("http://other.com/1")
+                assert session.nb_get_calls == 8
 
-        # 3 first calls are immediate
-        await asyncio.sleep(0)
-        assert counter == 3
 
-        # locks not released yet: not more counter added
-        await asyncio.sleep(limiter.release_time * 9 / 10)
-        assert counter == 3
+def test_RetryPolicy_delay():
+    policy = requester.RetryPolicy(backoff=1, max_backoff=5, jitter=0)
+    assert [policy.delay(i) for i in range(4)] == [1, 2, 4, 5]
+    # the server knows better
+    assert policy.delay(3, retry_after=12) == 12
 
-        # locks released
-        await asyncio.sleep(limiter.release_time * 2 / 10)
-        assert counter == 5
+    policy = requester.RetryPolicy(backoff=1, max_backoff=5, jitter=0.5)
+    delays = [policy.delay(2) for _ in range(100)]
+    assert all(2 <= d <= 4 for d in delays)
+    assert len(set(delays)) > 1
 
+
+@pytest.fixture
+def server_session() -> Mock:
+    """Mock a session to a server supporting conditional requests."""
+    _session = Mock()
+    _session.close = AsyncMock()
+    _session.etag = '"v1"'
+    _session.body = b"body-v1"
+    _session.requests = []
+
+    @asynccontextmanager
+    async def get(url: str, params=None, headers=None):
+        headers = headers or {}
+        _session.requests.append(headers)
+        res = Mock()
+        res.raise_for_status.return_value = None
+        if headers.get("If-None-Match") == _session.etag:
+            res.status = 304
+            res.headers = {}
+            res.read = AsyncMock(return_value=b"")
+        else:
+            res.status = 200
+            res.headers = {"ETag": _session.etag, "Last-Modified": "Sun, 18 Oct 2026 10:00:00 GMT"}
+            res.read = AsyncMock(return_value=_session.body)
+        yield res
+
+    _session.get = get
+    return _session
+
+
+class TestHTTPCache:
     @pytest.mark.asyncio
-    async def test_as_context_manager(self):
-        limiter = requester.Limiter(3)
-        limiter.release_time = 0.01
-        counter = 0
+    async def test_revalidation(self, tmp_path, server_session):
+        url = "http://example.com/results"
+        with patch("aiohttp.ClientSession", return_value=server_session):
+            async with requester.HTTPClient(cache=requester.HTTPCache(tmp_path)) as client:
+                assert await client.get_if_modified(url) == b"body-v1"
+                # not modified: a conditional request, but no body
+                assert await client.get_if_modified(url) is None
+                assert await client.get(url) == b"body-v1"
+                # modified
+                server_session.etag, server_session.body = '"v2"', b"body-v2"
+                assert await client.get_if_modified(url) == b"body-v2"
+                assert await client.get(url) == b"body-v2"
 
-        async def count():
-            nonlocal counter
-            async with limiter:
-                counter += 1
+        assert server_session.requests[0] == {}
+        assert server_session.requests[1] == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Sun, 18 Oct 2026 10:00:00 GMT"
+        }
+        cache = client.cache
+        assert (cache.hits, cache.revalidated, cache.misses) == (0, 3, 2)
 
-        for _ in range(5):
-            asyncio.ensure_future(count())
+    @pytest.mark.asyncio
+    async def test_ttl(self, tmp_path, server_session):
+        cache = requester.HTTPCache(tmp_path, ttls=[("/resultats/$", 60.)])
+        with patch("aiohttp.ClientSession", return_value=server_session):
+            async with requester.HTTPClient(cache=cache) as client:
+                for _ in range(3):
+                    assert await client.get("http://example.com/resultats/") == b"body-v1"
+                    assert await client.get("http://example.com/resultats/1/") == b"body-v1"
+        # the fresh page is requested once only, the other one is revalidated
+        assert len(server_session.requests) == 4
+        assert (cache.hits, cache.revalidated, cache.misses) == (2, 2, 2)
 
-        # 3 first calls are immediate
+    @pytest.mark.asyncio
+    async def test_persistence(self, tmp_path, server_session):
+        url = "http://example.com/results"
+        with patch("aiohttp.ClientSession", return_value=server_session):
+            async with requester.HTTPClient(cache=requester.HTTPCache(tmp_path)) as client:
+                await client.get(url, params={"a": "1", "b": "2"})
+            # another process, with the same cache directory
+            async with requester.HTTPClient(cache=requester.HTTPCache(tmp_path)) as client:
+                assert await client.get_if_modified(url, params={"b": "2", "a": "1"}) is None
+                assert await client.get_if_modified(url) == b"body-v1"
+        assert len(list(tmp_path.iterdir())) == 4
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("metadata", ["{", "[]", '{"unknown": 1}', "{}"])
+    async def test_lookup_corrupted(self, tmp_path, metadata: str):
+        cache = requester.HTTPCache(tmp_path)
+        entry = await cache.store("http://example.com", None, b"body", {"ETag": "1"})
+        assert (await cache.lookup("http://example.com")).etag == "1"
+        (tmp_path / f"{entry.key}.json").write_text(metadata)
+        assert await cache.lookup("http://example.com") is None
+
+    @pytest.mark.asyncio
+    async def test_store_replace(self, tmp_path):
+        cache = requester.HTTPCache(tmp_path)
+        await cache.store("http://example.com", None, b"body-v1", {"ETag": "1"})
+        await cache.store("http://example.com", None, b"body-v2", {"ETag": "2"})
+        entry = await cache.lookup("http://example.com")
+        assert (entry.body, entry.etag) == (b"body-v2", "2")
+        # no temporary file left
+        assert len(list(tmp_path.iterdir())) == 2
+
+    def test_from_env(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("HTTP_CACHE_DIR", raising=False)
+        assert requester.HTTPCache.from_env() is None
+
+        monkeypatch.setenv("HTTP_CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.setenv("HTTP_CACHE_TTLS", "/resultats/$=3600, a=b=10")
+        monkeypatch.setenv("HTTP_CACHE_DEFAULT_TTL", "5")
+        cache = requester.HTTPCache.from_env()
+        assert (tmp_path / "cache").is_dir()
+        assert cache.ttl("http://example.com/resultats/") == 3600
+        assert cache.ttl("http://example.com/a=b") == 10
+        assert cache.ttl("http://example.com/other") == 5
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (None, None),
+        ("", None),
+        ("12", 12.),
+        ("-3", 0.),
+        ("not a date", None),
+        (format_datetime(datetime(2000, 1, 1, tzinfo=UTC), usegmt=True), 0.),
+    ]
+)
+def test_parse_retry_after(value: str | None, expected: float | None):
+    assert requester.parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_date():
+    date = datetime.now(tz=UTC) + timedelta(seconds=30)
+    retry_after = requester.parse_retry_after(format_datetime(date, usegmt=True))
+    assert 28 <= retry_after <= 30
+
+
+class TestTokenBucketLimiter:
+    url = "http://example.com/page"
+
+    @pytest.mark.asyncio
+    async def test_rate(self):
+        limiter = requester.TokenBucketLimiter(rate=40)
+        waits = await asyncio.gather(*[limiter.acquire(self.url) for _ in range(5)])
+        # one request every 25ms
+        assert waits == pytest.approx([0, 0.025, 0.05, 0.075, 0.1], abs=0.01)
+
+        metrics = limiter.metrics["example.com"]
+        assert metrics.requests == 5
+        assert metrics.max_wait == pytest.approx(0.1, abs=0.01)
+        assert metrics.mean_wait == pytest.approx(0.05, abs=0.01)
+        assert metrics.rate == 40
+
+    @pytest.mark.asyncio
+    async def test_burst(self):
+        limiter = requester.TokenBucketLimiter(rate=20, burst=3)
+        waits = await asyncio.gather(*[limiter.acquire(self.url) for _ in range(4)])
+        assert waits == pytest.approx([0, 0, 0, 0.05], abs=0.01)
+
+        # the bucket is refilled after some inactivity
+        await asyncio.sleep(0.15)
+        waits = await asyncio.gather(*[limiter.acquire(self.url) for _ in range(3)])
+        assert waits == pytest.approx([0, 0, 0], abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_hosts(self):
+        limiter = requester.TokenBucketLimiter(rate=10)
+        waits = await asyncio.gather(
+            limiter.acquire("http://a.com/1"),
+            limiter.acquire("http://b.com/1"),
+            limiter.acquire("http://a.com/2"),
+        )
+        # hosts are limited independently
+        assert waits == pytest.approx([0, 0, 0.1], abs=0.01)
+        assert set(limiter.metrics) == {"a.com", "b.com"}
+
+    @pytest.mark.asyncio
+    async def test_throttle_retry_after(self):
+        limiter = requester.TokenBucketLimiter(rate=100)
+        await limiter.acquire(self.url)
+        limiter.throttle(self.url, retry_after=0.05)
+
+        # blocked during retry_after, then at half rate
+        waits = await asyncio.gather(*[limiter.acquire(self.url) for _ in range(2)])
+        assert waits == pytest.approx([0.05, 0.07], abs=0.01)
+        metrics = limiter.metrics["example.com"]
+        assert metrics.throttled == 1
+        assert metrics.rate == 50
+
+        # successful responses increase the rate back
+        for _ in range(10):
+            limiter.succeed(self.url)
+        assert metrics.rate == 100
+
+    @pytest.mark.asyncio
+    async def test_throttle_backoff(self):
+        limiter = requester.TokenBucketLimiter(rate=1000, min_rate=200, backoff=0.01)
+        for expected in [0.01, 0.02, 0.04]:
+            limiter.throttle(self.url)
+            assert await limiter.acquire(self.url) == pytest.approx(expected, abs=0.01)
+        # the rate can't go lower than min_rate
+        assert limiter.metrics["example.com"].rate == 200
+
+        # the backoff is reset after a success
+        limiter.succeed(self.url)
+        limiter.throttle(self.url)
+        assert await limiter.acquire(self.url) == pytest.approx(0.01, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_throttle_scheduled_requests(self):
+        """The requests already waiting are delayed by a block."""
+        limiter = requester.TokenBucketLimiter(rate=100)
+        tasks = [asyncio.ensure_future(limiter.acquire(self.url)) for _ in range(3)]
         await asyncio.sleep(0)
-        assert counter == 3
+        limiter.throttle(self.url, retry_after=0.05)
+        waits = await asyncio.gather(*tasks)
+        assert waits[0] == pytest.approx(0, abs=0.01)
+        assert waits[1:] == pytest.approx([0.05, 0.07], abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_http_client(self, mock_session):
+        limiter = requester.TokenBucketLimiter(rate=1000)
+        session = mock_session(429, requester.HTTPError(status=429), {"Retry-After": "0.01"})
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        with patch("aiohttp.ClientSession", return_value=session):
+            async with requester.HTTPClient(limiter=limiter) as client:
+                with pytest.raises(requester.HTTPError) as exc:
+                    await client.get(self.url)
+        assert exc.value.retry_after == 0.01
+
+        # every retry waited for the Retry-After delay: partly in the retry
+        # policy's sleep, and the rest in the limiter
+        assert loop.time() - start >= 0.03
+        metrics = limiter.metrics["example.com"]
+        assert metrics.requests == 4
+        assert metrics.throttled == 4
+
+
+class TestHTTPClientLifecycle:
+    @pytest.mark.asyncio
+    async def test_not_opened(self):
+        client = requester.HTTPClient()
+        with pytest.raises(RuntimeError):
+            await client.get("http://example.com")
+
+    @pytest.mark.asyncio
+    async def test_close(self, mock_session):
+        session = mock_session(200, b"body")
+        with patch("aiohttp.ClientSession", return_value=session) as session_cls:
+            async with requester.HTTPClient(limit=10, limit_per_host=2) as client:
+                connector = client._connector
+                assert await client.get("http://example.com") == b"body"
+        session.close.assert_awaited_once()
+        assert connector.closed
+        assert connector.limit == 10
+        assert connector.limit_per_host == 2
+        # the connector is closed by the client, not by the session
+        assert session_cls.call_args.kwargs["connector_owner"] is False
+        assert client._session is None
+
+    @pytest.mark.asyncio
+    async def test_connections_reused(self, monkeypatch):
+        for name in ("HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "http_proxy", "https_proxy", "all_proxy"):
+            monkeypatch.delenv(name, raising=False)
+
+        async def handler(_):
+            return web.Response(body=b"body")
+
+        app = web.Application()
+        app.router.add_get("/", handler)
+        async with TestServer(app) as server:
+            async with requester.HTTPClient() as client:
+                for _ in range(3):
+                    assert await client.get(str(server.make_url("/"))) == b"body"
+        assert client.connections.created == 1
+        assert client.connections.reused == 2
+        assert client.connections.reuse_ratio == pytest.approx(2 / 3)
 
-        # locks not released yet: not more counter added
-        await asyncio.sleep(limiter.release_time * 9 / 10)
-        assert counter == 3
 
-        # locks released
-        await asyncio.sleep(limiter.release_time * 2 / 10)
-        assert counter == 5
+def test_ConnectionMetrics():
+    metrics = requester.ConnectionMetrics()
+    assert metrics.reuse_ratio == 0
+    metrics.created, metrics.reused = 1, 3
+    assert metrics.reuse_ratio == 0.75
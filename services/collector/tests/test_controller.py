@@ -9,28 +9,78 @@ class TestBackgroundController:
     @pytest.mark.asyncio
     async def test_happy_path(self):
         results: list[int] = []  # store run results
+        events = {i: asyncio.Event() for i in range(3)}
         c = controller.BackgroundController()
 
-        async def run(t: int):
-            await asyncio.sleep(t / 1000.)
-            results.append(t)
+        async def run(i: int):
+            await events[i].wait()
+            results.append(i)
 
-        c.run_in_background(run(5))  # sleep 5 ms
-        c.run_in_background(run(10))  # sleep 10ms
-        c.run_in_background(run(2))  # sleep 2ms
+        for i in range(3):
+            await c.run_in_background(run(i))
 
-        # wait 1 ms -- everything still running
-        await asyncio.sleep(0.001)
+        # everything still running
+        await asyncio.sleep(0)
         assert results == []
+        assert c.in_flight == 3
 
-        # wait 2 ms -- 1 finished
-        await asyncio.sleep(0.002)
-        assert results == [2]
+        # the tasks complete in any order
+        for i in [2, 0, 1]:
+            events[i].set()
+            await asyncio.sleep(0)
+        assert results == [2, 0, 1]
 
-        # wait 3 ms -- 2 finished
-        await asyncio.sleep(0.003)
-        assert results == [2, 5]
+        await c.wait()
+        assert c.in_flight == 0
+        assert c.completed == 3
+        assert c.errors == []
 
-        # wait 5 ms -- 2 finished
-        await asyncio.sleep(0.005)
-        assert results == [2, 5, 10]
+    @pytest.mark.asyncio
+    async def test_wait_nothing_ran(self):
+        c = controller.BackgroundController()
+        await c.wait()
+        assert c.completed == 0
+
+    @pytest.mark.asyncio
+    async def test_max_in_flight(self):
+        c = controller.BackgroundController(max_in_flight=2)
+        release = asyncio.Event()
+        running = 0
+        max_running = 0
+
+        async def run():
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await release.wait()
+            running -= 1
+
+        await c.run_in_background(run())
+        await c.run_in_background(run())
+        # the producer waits while the controller is full
+        producer = asyncio.create_task(c.run_in_background(run()))
+        await asyncio.sleep(0.01)
+        assert not producer.done()
+        assert c.in_flight == 2
+
+        release.set()
+        await producer
+        await c.wait()
+        assert max_running == 2
+        assert c.completed == 3
+
+    @pytest.mark.asyncio
+    async def test_errors(self, caplog):
+        c = controller.BackgroundController(max_in_flight=1)
+
+        async def run(fail: bool):
+            if fail:
+                raise ValueError("failed")
+
+        for fail in [True, False, True]:
+            await c.run_in_background(run(fail))
+        await c.wait()
+
+        assert c.completed == 3
+        assert [str(e) for e in c.errors] == ["failed", "failed"]
+        assert "2 background tasks failed out of 3" in caplog.text
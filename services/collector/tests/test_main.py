@@ -1,4 +1,5 @@
 import asyncio
+import datetime
 from collections import defaultdict
 from contextlib import asynccontextmanager
 from unittest.mock import Mock, patch
@@ -6,6 +7,7 @@ from unittest.mock import Mock, patch
 import pytest
 
 from collector import main
+from collector.pipeline import Pipeline
 
 
 @pytest.fixture()
@@ -14,6 +16,7 @@ def db():
     d.add_competition_calls = 0
     d.update_competition_calls = 0
     d.search_competitions_calls = 0
+    d.ingested_before = []
 
     async def add_competition(_):
         await asyncio.sleep(0.02)
@@ -28,7 +31,15 @@ def db():
         d.search_competitions_calls += 1
         return defaultdict(Mock)
 
+    async def search_ingested_events(before=None):
+        d.ingested_before.append(before)
+        return {
+            ("Transvolcano", "Tangue", datetime.date(2024, 1, 22), 23.0),
+            ("Transvolcano", "Tangue", datetime.date.max, 23.0),
+        }
+
     d.add_competition = add_competition
+    d.search_ingested_events = search_ingested_events
     d.update_competition = update_competition
     d.search_competitions = search_competitions
 
@@ -40,18 +51,41 @@ def db():
         yield d
 
 
+@pytest.fixture()
+def index():
+    i = Mock()
+    i.matches = Mock(return_value=[(11, 1.)])
+    i.names = Mock(hits=0, misses=0)
+
+    with patch("collector.matching.parallel.CompetitionIndex", Mock(return_value=i)):
+        yield i
+
+
 @pytest.fixture()
 def scrapers():
     def mock_scraper():
         scraper = Mock()
         scraper.find_best_match = Mock(return_value=11)
         scraper.scrap_calls = 0
+        scraper.skipped = []
+        scraper.stored = []
 
-        async def scrap():
+        async def scrap(skip=frozenset()):
+            scraper.skipped.append(skip)
             yield Mock()
             scraper.scrap_calls += 1
 
+        def pipeline(skip=frozenset(), stored=frozenset(), config=None):
+            async def competitions():
+                scraper.skipped.append(skip)
+                scraper.stored.append(stored)
+                yield Mock()
+                scraper.scrap_calls += 1
+
+            return Pipeline(competitions(), [], queue_size=config.queue_size)
+
         scraper.scrap = scrap
+        scraper.pipeline = pipeline
 
         return scraper
 
@@ -63,10 +97,27 @@ def scrapers():
 
 
 @pytest.mark.asyncio
-async def test_run(db, scrapers):
+async def test_run(db, index, scrapers):
     await main.run()
 
     assert db.add_competition_calls == 2
     assert db.update_competition_calls == 2
     assert db.search_competitions_calls == 2
     assert all([s.scrap_calls == 2 for s in scrapers])
+    # full scraping by default, only the unchanged stored events are dropped
+    assert db.ingested_before == [None, None]
+    assert all(skip == frozenset() for s in scrapers for skip in s.skipped)
+    assert all(len(stored) == 2 for s in scrapers for stored in s.stored)
+
+
+@pytest.mark.asyncio
+async def test_run_incremental(db, index, scrapers):
+    await main.run(type_=main.scrap_timekeepers_type, horizon=datetime.timedelta(days=30))
+
+    assert db.ingested_before == [None, None]
+    # only the events older than the horizon are skipped
+    assert all(
+        s.skipped == [{("Transvolcano", "Tangue", datetime.date(2024, 1, 22), 23.0)}]
+        for s in scrapers)
+    assert all(len(stored) == 2 for s in scrapers for stored in s.stored)
+    assert db.add_competition_calls == 2
@@ -1,8 +1,9 @@
-from datetime import datetime
+import random
+from datetime import datetime, timedelta
 
 import pytest
 
-from collector import models
+from collector import models, utils
 
 
 competitions: dict[int, models.Competition] = {
@@ -76,3 +77,225 @@ class TestCompetitionMetadata:
         assert comp_id == expected, \
             (f"Unexpected competition id={comp_id}, "
              f"{expected} was expected instead")
+
+    def test_find_best_match_stats(self):
+        metadata = models.CompetitionMetaData(
+            event="Trail de l'Eden en relais",
+            date=models.Date(start=datetime.strptime("01-07-2024", "%d-%m-%Y").date()),
+            distance=23,
+            positive_elevation=900,
+        )
+        stats = models.SimilarityStats()
+        comp_id = metadata.find_best_match(competitions, stats=stats)
+
+        assert comp_id == 111
+        assert stats.compared == 3
+        # 112 is pruned because of its distance
+        assert stats.pruned == {"distance": 1}
+        # 113 can't be pruned, since its name is the only difference
+        assert stats.names_compared == 2
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_find_best_match_pruning(self, seed: int):
+        """Pruning should not change the similarity of the best match."""
+        rand = random.Random(seed)
+        events = [c.event for c in competitions.values()]
+        for _ in range(20):
+            metadata = models.CompetitionMetaData(
+                event=rand.choice(events),
+                date=rand.choice([c.date for c in competitions.values()]),
+                distance=rand.choice([15, 23, 24]),
+                positive_elevation=rand.choice([None, 900, 1000]),
+            )
+            # similarities without any pruning
+            sims = {
+                cid: similarity(metadata, c) for cid, c in competitions.items()}
+            best = max(sims.values())
+            for threshold in [0., 0.5, 0.85]:
+                stats = models.SimilarityStats()
+                comp_id = metadata.find_best_match(
+                    competitions, similarity_threshold=threshold, stats=stats)
+                if best < threshold:
+                    assert comp_id is None
+                else:
+                    assert sims[comp_id] == pytest.approx(best, rel=10e-12)
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches(self, seed: int):
+        """All the competitions above the threshold are found, with their similarity."""
+        rand = random.Random(seed)
+        events = [c.event for c in competitions.values()]
+        for _ in range(20):
+            metadata = models.CompetitionMetaData(
+                event=rand.choice(events),
+                date=rand.choice([c.date for c in competitions.values()]),
+                distance=rand.choice([15, 23, 24]),
+                positive_elevation=rand.choice([None, 900, 1000]),
+            )
+            sims = {
+                cid: similarity(metadata, c) for cid, c in competitions.items()}
+            for threshold in [0., 0.5, 0.85]:
+                matches = metadata.matches(competitions, similarity_threshold=threshold)
+                assert [cid for cid, _ in matches] == [
+                    cid for cid, sim in sims.items() if sim >= threshold]
+                for cid, sim in matches:
+                    assert sim == pytest.approx(sims[cid], rel=10e-12)
+
+    def test_find_best_match_columns(self):
+        metadata = models.CompetitionMetaData(
+            event="Trail des griffe du diable",
+            date=models.Date(start=datetime.strptime("04-05-2024", "%d-%m-%Y").date()),
+            distance=15.3,
+        )
+        columns = models.CompetitionColumns.from_competitions(competitions)
+        assert len(columns) == 3
+        assert metadata.find_best_match(columns) == 112
+
+
+def similarity(m1: models.CompetitionMetaData, m2: models.CompetitionMetaData) -> float:
+    """Compute the similarity between 2 competitions, pair by pair."""
+    return (
+        utils.distance_similarity(m1.distance, m2.distance, perc90_delta=2) *
+        utils.distance_similarity(
+            m1.positive_elevation, m2.positive_elevation, perc90_delta=200) *
+        utils.distance_similarity(
+            m1.negative_elevation, m2.negative_elevation, perc90_delta=200) *
+        utils.distance_similarity(
+            utils.hours_diff(m1.date.start, m2.date.start), 0, perc90_delta=4) *
+        utils.sentence_similarity(m1.event, m2.event)
+    )
+
+
+def test_Competition_key():
+    competition = models.Competition(
+        name="Transvolcano",
+        event="Tangue",
+        timekeeper="sportpro",
+        date=models.Date(start=datetime(2024, 1, 22).date()),
+        distance=42.195,
+    )
+    assert competition.key == ("Transvolcano", "Tangue", datetime(2024, 1, 22).date(), 42.2)
+
+
+@pytest.mark.parametrize(
+    "rank,status",
+    [
+        (models.Rank(scratch=3, gender=2, category=1), models.ResultStatus.FINISHER),
+        (None, models.ResultStatus.ABANDONED),
+    ]
+)
+def test_ResultRecord(rank: models.Rank | None, status: models.ResultStatus):
+    result = models.Result(
+        runner=models.Runner(
+            first_name="Jean", last_name="DUPONT", birth_year=1980,
+            gender=models.Gender.MALE),
+        rank=rank,
+        status=status,
+        race_number=12,
+        category="SEH",
+    )
+    record = models.ResultRecord.from_model(result)
+    assert record.first_name == "Jean"
+    assert record.ranked == (rank is not None)
+    assert record.to_model() == result
+
+
+def test_ResultsBatch():
+    records = [
+        models.ResultRecord(
+            first_name="Jean",
+            last_name="DUPONT",
+            gender=models.Gender.MALE,
+            status=models.ResultStatus.FINISHER,
+            race_number=12,
+            category="SEH",
+            birth_year=1980,
+            time=timedelta(hours=1, seconds=3),
+            license="",
+            scratch=1,
+            gender_ranking=1,
+            category_ranking=1,
+        ),
+        models.ResultRecord(
+            first_name="Marie",
+            last_name="DUPONT",
+            gender=models.Gender.FEMALE,
+            status=models.ResultStatus.ABANDONED,
+            race_number=13,
+            category="SEF",
+        ),
+    ]
+    batch = models.ResultsBatch.from_records(records)
+    assert len(batch) == 2
+    assert list(batch) == records
+    assert batch[1] == records[1]
+    assert batch.times[0] == 3603
+    assert batch == models.ResultsBatch.from_records(records)
+    assert batch != models.ResultsBatch.from_records(records[:1])
+    # the names are interned
+    assert batch.last_names[0] is batch.last_names[1]
+
+
+def test_ResultsBatch_numbers():
+    """Zero and large numbers are kept, only None is missing."""
+    record = models.ResultRecord(
+        first_name="Jean",
+        last_name="DUPONT",
+        gender=models.Gender.MALE,
+        status=models.ResultStatus.FINISHER,
+        race_number=0,
+        category="SEH",
+        birth_year=0,
+        scratch=0,
+        gender_ranking=100_000,
+    )
+    batch = models.ResultsBatch.from_records([record])
+    assert batch[0] == record
+    assert batch.category_ranking[0] == models.MISSING_NUMBER
+
+
+def test_ResultsBatch_append_overflow():
+    batch = models.ResultsBatch()
+    record = models.ResultRecord(
+        first_name="Jean",
+        last_name="DUPONT",
+        gender=models.Gender.MALE,
+        status=models.ResultStatus.FINISHER,
+        race_number=12,
+        category="SEH",
+        scratch=1,
+        gender_ranking=1,
+        category_ranking=1,
+    )
+    batch.append(record)
+    record.category_ranking = 2 ** 63
+    with pytest.raises(OverflowError):
+        batch.append(record)
+    # the batch is unchanged
+    assert len(batch) == 1
+    assert all(len(column) == 1 for column in batch._arrays())
+
+
+def test_Competition_results_batch():
+    record = models.ResultRecord(
+        first_name="Jean",
+        last_name="DUPONT",
+        gender=models.Gender.MALE,
+        status=models.ResultStatus.NON_STARTER,
+        race_number=12,
+        category="SEH",
+    )
+    competition = models.Competition(
+        name="Transvolcano",
+        event="Tangue",
+        timekeeper="sportpro",
+        date=models.Date(start=datetime(2024, 1, 22).date()),
+        distance=42.195,
+        results=[record, record.to_model()],
+    )
+    assert list(competition.results_batch()) == [record, record]
+
+    # batches are kept as is
+    batch = models.ResultsBatch.from_records([record])
+    competition.results = batch
+    assert competition.results_batch() is batch
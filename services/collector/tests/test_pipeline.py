@@ -0,0 +1,216 @@
+import asyncio
+
+import pytest
+
+from collector import pipeline
+
+
+async def source(n: int):
+    for i in range(n):
+        yield i
+
+
+async def double(i: int) -> int:
+    return 2 * i
+
+
+async def increment(i: int) -> int:
+    return i + 1
+
+
+class TestPipeline:
+    @pytest.mark.asyncio
+    async def test_happy_path(self):
+        p = pipeline.Pipeline(source(5), [
+            pipeline.Stage("double", double),
+            pipeline.Stage("increment", increment),
+        ])
+
+        # a single worker per stage keeps the order
+        assert [i async for i in p] == [1, 3, 5, 7, 9]
+        assert p.errors == []
+        for name in ["double", "increment"]:
+            assert p.metrics[name].processed == 5
+            assert p.metrics[name].failed == 0
+            assert p.metrics[name].elapsed > 0
+
+    @pytest.mark.asyncio
+    async def test_no_stage(self):
+        p = pipeline.Pipeline(source(3), [])
+        assert [i async for i in p] == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_add_stage(self):
+        p = pipeline.Pipeline(source(3), [pipeline.Stage("double", double)])
+        p.add_stage(pipeline.Stage("increment", increment))
+        assert [i async for i in p] == [1, 3, 5]
+        assert list(p.metrics) == ["double", "increment"]
+
+    @pytest.mark.asyncio
+    async def test_workers(self):
+        release = asyncio.Event()
+        running = 0
+        max_running = 0
+
+        async def wait(i: int) -> int:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await release.wait()
+            running -= 1
+            return i
+
+        p = pipeline.Pipeline(source(10), [pipeline.Stage("wait", wait, workers=3)])
+        task = asyncio.create_task(p.run())
+        await asyncio.sleep(0.01)
+        assert running == 3
+        release.set()
+        await task
+        assert max_running == 3
+        assert p.metrics["wait"].processed == 10
+
+    @pytest.mark.asyncio
+    async def test_backpressure(self):
+        release = asyncio.Event()
+        produced = 0
+
+        async def counted_source():
+            nonlocal produced
+            for i in range(100):
+                produced += 1
+                yield i
+
+        async def wait(i: int) -> int:
+            await release.wait()
+            return i
+
+        p = pipeline.Pipeline(
+            counted_source(), [pipeline.Stage("wait", wait)], queue_size=2)
+        task = asyncio.create_task(p.run())
+        await asyncio.sleep(0.01)
+        # 1 item processed, 2 queued, 1 waiting to be queued
+        assert produced == 4
+        release.set()
+        await task
+        assert produced == 100
+        assert p.metrics["wait"].max_depth <= 2
+
+    @pytest.mark.asyncio
+    async def test_errors(self):
+        async def fail_odd(i: int) -> int:
+            if i % 2:
+                msg = f"odd {i}"
+                raise ValueError(msg)
+            return i
+
+        p = pipeline.Pipeline(source(5), [
+            pipeline.Stage("fail", fail_odd),
+            pipeline.Stage("double", double),
+        ])
+        assert [i async for i in p] == [0, 4, 8]
+        assert [str(e) for e in p.errors] == ["odd 1", "odd 3"]
+        assert p.metrics["fail"].processed == 3
+        assert p.metrics["fail"].failed == 2
+        assert p.metrics["double"].processed == 3
+
+    @pytest.mark.asyncio
+    async def test_dropped(self):
+        async def drop_odd(i: int) -> int | None:
+            return None if i % 2 else i
+
+        p = pipeline.Pipeline(source(5), [
+            pipeline.Stage("drop", drop_odd),
+            pipeline.Stage("double", double),
+        ])
+        assert [i async for i in p] == [0, 4, 8]
+        assert p.metrics["drop"].processed == 5
+        assert p.metrics["drop"].dropped == 2
+        assert p.metrics["double"].processed == 3
+
+    @pytest.mark.asyncio
+    async def test_last_stage_none(self):
+        """The items completed by the last stage are not dropped."""
+        stored = []
+
+        async def store(i: int) -> None:
+            stored.append(i)
+
+        p = pipeline.Pipeline(source(3), [pipeline.Stage("double", double)])
+        p.add_stage(pipeline.Stage("store", store))
+        assert [i async for i in p] == []
+        assert stored == [0, 2, 4]
+        assert p.metrics["store"].processed == 3
+        assert p.metrics["store"].dropped == 0
+
+    @pytest.mark.asyncio
+    async def test_source_error(self):
+        async def failing_source():
+            yield 1
+            msg = "source failed"
+            raise RuntimeError(msg)
+
+        p = pipeline.Pipeline(failing_source(), [pipeline.Stage("double", double)])
+        results = []
+        with pytest.raises(RuntimeError, match="source failed"):
+            async for i in p:
+                results.append(i)
+        assert results == [2]
+
+    @pytest.mark.asyncio
+    async def test_stopped(self):
+        cancelled = []
+
+        async def wait(i: int) -> int:
+            if i == 0:
+                return i
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(i)
+                raise
+            return i
+
+        p = pipeline.Pipeline(source(10), [pipeline.Stage("wait", wait, workers=2)])
+        results = aiter(p)
+        assert await anext(results) == 0
+        await results.aclose()
+        # the running workers are stopped
+        assert len(cancelled) == 2
+
+    @pytest.mark.asyncio
+    async def test_log_metrics(self, caplog):
+        p = pipeline.Pipeline(source(2), [pipeline.Stage("double", double)])
+        await p.run()
+        with caplog.at_level("INFO"):
+            p.log_metrics()
+        assert "Stage double (1 workers): 2 processed" in caplog.text
+
+
+def test_StageMetrics():
+    m = pipeline.StageMetrics(name="stage")
+    assert m.mean_depth == 0
+    assert m.mean_latency == 0
+    assert m.throughput == 0
+
+    m.sample_depth(2)
+    m.sample_depth(4)
+    m.record(0.1)
+    m.record(0.3)
+    m.processed = 1
+    m.failed = 1
+    m.elapsed = 0.5
+    assert m.mean_depth == 3
+    assert m.max_depth == 4
+    assert m.mean_latency == pytest.approx(0.2)
+    assert m.max_latency == pytest.approx(0.3)
+    assert m.throughput == 2
+
+
+def test_PipelineConfig_from_env(monkeypatch):
+    monkeypatch.setenv("PIPELINE_QUEUE_SIZE", "4")
+    monkeypatch.setenv("PIPELINE_STORE_WORKERS", "2")
+    monkeypatch.delenv("PIPELINE_FETCH_WORKERS", raising=False)
+    config = pipeline.PipelineConfig.from_env()
+    assert config.queue_size == 4
+    assert config.store_workers == 2
+    assert config.fetch_workers == pipeline.PipelineConfig().fetch_workers
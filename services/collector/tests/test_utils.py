@@ -1,5 +1,9 @@
+import math
+import random
+from collections import Counter
 from datetime import datetime, date
 
+import numpy as np
 import pytest
 
 from collector import utils
@@ -117,3 +121,111 @@ def test_general_distance_similarity(d1: float, d2: float, perc90_delta: float,
 def test_hours_diff(d1: date, d2: date, expected: int):
     hours = utils.hours_diff(d1, d2)
     assert hours == expected, f"Unexpected {hours} hours, when {expected} hours was expected"
+
+
+# vocabulary used to generate random event names
+words_vocabulary = [
+    "trail", "de", "la", "du", "des", "course", "cross", "piton", "neiges",
+    "boucle", "grand", "bassin", "d'tour", "d-tour", "45", "70", "km", "relais",
+    "eden", "griffe", "diable", "l'eden", "tangue", "la", "volcano", "trans",
+]
+
+
+def random_sentence(rand: random.Random, min_words: int, max_words: int) -> str:
+    nb_words = rand.randint(min_words, max_words)
+    return " ".join(rand.choice(words_vocabulary) for _ in range(nb_words))
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("max_exhaustive_words", [0, 10])
+def test_subsequence_similarity(seed: int, max_exhaustive_words: int):
+    """Compare the polynomial implementation with the recursive one."""
+    rand = random.Random(seed)
+    for _ in range(20):
+        s1 = random_sentence(rand, 1, 9)
+        s2 = random_sentence(rand, 1, 6)
+        expected = utils.sentence_similarity_rec(s1, s2)
+        sim = utils.subsequence_similarity(
+            s1, s2, max_exhaustive_words=max_exhaustive_words)
+        assert abs(sim - expected) < 10e-9, \
+            f"Unexpected {sim}, when {expected} was expected. \n\"{s1}\" to \"{s2}\""
+
+
+@pytest.mark.parametrize(
+    "s1,s2",
+    [
+        ("", "trail"),
+        ("trail", ""),
+        ("  ", "trail"),
+        ("Trail de la Griffe du Diable", "Trail Griffe du Diable Piton de la Fournaise Jacob"),
+        ("Trail  de\tla   Griffe", "trail de la"),
+        ("Trail de la Griffe du Diable Piton de la Fournaise Jacob", "Trail de la Griffe du Diable"),
+    ]
+)
+def test_subsequence_similarity_edge_cases(s1: str, s2: str):
+    expected = utils.sentence_similarity_rec(s1, s2)
+    for max_exhaustive_words in [0, 10]:
+        sim = utils.subsequence_similarity(
+            s1, s2, max_exhaustive_words=max_exhaustive_words)
+        assert abs(sim - expected) < 10e-9
+
+
+@pytest.mark.parametrize(
+    "s,expected",
+    [
+        ("", []),
+        ("  trail  ", ["trail"]),
+        ("Trail de l'Eden", ["Trail", "de", "l'Eden"]),
+        ("Trail  de\tla", ["Trail", "de\tla"]),
+        ("Trail\tde", ["Trail\tde"]),
+    ]
+)
+def test_split_words(s: str, expected: list[str]):
+    assert utils.split_words(s) == expected
+
+
+@pytest.mark.parametrize(
+    "similarity,perc90_delta,expected",
+    [
+        (0.9, 2, 2),
+        (0.9, 200, 200),
+        (1., 2, 0),
+        (0., 2, math.inf),
+    ]
+)
+def test_distance_similarity_radius(similarity: float, perc90_delta: float, expected: float):
+    radius = utils.distance_similarity_radius(similarity, perc90_delta=perc90_delta)
+    assert radius == pytest.approx(expected, rel=10e-4)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_characters_similarity_bound(seed: int):
+    rand = random.Random(seed)
+    for _ in range(20):
+        s1 = random_sentence(rand, 1, 6)
+        s2 = random_sentence(rand, 1, 6)
+        bound = utils.characters_similarity_bound(Counter(s1), Counter(s2))
+        assert utils.sentence_similarity(s1, s2) <= bound + 10e-9
+    assert utils.characters_similarity_bound(Counter(), Counter("trail")) == 0.
+
+
+@pytest.mark.parametrize(
+    "d1,d2,perc90_delta",
+    [
+        (43, [45, 40, 42, 43, None], 2),
+        (43, [40, None], 3),
+        (None, [40, 43, None], 3),
+        (43, [], 3),
+    ]
+)
+def test_distance_similarities(d1: float | None, d2: list[float | None], perc90_delta: float):
+    sims = utils.distance_similarities(
+        d1, np.array(d2, dtype=float), perc90_delta=perc90_delta)
+    expected = [utils.distance_similarity(d1, d, perc90_delta=perc90_delta) for d in d2]
+    assert sims.tolist() == pytest.approx(expected, rel=10e-12)
+
+
+def test_words_subsets():
+    assert list(utils.words_subsets(["a", "b", "c"])) == [
+        "a", "b", "c", "a b", "a c", "b c", "a b c"]
+    assert list(utils.words_subsets([])) == []